@@ -1,5 +1,4 @@
 ﻿import streamlit as st
-import json
 import time
 import fitz
 import hashlib
@@ -131,8 +130,9 @@ except Exception:
 
 # --- IMPORT COMPONENTS ---
 from utils.resume_history import save_review, show_history_ui
-from utils.resume_parser import parse_resume
-from utils.analyze_resume import get_resume_feedback
+from utils.analysis_service import AnalysisService
+from utils.role_catalog import get_role_catalog
+from utils.model_registry import get_model_registry
 from components.header import show_header, show_sidebar_navbar
 from components.suggestions import show_suggestions, get_grammar_suggestions
 from components.contributors import show_contributors_page
@@ -140,6 +140,10 @@ from components.features import show_features_page
 from components import resume_tips
 from components.login import show_login
 
+# Load the active role classifier in the background while the first page
+# renders (a no-op on reruns once started)
+get_model_registry().prewarm()
+
 # ✅ CRITICAL: Initialize ALL session state FIRST
 if "theme" not in st.session_state:
     st.session_state.theme = "Light"
@@ -499,11 +503,10 @@ with col_toggle2:
         st.info("Single mode: Upload one resume for detailed analysis")
 
 # --- LOAD JOB ROLES ---
-try:
-    with open("utils/job_roles.json", "r") as f:
-        job_roles = json.load(f)
-except Exception:
-    job_roles = {"Default Role": "Default"}
+# parsed once per process and re-read only when the file changes, not on every rerun
+job_roles = get_role_catalog().data
+if not job_roles:
+    job_roles = None
     st.warning("Could not load utils/job_roles.json — using default role list.")
 
 st.subheader("Choose Job Role")
@@ -614,36 +617,21 @@ if uploaded_file:
 # --- ANALYSIS DASHBOARD ---
 if uploaded_file:
     current_file_id = _file_id(uploaded_file)
-    if st.session_state.last_file_id != current_file_id:
-        st.session_state.last_file_id = current_file_id
-
+    analysis_service = AnalysisService(st.session_state)
+    if analysis_service.needs_parse(current_file_id):
         with st.spinner("⏳ Analysis in progress..."):
             time.sleep(1) # Simulated delay for effect
-
-        # PARSE
-        parsed = parse_resume(uploaded_file)
-        plain_text = parsed.get("plain_text", "")
-        
-        # Get job description and experience level from session state
-        job_description = st.session_state.get("job_description", "")
-        experience_level = st.session_state.get("experience_level", "Mid Level")
-        
-        # ANALYZE
-        suggestions, resume_score, keyword_match, predicted_role = get_resume_feedback(
-            plain_text, 
-            selected_role, 
-            job_description=job_description, 
-            experience_level=experience_level
-        )
-        
-        # Save results to session state to prevent re-running on interaction
-        st.session_state.analysis_results = {
-            "plain_text": plain_text,
-            "suggestions": suggestions,
-            "score": resume_score,
-            "keyword_match": keyword_match,
-            "predicted_role": predicted_role
-        }
+    st.session_state.last_file_id = current_file_id
+
+    # PARSE once per upload, then only RESCORE when role / JD / level change.
+    # Results are kept in session state to prevent re-running on interaction.
+    analysis_service.analyze(
+        uploaded_file,
+        current_file_id,
+        selected_role,
+        job_description=st.session_state.get("job_description", ""),
+        experience_level=st.session_state.get("experience_level", "Mid Level")
+    )
 
 # --- DASHBOARD UI ---
 results = st.session_state.get("analysis_results", None)
@@ -663,6 +651,10 @@ if results:
     keyword_match = results["keyword_match"]
     predicted_role = results.get("predicted_role", "Unknown")
 
+    if results.get("truncated"):
+        reason = "took too long to parse" if results.get("timed_out") else "has too many pages"
+        st.warning(f"✂️ This resume {reason}; the analysis covers only the part extracted in time.")
+
     # --- SAVE HISTORY ---
     try:
         save_review(
@@ -754,36 +746,21 @@ else:
     # --- ANALYSIS DASHBOARD ---
     if uploaded_file:
         current_file_id = _file_id(uploaded_file)
-        if st.session_state.last_file_id != current_file_id:
-            st.session_state.last_file_id = current_file_id
-
+        analysis_service = AnalysisService(st.session_state)
+        if analysis_service.needs_parse(current_file_id):
             with st.spinner("⏳ Analysis in progress..."):
                 time.sleep(1) # Simulated delay for effect
+        st.session_state.last_file_id = current_file_id
 
-            # PARSE
-            parsed = parse_resume(uploaded_file)
-            plain_text = parsed.get("plain_text", "")
-
-            # Get job description and experience level from session state
-            job_description = st.session_state.get("job_description", "")
-            experience_level = st.session_state.get("experience_level", "Mid Level")
-
-            # ANALYZE
-            suggestions, resume_score, keyword_match, predicted_role = get_resume_feedback(
-                plain_text,
-                selected_role,
-                job_description=job_description,
-                experience_level=experience_level
-            )
-
-            # Save results to session state to prevent re-running on interaction
-            st.session_state.analysis_results = {
-                "plain_text": plain_text,
-                "suggestions": suggestions,
-                "score": resume_score,
-                "keyword_match": keyword_match,
-                "predicted_role": predicted_role
-            }
+        # PARSE once per upload, then only RESCORE when role / JD / level change.
+        # Results are kept in session state to prevent re-running on interaction.
+        analysis_service.analyze(
+            uploaded_file,
+            current_file_id,
+            selected_role,
+            job_description=st.session_state.get("job_description", ""),
+            experience_level=st.session_state.get("experience_level", "Mid Level")
+        )
 
     # --- DASHBOARD UI ---
     results = st.session_state.get("analysis_results", None)
@@ -803,6 +780,10 @@ else:
         keyword_match = results["keyword_match"]
         predicted_role = results.get("predicted_role", "Unknown")
 
+        if results.get("truncated"):
+            reason = "took too long to parse" if results.get("timed_out") else "has too many pages"
+            st.warning(f"✂️ This resume {reason}; the analysis covers only the part extracted in time.")
+
         # --- SAVE HISTORY ---
         try:
             save_review(
@@ -900,10 +881,9 @@ else:
                 )
 
                 if st.button("Re-Analyze"):
+                    # the stored parse is reused; only scoring reruns
                     st.session_state.job_description = job_description
                     st.session_state.experience_level = experience_level
-                    if "analysis_results" in st.session_state:
-                        del st.session_state.analysis_results
                     st.rerun()
 
             # Resume Preview
@@ -97,6 +97,14 @@ def show_comparison_table(results: list, sort_by: str = "score"):
         height=min(400, 50 + len(df_sorted) * 35)
     )
 
+    # Show partly parsed files if any (scored on the text extracted in time)
+    partial = [r for r in successful if r.get("truncated")]
+    if partial:
+        with st.expander(f"✂️ {len(partial)} Partially Parsed", expanded=False):
+            for r in partial:
+                reason = "parsing time limit reached" if r.get("timed_out") else "page limit reached"
+                st.warning(f"**{r['filename']}**: {reason}; scored on the extracted part only")
+
     # Show failed files if any
     if failed:
         with st.expander(f"⚠️ {len(failed)} Failed Analysis", expanded=False):
@@ -141,8 +141,6 @@ def _show_docx_preview(docx_bytes):
         # Display preview
         st.info(preview_text)
 
-        st.caption("ℹ️ DOCX preview feature is under development")
-
         return True
 
     except Exception as e:
@@ -1,9 +1,17 @@
 import streamlit as st
-import language_tool_python
+
+from utils.grammar_service import get_grammar_service
+
 
 def get_grammar_suggestions(resume_text, max_errors=5):
-    tool = language_tool_python.LanguageTool('en-US')
-    matches = tool.check(resume_text)
+    # one warm LanguageTool shared by all sessions, checked sentence by sentence
+    # with cached results per sentence (see utils/grammar_service.py)
+    try:
+        matches = get_grammar_service().check_document(resume_text)
+    except Exception as e:
+        # queue full, timed out or no backend (e.g. Java missing): skip grammar
+        print(f"Grammar check skipped: {e}")
+        return []
 
     grammar_suggestions = []
     for match in matches[:max_errors]:
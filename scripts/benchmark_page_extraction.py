@@ -0,0 +1,93 @@
+"""
+Benchmark serial vs page-parallel PyMuPDF block extraction.
+
+Builds synthetic text-heavy PDFs of increasing page count, times both modes
+and reports the first page count at which the process pool wins. Use the
+result to set RESUME_PARSER_PARALLEL_PAGES for the deployment hardware.
+
+Usage: python scripts/benchmark_page_extraction.py [--workers N] [--repeat R]
+"""
+import argparse
+import os
+import sys
+import time
+
+import fitz  # PyMuPDF
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.resume_parser import (  # noqa: E402
+    _extract_blocks_with_pymupdf,
+    _extract_pages_parallel,
+    _merge_blocks,
+    PARALLEL_MAX_WORKERS,
+)
+
+PAGE_COUNTS = [1, 2, 4, 8, 16, 32, 64, 128]
+
+
+def make_pdf(pages: int) -> bytes:
+    """A PDF with dense bullet-point text on every page."""
+    doc = fitz.open()
+    line = "- Built and operated Python services handling 10k requests per second on AWS"
+    for pno in range(pages):
+        page = doc.new_page()
+        y = 40
+        for i in range(60):
+            page.insert_text((40, y), f"{line} ({pno}.{i})", fontsize=8)
+            y += 12
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def serial(file_bytes: bytes):
+    return _extract_blocks_with_pymupdf(file_bytes, parallel_threshold=0)
+
+
+def parallel(file_bytes: bytes, workers: int):
+    doc = fitz.open(stream=file_bytes, filetype="pdf")
+    page_count = len(doc)
+    doc.close()
+    pages = _extract_pages_parallel(file_bytes, list(range(1, page_count + 1)), workers)
+    return _merge_blocks([b for p in pages for b in p["blocks"]])
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=max(2, PARALLEL_MAX_WORKERS))
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"CPUs: {os.cpu_count()}  workers: {args.workers}  best of {args.repeat}")
+    print(f"{'pages':>6} {'serial ms':>10} {'parallel ms':>12} {'speedup':>8}")
+
+    crossover = None
+    for pages in PAGE_COUNTS:
+        data = make_pdf(pages)
+        assert serial(data) == parallel(data, args.workers), "modes disagree"
+        t_serial = best_of(lambda: serial(data), args.repeat)
+        t_parallel = best_of(lambda: parallel(data, args.workers), args.repeat)
+        speedup = t_serial / t_parallel if t_parallel else 0.0
+        print(f"{pages:>6} {t_serial * 1000:>10.1f} {t_parallel * 1000:>12.1f} {speedup:>7.2f}x")
+        if crossover is None and speedup > 1.0:
+            crossover = pages
+
+    if crossover:
+        print(f"\nParallel extraction wins from {crossover} pages: "
+              f"set RESUME_PARSER_PARALLEL_PAGES={crossover}")
+    else:
+        print("\nParallel extraction never won on this machine: leave RESUME_PARSER_PARALLEL_PAGES=0")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Micro-benchmark: single-pass normalizer vs the original cleanup chain.
+
+Times the PDF path (_blocks_to_plain cleanup followed by parse_resume's final
+cleanup) on the sample resumes, repeated to resume-sized and book-sized text.
+
+Usage: python scripts/benchmark_text_normalizer.py [--repeat R]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.sample_corpus import corpus_texts  # noqa: E402
+from utils.text_normalizer import UNICODE_FIX_MAP, collapse_whitespace, normalize_text  # noqa: E402
+
+
+def old_chain(text):
+    """The pre-engine PDF path: ws + hyphenation, then ws + unicode + hyphenation."""
+    for _ in range(2):
+        text = text.replace('\r', '\n')
+        text = re.sub(r'\n{3,}', '\n\n', text)
+        text = re.sub(r'[ \t]+', ' ', text)
+        text = text.strip()
+        if _:
+            for bad, good in UNICODE_FIX_MAP.items():
+                text = text.replace(bad, good)
+        text = re.sub(r'-\n\s*', '', text)
+        text = re.sub(r'(?<!\n)\n(?!\n)', ' ', text)
+        text = re.sub(r' +', ' ', text)
+    return text
+
+
+def new_engine(text):
+    return normalize_text(collapse_whitespace(text), collapsed=True)
+
+
+def best_of(fn, text, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    sample = "\n\n".join(corpus_texts())
+    print(f"{'size':>10} {'old ms':>9} {'new ms':>9} {'speedup':>8}")
+    for copies in (1, 10, 100):
+        text = "\n\n".join([sample] * copies)
+        assert old_chain(text) == new_engine(text), "outputs differ"
+        t_old = best_of(old_chain, text, args.repeat)
+        t_new = best_of(new_engine, text, args.repeat)
+        print(f"{len(text):>10} {t_old * 1000:>9.3f} {t_new * 1000:>9.3f} {t_old / t_new:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
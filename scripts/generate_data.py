@@ -4,8 +4,13 @@ import csv
 import os
 import time
 import hashlib
+import sys
 from collections import defaultdict
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.role_catalog import get_role_catalog  # noqa: E402
+
 os.makedirs("data", exist_ok=True)
 
 RANDOM_SEED = os.getenv("RANDOM_SEED")
@@ -16,12 +21,11 @@ if RANDOM_SEED is not None:
         random.seed(RANDOM_SEED)
 
 def load_job_roles():
-    try:
-        with open("utils/job_roles.json", "r", encoding="utf-8") as f:
-            return json.load(f)
-    except FileNotFoundError:
-        print("Error: utils/job_roles.json not found.")
-        return {}
+    catalog = get_role_catalog()
+    job_roles = catalog.data
+    if not job_roles:
+        print(f"Error: could not load {catalog.path}: {catalog.error}")
+    return job_roles
 
 def _hash(text):
     return hashlib.md5(text.strip().lower().encode("utf-8")).hexdigest()
@@ -1,27 +1,59 @@
+import argparse
 import pandas as pd
+import numpy as np
 import pickle
 import os
 import json
+import shutil
+import sys
+import tempfile
 import time
+import zlib
+from collections import Counter
 from datetime import datetime
-from sklearn.feature_extraction.text import TfidfVectorizer
+from itertools import product
+from joblib import Parallel, delayed
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
 from sklearn.naive_bayes import MultinomialNB
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import StratifiedKFold, train_test_split
 from sklearn.metrics import classification_report, accuracy_score
+from sklearn.pipeline import make_pipeline
 
-os.makedirs("models", exist_ok=True)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.model_artifacts import NBPredictor, export_arrays  # noqa: E402
 
 TRAIN_SEED = os.getenv("TRAIN_SEED")
 RANDOM_STATE = int(TRAIN_SEED) if TRAIN_SEED and TRAIN_SEED.isdigit() else 42
 
+DATA_PATH = "data/synthetic_resumes.csv"
+MODELS_DIR = "models"
+
+# Streaming mode: rows per chunk, hashed feature space, 1 in HOLDOUT_BUCKETS
+# rows (by text hash) held out for evaluation
+STREAM_CHUNK_SIZE = 10_000
+STREAM_N_FEATURES = 2 ** 18
+HOLDOUT_BUCKETS = 5
+
+# Search mode: every combination is cross-validated; the most accurate one
+# whose served per-document latency fits the budget is saved
+SEARCH_GRID = {
+    "max_features": [1000, 3000, 10000],
+    "ngram_range": [(1, 1), (1, 2)],
+    "sublinear_tf": [False, True],
+    "alpha": [0.01, 0.1, 1.0],
+}
+SEARCH_FOLDS = 5
+SEARCH_LATENCY_BUDGET_MS = 1.0
+SEARCH_LATENCY_SAMPLES = 200
+
 def _validate(df):
     if "text" not in df.columns or "label" not in df.columns:
         raise ValueError("Dataset must contain 'text' and 'label' columns")
     df = df.dropna(subset=["text", "label"])
     return df
 
-def train_model():
-    data_path = "data/synthetic_resumes.csv"
+def train_model(data_path=DATA_PATH, models_dir=MODELS_DIR):
     if not os.path.exists(data_path):
         print(f"Error: {data_path} not found. Run generate_data.py first.")
         return
@@ -58,44 +90,314 @@ def train_model():
     print("\nClassification Report:\n")
     print(classification_report(y_test, y_pred))
 
-    base_model_path = "models/resume_classifier.pkl"
-    base_vec_path = "models/tfidf_vectorizer.pkl"
+    _save_run(clf, tfidf, run_id, models_dir, {
+        "data_path": data_path,
+        "samples": len(df),
+        "random_state": RANDOM_STATE,
+        "accuracy": round(accuracy, 5),
+    }, started_at)
 
-    versioned_model_path = f"models/resume_classifier_{run_id}.pkl"
-    versioned_vec_path = f"models/tfidf_vectorizer_{run_id}.pkl"
 
-    print("Saving model and vectorizer...")
-    with open(base_model_path, "wb") as f:
-        pickle.dump(clf, f)
-
-    with open(base_vec_path, "wb") as f:
-        pickle.dump(tfidf, f)
+def _save_run(clf, tfidf, run_id, models_dir, meta, started_at):
+    """
+    Versioned pickles, their array export and the run manifest. The base
+    artifacts are left alone: a run is served once the registry pointer
+    names it (python -m utils.model_registry promote RUN_ID).
+    """
+    os.makedirs(models_dir, exist_ok=True)
+    versioned_model_path = f"{models_dir}/resume_classifier_{run_id}.pkl"
+    versioned_vec_path = f"{models_dir}/tfidf_vectorizer_{run_id}.pkl"
 
+    print("Saving model and vectorizer...")
     with open(versioned_model_path, "wb") as f:
         pickle.dump(clf, f)
 
     with open(versioned_vec_path, "wb") as f:
         pickle.dump(tfidf, f)
 
+    # memory-mappable copy that the app loads instead of the pickles
+    versioned_arrays_dir = f"{models_dir}/resume_classifier_{run_id}"
+    export_arrays(clf, tfidf, versioned_arrays_dir,
+                  sources={"model": versioned_model_path, "vectorizer": versioned_vec_path})
+
     run_meta = {
         "run_id": run_id,
-        "data_path": data_path,
-        "samples": len(df),
-        "random_state": RANDOM_STATE,
-        "accuracy": round(accuracy, 5),
+        **meta,
         "started_at": datetime.utcnow().isoformat(),
         "training_time_sec": round(time.time() - started_at, 3),
         "artifacts": {
             "model": versioned_model_path,
-            "vectorizer": versioned_vec_path
+            "vectorizer": versioned_vec_path,
+            "arrays": versioned_arrays_dir
         }
     }
 
-    with open(f"models/run_{run_id}.json", "w", encoding="utf-8") as f:
+    with open(f"{models_dir}/run_{run_id}.json", "w", encoding="utf-8") as f:
         json.dump(run_meta, f, indent=2)
 
-    print("Done! Model saved.")
-    print(f"Run metadata written to models/run_{run_id}.json")
+    print(f"Done! Run {run_id} saved (not serving yet).")
+    print(f"Run metadata written to {models_dir}/run_{run_id}.json")
+    print(f"Serve this run with: python -m utils.model_registry promote {run_id}")
+    return run_meta
+
+
+# -----------------------
+# Streaming (out-of-core) training
+# -----------------------
+def _is_holdout(text):
+    # stable across runs and chunk sizes, unlike a random split
+    return zlib.crc32(text.encode("utf-8")) % HOLDOUT_BUCKETS == 0
+
+
+def _read_chunks(data_path, chunk_size):
+    """(texts, labels, holdout flags) per chunk of the CSV."""
+    _validate(pd.read_csv(data_path, nrows=0))
+    for chunk in pd.read_csv(data_path, usecols=["text", "label"], chunksize=chunk_size):
+        chunk = chunk.dropna(subset=["text", "label"])
+        texts = chunk["text"].astype(str).tolist()
+        yield texts, chunk["label"].astype(str).tolist(), [_is_holdout(t) for t in texts]
+
+
+def _split(texts, labels, holdout, want_holdout):
+    keep = [i for i, h in enumerate(holdout) if h == want_holdout]
+    return [texts[i] for i in keep], [labels[i] for i in keep]
+
+
+def _print_report(confusion, labels):
+    """classification_report's table, from (true, predicted) counts."""
+    print(f"{'':>28} precision    recall  f1-score   support\n")
+    for label in labels:
+        tp = confusion[(label, label)]
+        predicted = sum(n for (_, p), n in confusion.items() if p == label)
+        support = sum(n for (t, _), n in confusion.items() if t == label)
+        precision = tp / predicted if predicted else 0.0
+        recall = tp / support if support else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        print(f"{label:>28} {precision:>9.2f} {recall:>9.2f} {f1:>9.2f} {support:>9}")
+
+
+def train_model_streaming(data_path=DATA_PATH, models_dir=MODELS_DIR, chunk_size=STREAM_CHUNK_SIZE,
+                          n_features=STREAM_N_FEATURES):
+    """
+    Train on a CSV of any size in three passes over chunks: document
+    frequencies (for the idf weights), MultinomialNB.partial_fit, and
+    evaluation on the hash-held-out rows. The hashing vectorizer needs no
+    vocabulary, so memory is bounded by chunk_size and n_features, not by
+    the number of rows.
+    """
+    if not os.path.exists(data_path):
+        print(f"Error: {data_path} not found. Run generate_data.py first.")
+        return
+
+    started_at = time.time()
+    run_id = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    hasher = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None, stop_words="english")
+
+    print("Pass 1/3: document frequencies...")
+    doc_freq = np.zeros(n_features, dtype=np.int64)
+    n_train = n_holdout = 0
+    classes = set()
+    for texts, labels, holdout in _read_chunks(data_path, chunk_size):
+        classes.update(labels)
+        train_texts, _ = _split(texts, labels, holdout, False)
+        n_holdout += len(texts) - len(train_texts)
+        if train_texts:
+            X = hasher.transform(train_texts)
+            doc_freq += np.bincount(X.indices, minlength=n_features)
+            n_train += len(train_texts)
+    if not n_train:
+        raise ValueError(f"No training rows in {data_path}")
+
+    # TfidfTransformer(smooth_idf=True) weights, fitted from the counts above
+    weighting = TfidfTransformer()
+    weighting.idf_ = np.log((n_train + 1) / (doc_freq + 1)) + 1
+    weighting.n_features_in_ = n_features
+    vectorizer = make_pipeline(hasher, weighting)
+
+    print("Pass 2/3: training Naive Bayes classifier incrementally...")
+    classes = sorted(classes)
+    clf = MultinomialNB()
+    for texts, labels, holdout in _read_chunks(data_path, chunk_size):
+        train_texts, train_labels = _split(texts, labels, holdout, False)
+        if train_texts:
+            clf.partial_fit(vectorizer.transform(train_texts), train_labels, classes=classes)
+
+    print("Pass 3/3: evaluating model...")
+    confusion = Counter()
+    for texts, labels, holdout in _read_chunks(data_path, chunk_size):
+        test_texts, test_labels = _split(texts, labels, holdout, True)
+        if test_texts:
+            confusion.update(zip(test_labels, clf.predict(vectorizer.transform(test_texts))))
+    correct = sum(n for (t, p), n in confusion.items() if t == p)
+    accuracy = correct / n_holdout if n_holdout else 0.0
+
+    print(f"Accuracy: {accuracy:.4f}")
+    print("\nClassification Report:\n")
+    _print_report(confusion, classes)
+
+    return _save_run(clf, vectorizer, run_id, models_dir, {
+        "data_path": data_path,
+        "samples": n_train + n_holdout,
+        "holdout_samples": n_holdout,
+        "mode": "streaming",
+        "n_features": n_features,
+        "chunk_size": chunk_size,
+        "accuracy": round(accuracy, 5),
+    }, started_at)
+
+
+# -----------------------
+# Hyperparameter search
+# -----------------------
+def _candidates(grid):
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in product(*(grid[k] for k in keys))]
+
+
+def _build(params):
+    tfidf = TfidfVectorizer(stop_words="english", max_features=params["max_features"],
+                            ngram_range=params["ngram_range"], sublinear_tf=params["sublinear_tf"])
+    return tfidf, MultinomialNB(alpha=params["alpha"])
+
+
+def _fit(params, X, y):
+    tfidf, clf = _build(params)
+    clf.fit(tfidf.fit_transform(X), y)
+    return tfidf, clf
+
+
+def _cv_fold(params, X, y, train_idx, test_idx):
+    """(accuracy, fit seconds) of one candidate on one fold."""
+    started = time.perf_counter()
+    tfidf, clf = _fit(params, X[train_idx], y[train_idx])
+    fit_seconds = time.perf_counter() - started
+    return accuracy_score(y[test_idx], clf.predict(tfidf.transform(X[test_idx]))), fit_seconds
+
+
+def _serving_cost(clf, tfidf, texts):
+    """(export size in bytes, mean ms per document) as the app would serve the model."""
+    out_dir = tempfile.mkdtemp(prefix="resume_classifier_")
+    try:
+        export_arrays(clf, tfidf, out_dir)
+        size = sum(os.path.getsize(os.path.join(out_dir, name)) for name in os.listdir(out_dir))
+        predictor = NBPredictor(out_dir)
+        predictor.predict(texts[:1])  # page in the mapped arrays
+        started = time.perf_counter()
+        for text in texts:
+            predictor.predict([text])
+        return size, (time.perf_counter() - started) / len(texts) * 1000
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+
+def train_model_search(data_path=DATA_PATH, models_dir=MODELS_DIR, grid=None, n_splits=SEARCH_FOLDS,
+                       latency_budget_ms=SEARCH_LATENCY_BUDGET_MS, n_jobs=-1):
+    """
+    Cross-validate every combination of grid (default SEARCH_GRID) on the
+    training split, with the candidate x fold fits spread over n_jobs
+    processes. Each candidate is then refitted on the whole training split
+    and its array export timed one document at a time, since that is what
+    the app serves. The most accurate candidate within latency_budget_ms
+    per document (the fastest one, if none is) is evaluated on the held-out
+    split and saved as a regular run; the manifest lists every candidate.
+    """
+    if not os.path.exists(data_path):
+        print(f"Error: {data_path} not found. Run generate_data.py first.")
+        return
+
+    started_at = time.time()
+    run_id = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+
+    print("Loading data...")
+    df = _validate(pd.read_csv(data_path))
+    X_train, X_test, y_train, y_test = train_test_split(
+        df["text"].to_numpy(), df["label"].to_numpy(), test_size=0.2, random_state=RANDOM_STATE,
+        stratify=df["label"]
+    )
+
+    candidates = _candidates(grid or SEARCH_GRID)
+    folds = list(StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=RANDOM_STATE).split(X_train, y_train))
+    print(f"Cross-validating {len(candidates)} candidates x {n_splits} folds...")
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(_cv_fold)(params, X_train, y_train, train_idx, test_idx)
+        for params in candidates for train_idx, test_idx in folds
+    )
+
+    # refits and timings run one at a time so the latencies are comparable
+    print("Measuring size and latency of each candidate...")
+    latency_texts = list(X_test[:SEARCH_LATENCY_SAMPLES])
+    report, fitted = [], []
+    for i, params in enumerate(candidates):
+        accuracies, fit_seconds = zip(*scores[i * n_splits:(i + 1) * n_splits])
+        tfidf, clf = _fit(params, X_train, y_train)
+        size, latency_ms = _serving_cost(clf, tfidf, latency_texts)
+        fitted.append((tfidf, clf))
+        report.append({
+            "params": {**params, "ngram_range": list(params["ngram_range"])},
+            "cv_accuracy": round(float(np.mean(accuracies)), 5),
+            "cv_accuracy_std": round(float(np.std(accuracies)), 5),
+            "fit_time_sec": round(float(np.mean(fit_seconds)), 4),
+            "artifact_bytes": size,
+            "latency_ms_per_doc": round(latency_ms, 4),
+            "within_budget": latency_ms <= latency_budget_ms,
+        })
+
+    eligible = [i for i, c in enumerate(report) if c["within_budget"]]
+    if eligible:
+        best = max(eligible, key=lambda i: (report[i]["cv_accuracy"], -report[i]["latency_ms_per_doc"]))
+    else:
+        print(f"Warning: no candidate within {latency_budget_ms} ms/doc; keeping the fastest.")
+        best = min(range(len(report)), key=lambda i: report[i]["latency_ms_per_doc"])
+    report[best]["selected"] = True
+
+    print(f"{'cv acc':>8} {'fit s':>7} {'KiB':>7} {'ms/doc':>7}  params")
+    for c in sorted(report, key=lambda c: -c["cv_accuracy"]):
+        marker = "*" if c.get("selected") else (" " if c["within_budget"] else "-")
+        print(f"{marker}{c['cv_accuracy']:>7.4f} {c['fit_time_sec']:>7.3f} {c['artifact_bytes'] / 1024:>7.0f} "
+              f"{c['latency_ms_per_doc']:>7.3f}  {c['params']}")
+
+    print("Evaluating selected model...")
+    tfidf, clf = fitted[best]
+    y_pred = clf.predict(tfidf.transform(X_test))
+    accuracy = accuracy_score(y_test, y_pred)
+
+    print(f"Accuracy: {accuracy:.4f}")
+    print("\nClassification Report:\n")
+    print(classification_report(y_test, y_pred))
+
+    return _save_run(clf, tfidf, run_id, models_dir, {
+        "data_path": data_path,
+        "samples": len(df),
+        "random_state": RANDOM_STATE,
+        "accuracy": round(accuracy, 5),
+        "mode": "search",
+        "params": report[best]["params"],
+        "cv_folds": n_splits,
+        "latency_budget_ms": latency_budget_ms,
+        "candidates": report,
+    }, started_at)
+
 
 if __name__ == "__main__":
-    train_model()
+    parser = argparse.ArgumentParser(description="Train the resume role classifier")
+    parser.add_argument("--data", default=DATA_PATH, help="CSV with 'text' and 'label' columns")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--streaming", action="store_true",
+                      help="out-of-core training in chunks (hashing vectorizer + partial_fit)")
+    mode.add_argument("--search", action="store_true",
+                      help="cross-validated hyperparameter search under a latency budget")
+    parser.add_argument("--chunk-size", type=int, default=STREAM_CHUNK_SIZE, help="rows per chunk (--streaming)")
+    parser.add_argument("--n-features", type=int, default=STREAM_N_FEATURES,
+                        help="hashed feature space (--streaming)")
+    parser.add_argument("--folds", type=int, default=SEARCH_FOLDS, help="cross-validation folds (--search)")
+    parser.add_argument("--latency-budget-ms", type=float, default=SEARCH_LATENCY_BUDGET_MS,
+                        help="max served latency per document (--search)")
+    parser.add_argument("--jobs", type=int, default=-1, help="parallel fits, -1 for all cores (--search)")
+    args = parser.parse_args()
+    if args.search:
+        train_model_search(args.data, n_splits=args.folds, latency_budget_ms=args.latency_budget_ms,
+                           n_jobs=args.jobs)
+    elif args.streaming:
+        train_model_streaming(args.data, chunk_size=args.chunk_size, n_features=args.n_features)
+    else:
+        train_model(args.data)
@@ -0,0 +1,117 @@
+"""
+Test suite for the parse-once / score-many analysis service.
+Tests that role, job description and experience level changes rescore without re-parsing.
+"""
+
+import io
+import time
+from unittest.mock import patch
+
+from utils import analysis_service
+from utils.analysis_service import AnalysisService
+from utils.parse_cache import ParseCache, set_parse_cache
+
+
+RESUME_TEXT = b"""Jane Doe
+Objective: backend engineer
+EXPERIENCE
+Software Engineer | Acme | 2020 - Present
+- Built Python and SQL services on AWS with Docker
+PROJECTS
+- Portfolio site, github.com/jane
+EDUCATION
+B.Tech Computer Science, 2019
+SKILLS
+Python, SQL, Docker, Git, REST APIs
+"""
+
+
+class MockUploadedFile(io.BytesIO):
+    """Mock Streamlit UploadedFile for testing"""
+
+    def __init__(self, content, name="resume.txt"):
+        super().__init__(content)
+        self.name = name
+        self.size = len(content)
+
+
+def _service():
+    set_parse_cache(ParseCache())
+    return AnalysisService({})
+
+
+def test_rescore_does_not_reparse():
+    """Test role/JD/level changes only rerun scoring"""
+    service = _service()
+    upload = MockUploadedFile(RESUME_TEXT)
+    real_parse = analysis_service.parse_resume
+
+    with patch.object(analysis_service, "parse_resume", side_effect=real_parse) as parse_mock:
+        first = service.analyze(upload, "file-1", "Backend Developer")
+        second = service.analyze(upload, "file-1", "Data Scientist")
+        third = service.analyze(upload, "file-1", "Data Scientist",
+                                job_description="Kubernetes experience required",
+                                experience_level="Senior")
+
+    assert parse_mock.call_count == 1, "Document should be parsed once per upload"
+    assert first["plain_text"] == second["plain_text"] == third["plain_text"]
+    assert third["analysis_key"][2] == "Kubernetes experience required"
+    set_parse_cache(None)
+    print("✅ Test passed: rescoring reuses the parsed document")
+
+
+def test_same_settings_return_stored_results():
+    """Test unchanged settings return the stored results without scoring"""
+    service = _service()
+    upload = MockUploadedFile(RESUME_TEXT)
+    first = service.analyze(upload, "file-1", "Backend Developer")
+
+    with patch.object(analysis_service, "get_resume_feedback") as feedback_mock:
+        again = service.analyze(upload, "file-1", "Backend Developer")
+
+    assert feedback_mock.call_count == 0, "Unchanged settings should not rescore"
+    assert again is first
+    set_parse_cache(None)
+    print("✅ Test passed: stored results reused")
+
+
+def test_new_upload_reparses():
+    """Test a new file id triggers a new parse"""
+    service = _service()
+    service.analyze(MockUploadedFile(RESUME_TEXT), "file-1", "Backend Developer")
+    assert not service.needs_parse("file-1")
+    assert service.needs_parse("file-2")
+
+    other = MockUploadedFile(RESUME_TEXT + b"\nKubernetes, Terraform\n")
+    results = service.analyze(other, "file-2", "Backend Developer")
+    assert "Terraform" in results["plain_text"]
+    set_parse_cache(None)
+    print("✅ Test passed: new upload parsed")
+
+
+def test_rescore_is_fast():
+    """Test rescoring a parsed resume never parses again (timing is printed only)"""
+    service = _service()
+    upload = MockUploadedFile(RESUME_TEXT)
+    service.analyze(upload, "file-1", "Backend Developer")
+    entry = service.parsed_document(upload, "file-1")
+
+    runs = 20
+    with patch.object(analysis_service, "parse_resume") as parse_mock:
+        started = time.perf_counter()
+        for i in range(runs):
+            service.rescore(entry, "Data Scientist", job_description=f"python role {i}")
+        per_call_ms = (time.perf_counter() - started) * 1000 / runs
+        service.parsed_document(upload, "file-1")
+
+    assert parse_mock.call_count == 0, "Rescoring should reuse the parsed document"
+    print(f"   Rescore: {per_call_ms:.2f} ms per call")
+    set_parse_cache(None)
+    print("✅ Test passed: rescoring without parsing")
+
+
+if __name__ == "__main__":
+    test_rescore_does_not_reparse()
+    test_same_settings_return_stored_results()
+    test_new_upload_reparses()
+    test_rescore_is_fast()
@@ -0,0 +1,76 @@
+"""
+Test suite for resume scoring.
+Checks batch scoring gives exactly what per-resume scoring gives.
+"""
+
+import csv
+import io
+import itertools
+from unittest.mock import patch
+
+from utils import analyze_resume, batch_analyzer
+from utils.analyze_resume import get_resume_feedback, get_resume_feedback_many, predict_roles
+from utils.role_catalog import get_role_catalog
+
+JD = "We need engineers experienced with Kubernetes, PostgreSQL, microservices and Terraform."
+
+
+def sample_texts():
+    with open("data/synthetic_resumes.csv", encoding="utf-8") as f:
+        texts = [row["text"] for row in itertools.islice(csv.DictReader(f), 60)]
+    with open("test_files/sample_resume.txt", encoding="utf-8") as f:
+        texts.append(f.read())
+    return texts + [""]
+
+
+def test_many_matches_single():
+    """Test every role, JD and level scores identically in batch and one by one"""
+    texts = sample_texts()
+    roles = get_role_catalog().roles() + ["Unknown Role"]
+    predicted = predict_roles(texts)
+    assert get_resume_feedback_many(texts, roles[0]) == [get_resume_feedback(t, roles[0]) for t in texts]
+    for role, jd, level in itertools.product(roles, ("", JD), ("Entry Level", "Senior")):
+        batch = get_resume_feedback_many(texts, role, jd, level, predicted_roles=predicted)
+        single = [get_resume_feedback(t, role, jd, level, predicted_role=p) for t, p in zip(texts, predicted)]
+        assert batch == single, (role, jd, level)
+    print(f"✅ Test passed: batch scoring ({len(texts)} texts x {len(roles)} roles)")
+
+
+def test_one_model_call_per_batch():
+    """Test the classifier is called once for the whole batch"""
+    texts = sample_texts()
+    predictor = analyze_resume.load_role_predictor()
+    assert predict_roles(texts) == [analyze_resume.predict_role_from_resume(t) for t in texts]
+    with patch.object(predictor, "predict", wraps=predictor.predict) as predict:
+        get_resume_feedback_many(texts, "Data Scientist")
+    assert predict.call_count == 1
+    assert get_resume_feedback_many([], "Data Scientist") == []
+    print("✅ Test passed: one model call")
+
+
+class Upload(io.BytesIO):
+    """Stand-in for a Streamlit UploadedFile"""
+
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+
+
+def test_batch_analyzer_uses_batch_scoring():
+    """Test batch analysis keeps per-file results and isolates unreadable files"""
+    with open("test_files/sample_resume.txt", "rb") as f:
+        resume = f.read()
+    files = [Upload("a.txt", resume), Upload("empty.txt", b"too short"), Upload("b.txt", resume + b"\nKubernetes")]
+    with patch.object(batch_analyzer.time, "sleep"):
+        results = batch_analyzer.batch_analyze_resumes(files, "DevOps Engineer", JD)
+    expected = [batch_analyzer.analyze_single_resume(f, "DevOps Engineer", JD) for f in files]
+    assert [r["status"] for r in results] == ["success", "error", "success"]
+    assert results == expected
+    print("✅ Test passed: batch analyzer")
+
+
+if __name__ == "__main__":
+    test_many_matches_single()
+    test_one_model_call_per_batch()
+    test_batch_analyzer_uses_batch_scoring()
@@ -91,11 +91,13 @@ def test_batch_analyzer():
     print("\nTest 7: Batch summary calculation")
     results = [
         {"filename": "r1.pdf", "status": "success", "score": 75, "keyword_match": 80, "word_count": 500},
-        {"filename": "r2.pdf", "status": "success", "score": 85, "keyword_match": 90, "word_count": 600},
+        {"filename": "r2.pdf", "status": "success", "score": 85, "keyword_match": 90, "word_count": 600,
+         "truncated": True, "timed_out": True},
         {"filename": "r3.pdf", "status": "error", "score": 0, "keyword_match": 0, "word_count": 0},
     ]
 
     summary = get_batch_summary(results)
+    assert summary["truncated"] == 1, "Should count partially parsed files"
     assert summary["total_files"] == 3, "Should count all files"
     assert summary["successful"] == 2, "Should count successful analyses"
     assert summary["failed"] == 1, "Should count failed analyses"
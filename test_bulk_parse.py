@@ -0,0 +1,178 @@
+"""
+Test suite for the headless bulk parser.
+Parses small directories and zips into JSONL in a temp dir.
+"""
+
+import json
+import os
+import tempfile
+import zipfile
+from unittest.mock import patch
+
+import fitz  # PyMuPDF
+
+from utils import bulk_parse
+
+# the real worker function, for the crashing stand-in below
+PARSE_TASK = bulk_parse.parse_task
+
+TXT_RESUME = b"Jane Doe\nSKILLS\nPython, SQL, Docker\nEXPERIENCE\nEngineer | Acme | 2020 - Present\n"
+
+
+def make_pdf(text):
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((50, 72), text, fontsize=11)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def make_tree(root):
+    """Two resumes and one file with another extension"""
+    os.makedirs(os.path.join(root, "batch"))
+    with open(os.path.join(root, "jane.txt"), "wb") as f:
+        f.write(TXT_RESUME)
+    with open(os.path.join(root, "batch", "john.pdf"), "wb") as f:
+        f.write(make_pdf("John Smith - Data Engineer"))
+    with open(os.path.join(root, "notes.md"), "wb") as f:
+        f.write(b"not a resume")
+
+
+def read_records(path):
+    with open(path, encoding="utf-8") as f:
+        return {r["id"]: r for r in map(json.loads, f)}
+
+
+def test_directory_to_jsonl():
+    """Test every resume gets one record with timings"""
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        make_tree(src)
+        out = os.path.join(tmp, "out.jsonl")
+        stats = bulk_parse.run(src, out, workers=2)
+        records = read_records(out)
+
+    assert sorted(records) == ["batch/john.pdf", "jane.txt"]
+    assert stats["ok"] == 2 and stats["error"] == 0
+    jane = records["jane.txt"]
+    assert jane["status"] == "ok" and "Python, SQL, Docker" in jane["result"]["plain_text"]
+    assert "John Smith" in records["batch/john.pdf"]["result"]["plain_text"]
+    assert set(jane["timings"]) == {"read_ms", "parse_ms", "total_ms"}
+    print("✅ Test passed: directory to JSONL")
+
+
+def test_error_record():
+    """Test a file that cannot be read becomes an error record"""
+    record = bulk_parse.parse_task(("gone.pdf", "/nonexistent/gone.pdf", None))
+    assert record["status"] == "error"
+    assert record["error"]["type"] == "FileNotFoundError"
+    assert record["timings"]["total_ms"] >= 0
+    print("✅ Test passed: error record")
+
+
+def test_unreadable_and_empty_files_are_errors():
+    """Test corrupt files record the extraction error, empty ones are flagged, and both are retried"""
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        os.makedirs(src)
+        with open(os.path.join(src, "bad.pdf"), "wb") as f:
+            f.write(b"this is not a pdf at all" * 10)
+        blank = fitz.open()
+        blank.new_page()
+        blank.save(os.path.join(src, "blank.pdf"))
+        blank.close()
+        with open(os.path.join(src, "good.txt"), "wb") as f:
+            f.write(TXT_RESUME)
+        out = os.path.join(tmp, "out.jsonl")
+        stats = bulk_parse.run(src, out, workers=1)
+        records = read_records(out)
+        retried = bulk_parse.run(src, out, workers=1, retry_errors=True)
+
+    assert stats["ok"] == 1 and stats["error"] == 2
+    bad = records["bad.pdf"]
+    assert bad["status"] == "error" and bad["error"]["type"] not in ("", bulk_parse.EMPTY_DOCUMENT)
+    assert bad["error"]["message"] and "result" not in bad
+    assert records["blank.pdf"]["error"]["type"] == bulk_parse.EMPTY_DOCUMENT
+    assert records["good.txt"]["status"] == "ok"
+    assert retried["skipped"] == 1 and retried["error"] == 2
+    print(f"✅ Test passed: unreadable files ({bad['error']['type']})")
+
+
+def test_zip_and_resume():
+    """Test zip input and resuming from a partly written output"""
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = os.path.join(tmp, "resumes.zip")
+        with zipfile.ZipFile(archive, "w") as zf:
+            for i in range(4):
+                zf.writestr(f"cv/{i}.txt", TXT_RESUME + f"Candidate {i}\n".encode())
+            zf.writestr("cv/readme.md", "skip me")
+        out = os.path.join(tmp, "out.jsonl")
+        first = bulk_parse.run(archive, out, workers=1)
+
+        # keep two complete records and half of the third, as after a kill
+        with open(out, encoding="utf-8") as f:
+            lines = f.readlines()
+        with open(out, "w", encoding="utf-8") as f:
+            f.writelines(lines[:2])
+            f.write(lines[2][:20])
+        second = bulk_parse.run(archive, out, workers=1)
+        with open(out, encoding="utf-8") as f:
+            final = [json.loads(line) for line in f]
+
+    assert first["ok"] == 4
+    assert second["skipped"] == 2 and second["ok"] == 2
+    assert sorted(r["id"] for r in final) == [f"cv/{i}.txt" for i in range(4)]
+    print("✅ Test passed: zip input and resume")
+
+
+def crashing_parse(task, time_budget=None, max_pages=None):
+    """Kills the worker on one file, like a segfault in a PDF library"""
+    if task[0] == "crash.txt":
+        os._exit(1)
+    return PARSE_TASK(task, time_budget, max_pages)
+
+
+def test_worker_crash_is_recorded():
+    """Test a file that kills its worker is recorded and the run carries on"""
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "src")
+        os.makedirs(src)
+        for name in ("a.txt", "crash.txt", "z.txt"):
+            with open(os.path.join(src, name), "wb") as f:
+                f.write(TXT_RESUME)
+        out = os.path.join(tmp, "out.jsonl")
+        with patch.object(bulk_parse, "parse_task", crashing_parse):
+            stats = bulk_parse.run(src, out, workers=1)
+        records = read_records(out)
+
+    assert records["crash.txt"]["status"] == "error"
+    assert records["crash.txt"]["error"]["type"] == "WorkerCrash"
+    assert records["a.txt"]["status"] == "ok" and records["z.txt"]["status"] == "ok"
+    assert stats["error"] == 1
+    print("✅ Test passed: worker crash")
+
+
+def test_rejects_other_inputs():
+    """Test a plain file is refused before any output is written"""
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "resume.txt")
+        with open(src, "wb") as f:
+            f.write(TXT_RESUME)
+        out = os.path.join(tmp, "out.jsonl")
+        try:
+            bulk_parse.run(src, out)
+            assert False, "Expected ValueError"
+        except ValueError:
+            pass
+        assert not os.path.exists(out)
+    print("✅ Test passed: input validation")
+
+
+if __name__ == "__main__":
+    test_directory_to_jsonl()
+    test_error_record()
+    test_unreadable_and_empty_files_are_errors()
+    test_zip_and_resume()
+    test_worker_crash_is_recorded()
+    test_rejects_other_inputs()
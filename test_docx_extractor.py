@@ -0,0 +1,161 @@
+"""
+Test suite for native DOCX extraction.
+Builds small DOCX files in memory with zipfile so no fixtures are needed.
+"""
+
+import io
+import mmap
+import os
+import tempfile
+import zipfile
+from unittest.mock import patch
+
+from utils import docx_extractor
+from utils.docx_extractor import (
+    STYLE_HEADING,
+    STYLE_LIST,
+    STYLE_PARAGRAPH,
+    extract_docx_blocks,
+    extract_docx_text,
+    is_docx,
+)
+from utils.preview_generator import generate_docx_preview
+from utils.resume_parser import parse_resume
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Override PartName="/word/document.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+
+# Localized style id ("Berschrift1") whose name still says "heading 1"
+STYLES = (
+    f'<w:styles {W}>'
+    '<w:style w:type="paragraph" w:styleId="Berschrift1"><w:name w:val="heading 1"/></w:style>'
+    '<w:style w:type="paragraph" w:styleId="Listenabsatz"><w:name w:val="List Paragraph"/></w:style>'
+    '</w:styles>'
+)
+
+
+def para(text, style=None, numbered=False):
+    ppr = ""
+    if style or numbered:
+        ppr = "<w:pPr>"
+        if style:
+            ppr += f'<w:pStyle w:val="{style}"/>'
+        if numbered:
+            ppr += '<w:numPr><w:ilvl w:val="0"/><w:numId w:val="1"/></w:numPr>'
+        ppr += "</w:pPr>"
+    return f"<w:p>{ppr}<w:r><w:t>{text}</w:t></w:r></w:p>"
+
+
+def make_docx(body, styles=STYLES):
+    """Build a minimal DOCX around the given w:body content"""
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("[Content_Types].xml", CONTENT_TYPES)
+        zf.writestr("word/document.xml", f"<w:document {W}><w:body>{body}</w:body></w:document>")
+        if styles:
+            zf.writestr("word/styles.xml", styles)
+    return buf.getvalue()
+
+
+class NamedBytesIO(io.BytesIO):
+    """BytesIO with a name, like a Streamlit UploadedFile"""
+
+    def __init__(self, content, name="resume.docx"):
+        super().__init__(content)
+        self.name = name
+
+
+SAMPLE_BODY = "".join([
+    para("Jane Doe"),
+    para("Work History", style="Berschrift1"),
+    para("Engineer | Acme | 2020 - Present"),
+    para("Built Python services", numbered=True),
+    para("Migrated SQL databases to AWS", style="Listenabsatz"),
+    para("Education", style="Heading2"),
+    "<w:tbl><w:tr><w:tc>" + para("B.Tech") + "</w:tc><w:tc>" + para("2019") + "</w:tc></w:tr></w:tbl>",
+    para("Skills", style="Berschrift1"),
+    para("Python, SQL, Docker"),
+    "<w:p/>",
+])
+
+
+def test_is_docx():
+    """Test DOCX detection by content, not by file name"""
+    assert is_docx(make_docx(SAMPLE_BODY))
+    assert not is_docx(b"%PDF-1.4 not a docx")
+    assert not is_docx(b"PK\x03\x04 broken zip")
+    print("✅ Test passed: DOCX detection")
+
+
+def test_blocks_keep_styles_and_order():
+    """Test paragraphs, headings, list items and table cells come out in order"""
+    blocks = extract_docx_blocks(make_docx(SAMPLE_BODY))
+    assert [(b["text"], b["style"]) for b in blocks] == [
+        ("Jane Doe", STYLE_PARAGRAPH),
+        ("Work History", STYLE_HEADING),
+        ("Engineer | Acme | 2020 - Present", STYLE_PARAGRAPH),
+        ("Built Python services", STYLE_LIST),
+        ("Migrated SQL databases to AWS", STYLE_LIST),
+        ("Education", STYLE_HEADING),
+        ("B.Tech", STYLE_PARAGRAPH),
+        ("2019", STYLE_PARAGRAPH),
+        ("Skills", STYLE_HEADING),
+        ("Python, SQL, Docker", STYLE_PARAGRAPH),
+    ]
+    assert [b["bbox"][1] for b in blocks] == list(range(len(blocks)))
+    print("✅ Test passed: DOCX blocks")
+
+
+def test_text_and_preview():
+    """Test plain text bullets list items and the preview uses it"""
+    data = make_docx(SAMPLE_BODY)
+    text = extract_docx_text(data)
+    assert "- Built Python services" in text.splitlines()
+    preview = generate_docx_preview(data, max_chars=21)
+    assert preview.startswith("Jane Doe\nWork History")
+    assert preview.endswith("... (preview truncated)")
+    print("✅ Test passed: DOCX text and preview")
+
+
+def test_parse_resume_docx_sections():
+    """Test DOCX uploads go through the structure pipeline with heading styles"""
+    parsed = parse_resume(NamedBytesIO(make_docx(SAMPLE_BODY)), use_cache=False)
+    structured = parsed["structured"]
+    # "Work History" is not a known heading word; its style makes it one
+    assert "WORK HISTORY" in structured
+    assert "Built Python services" in parsed["plain_text"]
+    assert structured["SKILLS"] == ["Python", "SQL", "Docker"]
+    print("✅ Test passed: DOCX parse_resume sections")
+
+
+def test_docx_file_is_read_in_place():
+    """Test an open DOCX file is read by zipfile through its mapping, not copied"""
+    data = make_docx(SAMPLE_BODY)
+    expected = parse_resume(NamedBytesIO(data), use_cache=False)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "resume.docx")
+        with open(path, "wb") as f:
+            f.write(data)
+        with open(path, "rb") as f, \
+                patch.object(docx_extractor, "_zip_source", wraps=docx_extractor._zip_source) as source_mock:
+            parsed = parse_resume(f, use_cache=False)
+    assert parsed == expected
+    sources = [c.args[0] for c in source_mock.call_args_list]
+    assert len(sources) == 2 and all(isinstance(src, mmap.mmap) for src in sources)
+    assert all(isinstance(docx_extractor._zip_source(src), docx_extractor._MappedFile) for src in sources)
+    print("✅ Test passed: DOCX read in place")
+
+
+if __name__ == "__main__":
+    test_is_docx()
+    test_blocks_keep_styles_and_order()
+    test_text_and_preview()
+    test_parse_resume_docx_sections()
+    test_docx_file_is_read_in_place()
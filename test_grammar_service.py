@@ -0,0 +1,294 @@
+"""
+Test suite for the grammar service.
+Runs on the stub backend and scripted fake backends, so no Java is needed.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.grammar_service import (
+    GrammarService,
+    GrammarServiceBusy,
+    GrammarServiceUnavailable,
+    StubBackend,
+    set_grammar_service,
+    split_chunks,
+)
+
+
+class FakeBackend:
+    """Counts checks; can be made to fail or to block until released"""
+    name = "fake"
+
+    def __init__(self, fail_checks=0, gate=None, error=ConnectionError("server went away")):
+        self.fail_checks = fail_checks
+        self.gate = gate
+        self.error = error
+        self.checks = 0
+        self.texts = []
+        self.closed = False
+
+    def check(self, text):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.checks += 1
+        self.texts.append(text)
+        if self.fail_checks:
+            self.fail_checks -= 1
+            raise self.error
+        return StubBackend().check(text)
+
+    def close(self):
+        self.closed = True
+
+
+def factory_of(*backends):
+    """Factory handing out the given backends in order, recording each start"""
+    started = []
+
+    def factory():
+        backend = backends[len(started)]
+        started.append(backend)
+        return backend
+    return factory, started
+
+
+def test_stub_backend():
+    """Test the stub finds LanguageTool-style issues with offsets"""
+    text = "I led the the team and i shipped  it."
+    issues = StubBackend().check(text)
+    assert [i.rule_id for i in issues] == ["ENGLISH_WORD_REPEAT_RULE", "I_LOWERCASE", "WHITESPACE_RULE"]
+    repeat = issues[0]
+    assert text[repeat.offset:repeat.offset + repeat.length] == "the the"
+    assert repeat.replacements == ("the",)
+    assert StubBackend().check("I wrote clean code.") == []
+    print("✅ Test passed: stub backend")
+
+
+def test_one_backend_started_lazily():
+    """Test the backend starts on first use and is shared by concurrent callers"""
+    factory, started = factory_of(FakeBackend())
+    service = GrammarService(factory, workers=3)
+    assert started == [], "Nothing should start before the first check"
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(service.check, ["i agree"] * 20))
+    service.shutdown()
+
+    assert len(started) == 1, "All sessions should share one backend"
+    assert all(r[0].rule_id == "I_LOWERCASE" for r in results)
+    assert service.served == 20
+    assert started[0].closed, "shutdown should close the backend"
+    print("✅ Test passed: lazy shared backend")
+
+
+def test_full_queue_fails_fast():
+    """Test requests beyond the queue bound are refused instead of queued"""
+    gate = threading.Event()
+    factory, _ = factory_of(FakeBackend(gate=gate))
+    service = GrammarService(factory, workers=1, queue_size=1)
+    running = service.submit("first")  # taken by the worker, blocked on the gate
+    while service._queue.qsize():
+        pass
+    queued = service.submit("second")
+    try:
+        service.submit("third")
+        assert False, "Expected GrammarServiceBusy"
+    except GrammarServiceBusy:
+        pass
+    gate.set()
+    assert running.result(5) == [] and queued.result(5) == []
+    service.shutdown()
+    print("✅ Test passed: bounded queue")
+
+
+def test_shutdown_does_not_block_on_a_stuck_worker():
+    """Test shutdown returns within its timeout with a full queue and a worker stuck in a check"""
+    gate = threading.Event()
+    factory, started = factory_of(FakeBackend(gate=gate))
+    service = GrammarService(factory, workers=1, queue_size=1)
+    service.submit("stuck")
+    while service._queue.qsize():
+        pass
+    queued = service.submit("waiting")
+
+    stopper = threading.Thread(target=service.shutdown, kwargs={"timeout": 0.5}, daemon=True)
+    stopper.start()
+    stopper.join(30)
+    assert not stopper.is_alive(), "shutdown should not wait for the stuck check"
+    assert queued.cancelled(), "Queued checks should be cancelled"
+    assert started[0].closed, "The backend should still be closed"
+    gate.set()
+    print("✅ Test passed: shutdown with a stuck worker")
+
+
+def test_failed_check_restarts_backend():
+    """Test a backend that dies mid-check is replaced and the check retried"""
+    broken, fresh = FakeBackend(fail_checks=1), FakeBackend()
+    factory, started = factory_of(broken, fresh)
+    service = GrammarService(factory, workers=1)
+    issues = service.check("we we won")
+    health = service.health()
+    service.shutdown()
+
+    assert [i.rule_id for i in issues] == ["ENGLISH_WORD_REPEAT_RULE"]
+    assert started == [broken, fresh] and broken.closed
+    assert health["restarts"] == 1 and health["healthy"] and "server went away" in health["last_error"]
+    print("✅ Test passed: restart on failure")
+
+
+def test_input_error_keeps_backend():
+    """Test an error caused by the request goes back to the caller without a restart"""
+    backend = FakeBackend(fail_checks=1, error=ValueError("text too long"))
+    factory, started = factory_of(backend)
+    service = GrammarService(factory, workers=1)
+    try:
+        service.check("x" * 100)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Expected the backend's ValueError")
+    issues = service.check("we we won")
+    service.shutdown()
+
+    assert [i.rule_id for i in issues] == ["ENGLISH_WORD_REPEAT_RULE"]
+    assert started == [backend] and backend.checks == 2, "The failed check should not be retried"
+    assert service.restarts == 0 and service.failures == 1
+    print("✅ Test passed: input errors do not restart")
+
+
+def test_idle_backend_is_probed():
+    """Test an idle backend is health-checked before serving and replaced if dead"""
+    stale, fresh = FakeBackend(), FakeBackend()
+    factory, started = factory_of(stale, fresh)
+    service = GrammarService(factory, workers=1, health_interval=0.0)
+    service.check("first")
+    stale.fail_checks = 1  # the server died while idle
+    service.check("second")
+    service.shutdown()
+
+    assert started == [stale, fresh]
+    assert service.restarts == 1 and service.failures == 0
+    print("✅ Test passed: idle health probe")
+
+
+def test_start_failure_backs_off():
+    """Test a backend that cannot start is not retried on every request"""
+    calls = []
+
+    def factory():
+        calls.append(1)
+        raise OSError("java not found")
+
+    service = GrammarService(factory, workers=1, restart_backoff=60)
+    for _ in range(3):
+        try:
+            service.check("text")
+            assert False, "Expected GrammarServiceUnavailable"
+        except GrammarServiceUnavailable as e:
+            assert "java not found" in str(e)
+    service.shutdown()
+    assert len(calls) == 1, "Starts should be held off during the backoff"
+    print("✅ Test passed: start backoff")
+
+
+RESUME = (
+    "Jane Doe\n\n"
+    "- Led the the platform team. Shipped a new API.\n"
+    "- i migrated  services to AWS.\n"
+    "- Led the the platform team. Shipped a new API.\n"
+)
+
+
+def test_split_chunks():
+    """Test chunks are the stripped sentences of each line, with their offsets"""
+    chunks = split_chunks(RESUME)
+    assert [c for _, c in chunks] == [
+        "Jane Doe", "- Led the the platform team.", "Shipped a new API.",
+        "- i migrated  services to AWS.", "- Led the the platform team.", "Shipped a new API.",
+    ]
+    assert all(RESUME[o:o + len(c)] == c for o, c in chunks)
+    print("✅ Test passed: chunking")
+
+
+def test_check_document_matches_whole_text():
+    """Test chunked issues carry offsets into the whole text"""
+    service = GrammarService(StubBackend, workers=2)
+    issues = service.check_document(RESUME)
+    service.shutdown()
+    assert [i.rule_id for i in issues] == [
+        "ENGLISH_WORD_REPEAT_RULE", "I_LOWERCASE", "WHITESPACE_RULE", "ENGLISH_WORD_REPEAT_RULE",
+    ]
+    whole = [i for i in StubBackend().check(RESUME)]
+    assert issues == whole, "Sentence-local rules should find the same issues at the same offsets"
+    print("✅ Test passed: chunk offsets")
+
+
+def test_edited_resume_rechecks_changed_lines_only():
+    """Test only new chunks reach the backend; repeated chunks are checked once"""
+    factory, started = factory_of(FakeBackend())
+    service = GrammarService(factory, workers=2)
+    service.check_document(RESUME)
+    first = sorted(started[0].texts)
+    started[0].texts.clear()
+    edited = RESUME.replace("i migrated  services", "I migrated services")
+    issues = service.check_document(edited)
+    service.shutdown()
+
+    assert len(first) == 4, "Duplicate bullets should be checked once"
+    assert started[0].texts == ["- I migrated services to AWS."]
+    assert [i.rule_id for i in issues] == ["ENGLISH_WORD_REPEAT_RULE", "ENGLISH_WORD_REPEAT_RULE"]
+    assert service.health()["chunk_cache_hits"] == 3
+    print("✅ Test passed: incremental re-check")
+
+
+def test_chunks_are_checked_concurrently():
+    """Test uncached chunks are in flight together across the workers"""
+    gate = threading.Event()
+    factory, started = factory_of(FakeBackend(gate=gate))
+    service = GrammarService(factory, workers=3)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        result = pool.submit(service.check_document, "One. Two. Three. Four.")
+        while service._queue.qsize() != 1:
+            pass  # three chunks taken by the workers, the fourth queued behind them
+        gate.set()
+        issues = result.result(5)
+    service.shutdown()
+    assert issues == [] and sorted(started[0].texts) == ["Four.", "One.", "Three.", "Two."]
+    print("✅ Test passed: concurrent chunks")
+
+
+def test_grammar_suggestions_use_service():
+    """Test the suggestions component formats service issues and survives failures"""
+    from components.suggestions import get_grammar_suggestions
+
+    set_grammar_service(GrammarService(StubBackend, workers=1))
+    try:
+        suggestions = get_grammar_suggestions("i built built APIs")
+        assert suggestions == [
+            "Grammar issue: The personal pronoun 'I' should be uppercase. Suggestion: I",
+            "Grammar issue: Possible typo: you repeated a word. Suggestion: built",
+        ]
+
+        def no_java():
+            raise OSError("java not found")
+        set_grammar_service(GrammarService(no_java, workers=1))
+        assert get_grammar_suggestions("i built APIs") == []
+    finally:
+        set_grammar_service(None)
+    print("✅ Test passed: grammar suggestions")
+
+
+if __name__ == "__main__":
+    test_stub_backend()
+    test_one_backend_started_lazily()
+    test_full_queue_fails_fast()
+    test_shutdown_does_not_block_on_a_stuck_worker()
+    test_failed_check_restarts_backend()
+    test_input_error_keeps_backend()
+    test_idle_backend_is_probed()
+    test_start_failure_backs_off()
+    test_split_chunks()
+    test_check_document_matches_whole_text()
+    test_edited_resume_rechecks_changed_lines_only()
+    test_chunks_are_checked_concurrently()
+    test_grammar_suggestions_use_service()
@@ -0,0 +1,46 @@
+"""
+Test suite for the Aho-Corasick keyword matcher.
+Checks it reports exactly what per-keyword substring checks report.
+"""
+
+import random
+
+from utils.keyword_matcher import KeywordMatcher
+from utils.role_catalog import get_role_catalog
+
+
+def test_nested_and_overlapping_keywords():
+    """Test keywords inside, overlapping and sharing prefixes with others are all found"""
+    matcher = KeywordMatcher(["java", "javascript", "script", "sql", "postgresql", "c", "c++", "ci/cd"])
+    assert matcher.find("javascript and postgresql") == {"java", "javascript", "script", "sql", "postgresql", "c"}
+    assert matcher.find("c++, ci/cd") == {"c", "c++", "ci/cd"}
+    assert matcher.find("") == set()
+    assert KeywordMatcher([]).find("anything") == set()
+    print("✅ Test passed: nested keywords")
+
+
+def test_matches_substring_checks():
+    """Test random keyword sets and texts against `keyword in text`"""
+    rng = random.Random(7)
+    for _ in range(500):
+        keywords = ["".join(rng.choice("abc") for _ in range(rng.randint(1, 5))) for _ in range(rng.randint(1, 10))]
+        text = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 40)))
+        assert KeywordMatcher(keywords).find(text) == {k for k in keywords if k in text}, (keywords, text)
+    print("✅ Test passed: random keyword sets")
+
+
+def test_catalog_skills():
+    """Test the catalog's matcher over every role's skills on the sample resumes"""
+    catalog = get_role_catalog()
+    skills = {k for role in catalog.roles() for k in catalog.role(role).keywords_lower}
+    with open("test_files/sample_resume.txt", encoding="utf-8") as f:
+        text = f.read().lower()
+    found = catalog.find(text)
+    assert found == {k for k in skills if k in text} and found
+    print(f"✅ Test passed: catalog skills ({len(found)} found)")
+
+
+if __name__ == "__main__":
+    test_nested_and_overlapping_keywords()
+    test_matches_substring_checks()
+    test_catalog_skills()
@@ -0,0 +1,155 @@
+"""
+Test suite for the block layout strategies.
+Uses synthetic blocks plus a two-column PDF built in memory with PyMuPDF.
+"""
+
+import io
+import time
+
+import fitz  # PyMuPDF
+
+from utils.layout import LAYOUT_COLUMNS, LAYOUT_LEGACY, merge_blocks
+from utils.parsed_resume import Block
+from utils.resume_parser import parse_resume
+
+
+def block(x0, y0, x1, text, page=1, height=10):
+    return Block(page, (x0, y0, x1, y0 + height), text)
+
+
+def two_column_blocks():
+    """Full-width name header, then a left and a right column with rows 30pt apart"""
+    blocks = [block(50, 20, 550, "JANE DOE - Backend Engineer")]
+    for i in range(3):
+        blocks.append(block(50, 60 + i * 30, 250, f"left {i}"))
+        blocks.append(block(320, 60 + i * 30, 550, f"right {i}"))
+    return blocks
+
+
+def texts(blocks):
+    return [b["text"] for b in blocks]
+
+
+def test_columns_read_column_by_column():
+    """Test two-column pages are read left column first instead of interleaved"""
+    blocks = two_column_blocks()
+    assert texts(merge_blocks(blocks, LAYOUT_LEGACY))[1:3] == ["left 0", "right 0"]
+    assert texts(merge_blocks(blocks, LAYOUT_COLUMNS)) == [
+        "JANE DOE - Backend Engineer", "left 0", "left 1", "left 2", "right 0", "right 1", "right 2",
+    ]
+    print("✅ Test passed: column reading order")
+
+
+def test_row_aligned_dates_stay_inline():
+    """Test right-aligned dates are joined to their row, not split into a column"""
+    blocks = []
+    for i in range(3):
+        blocks.append(block(50, 60 + i * 80, 200, f"Engineer {i}"))
+        blocks.append(block(450, 61 + i * 80, 540, f"20{10 + i}"))
+        blocks.append(block(60, 90 + i * 80, 300, f"- shipped feature {i}"))
+        blocks.append(block(60, 110 + i * 80, 300, f"- fixed bug {i}"))
+    assert texts(merge_blocks(blocks, LAYOUT_COLUMNS)) == [
+        "Engineer 0 2010", "- shipped feature 0 - fixed bug 0",
+        "Engineer 1 2011", "- shipped feature 1 - fixed bug 1",
+        "Engineer 2 2012", "- shipped feature 2 - fixed bug 2",
+    ]
+    print("✅ Test passed: row-aligned dates stay on their row")
+
+
+def test_footer_and_dates_do_not_make_columns():
+    """Test a centred footer and a lone right-aligned date keep single-column order"""
+    blocks = [
+        block(30, 170, 100, "Experience"),
+        block(30, 196, 80, "engineer"),
+        block(400, 197, 560, "code social (2025 - present)"),
+        block(30, 215, 560, "i am working as a contributor on various projects"),
+        block(30, 232, 240, "in real world projects."),
+        block(30, 267, 100, "Education"),
+        block(276, 807, 310, "Page 1/1"),
+    ]
+    assert texts(merge_blocks(blocks, LAYOUT_COLUMNS)) == [
+        "Experience engineer code social (2025 - present) "
+        "i am working as a contributor on various projects in real world projects.",
+        "Education",
+        "Page 1/1",
+    ]
+    print("✅ Test passed: footer and dates stay in one column")
+
+
+def test_spanning_blocks_split_bands():
+    """Test a full-width block between two column bands keeps its place"""
+    blocks = two_column_blocks()
+    blocks.append(block(50, 160, 550, "EXPERIENCE"))
+    blocks.append(block(50, 190, 250, "left 3"))
+    blocks.append(block(320, 190, 550, "right 3"))
+    order = texts(merge_blocks(blocks, LAYOUT_COLUMNS))
+    assert order.index("right 2") < order.index("EXPERIENCE") < order.index("left 3") < order.index("right 3")
+    print("✅ Test passed: spanning blocks split bands")
+
+
+def test_columns_scale_to_dense_pages():
+    """Test hundreds of blocks per page are ordered column by column (timing is printed only)"""
+    blocks = []
+    for page in range(1, 11):
+        for i in range(300):
+            x = 50 + (i % 3) * 180
+            blocks.append(block(x, 40 + (i // 3) * 25, x + 150, f"p{page} b{i}", page=page))
+    started = time.perf_counter()
+    merged = merge_blocks(blocks, LAYOUT_COLUMNS)
+    elapsed = time.perf_counter() - started
+    assert len(merged) == 30, "Each column should merge into one paragraph per page"
+    assert texts(merged)[0].startswith("p1 b0 p1 b3 p1 b6"), "First column should be read first"
+    assert [t.split()[0] for t in texts(merged)] == [f"p{page}" for page in range(1, 11) for _ in range(3)], \
+        "Pages should stay in order"
+    print(f"✅ Test passed: {len(blocks)} blocks ordered in {elapsed * 1000:.1f} ms")
+
+
+def test_unknown_layout_rejected():
+    """Test an unknown layout name raises ValueError"""
+    try:
+        merge_blocks(two_column_blocks(), "diagonal")
+    except ValueError:
+        print("✅ Test passed: unknown layout rejected")
+        return
+    raise AssertionError("Expected ValueError for an unknown layout")
+
+
+class NamedBytesIO(io.BytesIO):
+    """BytesIO with a name, like a Streamlit UploadedFile"""
+
+    def __init__(self, content, name="resume.pdf"):
+        super().__init__(content)
+        self.name = name
+
+
+def make_two_column_pdf():
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((50, 40), "JANE DOE - Backend Engineer with Python, SQL and AWS experience", fontsize=10)
+    for i, (left, right) in enumerate([("EXPERIENCE", "SKILLS"), ("Engineer at Acme", "Python, SQL"),
+                                       ("Built Python services", "Docker, AWS")]):
+        page.insert_text((50, 100 + i * 40), left, fontsize=10)
+        page.insert_text((320, 100 + i * 40), right, fontsize=10)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def test_parse_resume_layout_option():
+    """Test parse_resume applies the requested layout and caches per layout"""
+    data = make_two_column_pdf()
+    legacy = parse_resume(NamedBytesIO(data), layout=LAYOUT_LEGACY)["plain_text"]
+    columns = parse_resume(NamedBytesIO(data), layout=LAYOUT_COLUMNS)["plain_text"]
+    assert legacy.index("SKILLS") < legacy.index("Engineer at Acme"), "Legacy interleaves columns"
+    assert columns.index("Built Python services") < columns.index("SKILLS"), "Columns reads left first"
+    print("✅ Test passed: parse_resume layout option")
+
+
+if __name__ == "__main__":
+    test_columns_read_column_by_column()
+    test_row_aligned_dates_stay_inline()
+    test_footer_and_dates_do_not_make_columns()
+    test_spanning_blocks_split_bands()
+    test_columns_scale_to_dense_pages()
+    test_unknown_layout_rejected()
+    test_parse_resume_layout_option()
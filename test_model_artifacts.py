@@ -0,0 +1,167 @@
+"""
+Test suite for the role classifier artifacts and the NumPy predictor.
+Works on copies of models/ in a temp dir.
+"""
+
+import os
+import pickle
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from utils import model_artifacts
+from utils.model_artifacts import (
+    ARRAYS_DIR,
+    MANIFEST,
+    MODEL_PATH,
+    VECTORIZER_PATH,
+    ModelArtifacts,
+    NBPredictor,
+    SklearnPredictor,
+    export_arrays,
+    load_pickles,
+)
+
+
+def held_out_texts():
+    """The held-out texts of scripts/train_model.py"""
+    df = pd.read_csv("data/synthetic_resumes.csv").dropna(subset=["text", "label"])
+    _, X_test, _, _ = train_test_split(df["text"], df["label"], test_size=0.2, random_state=42, stratify=df["label"])
+    return list(X_test)
+
+
+def copy_models(tmp):
+    model, vectorizer = os.path.join(tmp, "clf.pkl"), os.path.join(tmp, "tfidf.pkl")
+    shutil.copy(MODEL_PATH, model)
+    shutil.copy(VECTORIZER_PATH, vectorizer)
+    return model, vectorizer, os.path.join(tmp, "arrays")
+
+
+def test_numpy_predictor_matches_sklearn():
+    """Test the NumPy predictor reproduces the pipeline bit for bit on the test split"""
+    texts = held_out_texts() + ["", "the and of", "Python python PYTHON developer"]
+    clf, tfidf = load_pickles()
+    with tempfile.TemporaryDirectory() as tmp:
+        export_arrays(clf, tfidf, tmp)
+        predictor = NBPredictor(tmp)
+        assert isinstance(predictor.feature_log_prob_t, np.memmap)
+        X = tfidf.transform(texts)
+        assert [predictor.analyze(t) for t in texts] == [tfidf.build_analyzer()(t) for t in texts]
+        assert np.array_equal(predictor.joint_log_likelihood(texts), clf._joint_log_likelihood(X))
+        assert (predictor.predict(texts) == clf.predict(X)).all()
+        del predictor  # release the maps before the dir goes
+    print(f"✅ Test passed: NumPy predictor ({len(texts)} texts)")
+
+
+def test_ngram_analyzer():
+    """Test n-gram ranges and other vectorizer options the predictor mirrors"""
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.naive_bayes import MultinomialNB
+
+    texts = held_out_texts()[:120]
+    labels = [i % 3 for i in range(len(texts))]
+    for options in ({"ngram_range": (1, 3), "sublinear_tf": True}, {"ngram_range": (2, 2), "norm": "l1"},
+                    {"binary": True, "stop_words": ["python", "and"], "use_idf": False}):
+        tfidf = TfidfVectorizer(**options)
+        clf = MultinomialNB().fit(tfidf.fit_transform(texts), labels)
+        with tempfile.TemporaryDirectory() as tmp:
+            export_arrays(clf, tfidf, tmp)
+            predictor = NBPredictor(tmp, mmap=False)
+            assert np.array_equal(predictor.joint_log_likelihood(texts),
+                                  clf._joint_log_likelihood(tfidf.transform(texts))), options
+    print("✅ Test passed: vectorizer options")
+
+
+def test_serving_does_not_import_sklearn():
+    """Test single and batch scoring in a fresh process load no scikit-learn, scipy or pandas"""
+    code = ("import sys; from utils.analyze_resume import get_resume_feedback_many, predict_role_from_resume; "
+            "print(predict_role_from_resume('Python Django REST APIs PostgreSQL')); "
+            "get_resume_feedback_many(['Python SQL pandas', 'Kubernetes Terraform'], 'Data Scientist'); "
+            "get_resume_feedback_many(['Python SQL pandas'], 'Data Scientist', 'Experience with Kubernetes required'); "
+            "print(sorted(m for m in ('sklearn', 'scipy', 'pandas') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout.split("\n")
+    assert out[0] != "Unknown" and out[1] == "[]", out
+    print(f"✅ Test passed: no scikit-learn at serving time ({out[0]})")
+
+
+def test_stale_export_is_refreshed():
+    """Test the export is used while it matches the pickles' digests, and refreshed when they change"""
+    with tempfile.TemporaryDirectory() as tmp:
+        model, vectorizer, arrays = copy_models(tmp)
+        first = ModelArtifacts(model, vectorizer, arrays)
+        assert isinstance(first.get(), NBPredictor)
+        assert first.source == "pickle" and os.path.exists(os.path.join(arrays, MANIFEST))
+
+        second = ModelArtifacts(model, vectorizer, arrays)
+        second.get()
+        assert second.source == "arrays"
+
+        later = os.stat(os.path.join(arrays, MANIFEST)).st_mtime + 10
+        os.utime(model, (later, later))  # touched by a checkout / copy
+        touched = ModelArtifacts(model, vectorizer, arrays)
+        touched.get()
+        assert touched.source == "arrays", "A newer mtime alone should not invalidate the export"
+
+        clf, _ = load_pickles(model, vectorizer)
+        with open(model, "wb") as f:
+            pickle.dump(clf, f, protocol=2)  # retrained: different bytes
+        third = ModelArtifacts(model, vectorizer, arrays)
+        third.get()
+        assert third.source == "pickle"
+
+        with patch.object(model_artifacts, "export_arrays", side_effect=OSError("read-only")):
+            with open(model, "wb") as f:
+                pickle.dump(clf, f, protocol=3)
+            fallback = ModelArtifacts(model, vectorizer, arrays)
+            assert isinstance(fallback.get(), SklearnPredictor)
+            assert fallback.get().predict(["Python developer"])[0]
+    print("✅ Test passed: stale export")
+
+
+def test_failed_load_backs_off():
+    """Test a missing model is not retried on every prediction"""
+    with tempfile.TemporaryDirectory() as tmp:
+        missing = os.path.join(tmp, "nope")
+        artifacts = ModelArtifacts(missing + ".pkl", missing + "_vec.pkl", missing, failure_backoff=60)
+        for _ in range(5):
+            assert artifacts.get() is None
+        assert artifacts.attempts == 1 and "FileNotFoundError" in artifacts.error
+
+        artifacts.model_path, artifacts.vectorizer_path, artifacts.arrays_dir = copy_models(tmp)
+        assert artifacts.get() is None, "Still within the backoff"
+        artifacts.reset()
+        assert artifacts.get() is not None and artifacts.attempts == 2 and artifacts.error is None
+    print("✅ Test passed: failure backoff")
+
+
+def test_prewarm_and_package_paths():
+    """Test prewarm loads in the background and paths do not depend on the cwd"""
+    assert os.path.isabs(MODEL_PATH) and os.path.isabs(ARRAYS_DIR)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            artifacts = ModelArtifacts()
+            thread = artifacts.prewarm()
+            assert artifacts.prewarm() is thread, "Prewarm should start one thread"
+            thread.join(30)
+            loaded = artifacts._predictor
+            assert loaded is not None and artifacts.get() == loaded and artifacts.attempts == 1
+        finally:
+            os.chdir(cwd)
+    print(f"✅ Test passed: prewarm ({artifacts.source}, {artifacts.load_seconds:.3f}s)")
+
+
+if __name__ == "__main__":
+    test_numpy_predictor_matches_sklearn()
+    test_ngram_analyzer()
+    test_serving_does_not_import_sklearn()
+    test_stale_export_is_refreshed()
+    test_failed_load_backs_off()
+    test_prewarm_and_package_paths()
@@ -0,0 +1,181 @@
+"""
+Test suite for the model registry.
+Builds a models/ dir with two training runs in a temp dir.
+"""
+
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+from unittest.mock import patch
+
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.naive_bayes import MultinomialNB
+
+from utils.model_artifacts import MODEL_PATH, VECTORIZER_PATH
+from utils.model_registry import BASE, ModelRegistry
+
+TEXT = "Python Django REST APIs PostgreSQL backend services"
+
+
+def write_run(models_dir, run_id, clf, tfidf, accuracy):
+    for name, obj in (("resume_classifier", clf), ("tfidf_vectorizer", tfidf)):
+        with open(os.path.join(models_dir, f"{name}_{run_id}.pkl"), "wb") as f:
+            pickle.dump(obj, f)
+    meta = {"run_id": run_id, "accuracy": accuracy, "samples": 100, "artifacts": {
+        "model": f"models/resume_classifier_{run_id}.pkl",
+        "vectorizer": f"models/tfidf_vectorizer_{run_id}.pkl",
+        "arrays": f"models/resume_classifier_{run_id}",
+    }}
+    with open(os.path.join(models_dir, f"run_{run_id}.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+
+def make_models_dir(tmp):
+    """Base pickles plus run "a" (same model) and run "b" (labels prefixed with 'b:')"""
+    models_dir = os.path.join(tmp, "models")
+    os.makedirs(models_dir)
+    shutil.copy(MODEL_PATH, os.path.join(models_dir, "resume_classifier.pkl"))
+    shutil.copy(VECTORIZER_PATH, os.path.join(models_dir, "tfidf_vectorizer.pkl"))
+    with open(MODEL_PATH, "rb") as f:
+        base_clf = pickle.load(f)
+    with open(VECTORIZER_PATH, "rb") as f:
+        base_tfidf = pickle.load(f)
+    write_run(models_dir, "a", base_clf, base_tfidf, 0.98)
+
+    df = pd.read_csv("data/synthetic_resumes.csv").dropna().head(400)
+    tfidf = TfidfVectorizer(stop_words="english")
+    clf = MultinomialNB().fit(tfidf.fit_transform(df["text"]), "b:" + df["label"])
+    write_run(models_dir, "b", clf, tfidf, 0.95)
+    return models_dir
+
+
+def test_lists_runs_and_promotes():
+    """Test runs come from the manifests and promotion moves the pointer"""
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = ModelRegistry(make_models_dir(tmp), check_interval=0)
+        assert [r["run_id"] for r in registry.runs()] == ["a", "b"]
+        assert registry.active_run_id() is None and not any(r["active"] for r in registry.runs())
+        registry.promote("b")
+        assert [r["active"] for r in registry.runs()] == [False, True]
+        try:
+            registry.promote("nope")
+            assert False, "Expected KeyError"
+        except KeyError:
+            pass
+        assert registry.active_run_id() == "b"
+        registry.promote(None)
+        assert registry.active_run_id() is None
+    print("✅ Test passed: runs and promotion")
+
+
+def test_hot_swap():
+    """Test a promotion is served by the next prediction without a restart"""
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = ModelRegistry(make_models_dir(tmp), check_interval=0)
+        base = registry.predictor()
+        assert base.run_id == BASE and not base.predict([TEXT])[0].startswith("b:")
+
+        registry.promote("b")
+        swapped = registry.predictor()
+        assert swapped.run_id == "b" and swapped.predict([TEXT])[0].startswith("b:")
+        assert base.predict([TEXT])[0] and registry.swaps == 2, "In-flight holders keep a working model"
+
+        registry.promote("a")
+        assert registry.predictor().run_id == "a"
+        assert list(registry._loaders) == ["a"], "Replaced models are released"
+    print("✅ Test passed: hot swap")
+
+
+def test_bad_promotion_keeps_serving():
+    """Test a pointer to a run that cannot load leaves the current model in service"""
+    with tempfile.TemporaryDirectory() as tmp:
+        models_dir = make_models_dir(tmp)
+        registry = ModelRegistry(models_dir, check_interval=0)
+        registry.promote("a")
+        assert registry.predictor().run_id == "a"
+
+        os.remove(os.path.join(models_dir, "resume_classifier_b.pkl"))
+        registry.promote("b")
+        assert registry.predictor().run_id == "a" and "Could not load model b" in registry.error
+
+        with open(registry.pointer_path, "w", encoding="utf-8") as f:
+            f.write('{"run_id": "gone"}')
+        assert registry.predictor().run_id == "a" and "Bad model pointer" in registry.error
+    print("✅ Test passed: failed promotion")
+
+
+def test_swap_under_load():
+    """Test predictions running while the model is swapped never fail"""
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = ModelRegistry(make_models_dir(tmp), check_interval=0)
+        registry.predictor()
+        seen, errors, stop = set(), [], threading.Event()
+
+        def serve():
+            while not stop.is_set():
+                try:
+                    seen.add(registry.predictor().run_id)
+                except Exception as e:  # pragma: no cover - reported below
+                    errors.append(e)
+
+        threads = [threading.Thread(target=serve) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for run_id in ("a", "b", "a", "b"):
+            registry.promote(run_id)
+            while registry.predictor().run_id != run_id:
+                pass
+        stop.set()
+        for t in threads:
+            t.join()
+    assert not errors and seen == {BASE, "a", "b"}
+    print("✅ Test passed: swap under load")
+
+
+def test_latency_is_recorded_per_model():
+    """Test served and benchmarked predictions are timed per run and saved for other processes"""
+    with tempfile.TemporaryDirectory() as tmp:
+        models_dir = make_models_dir(tmp)
+        registry = ModelRegistry(models_dir, check_interval=0)
+        registry.promote("a")
+        registry.predictor().predict([TEXT, TEXT])
+        registry.benchmark("b", [TEXT] * 5, repeat=2)
+        runs = {r["run_id"]: r for r in registry.runs()}
+        # a fresh process (e.g. the CLI) reads the saved summaries
+        saved = {r["run_id"]: r for r in ModelRegistry(models_dir).runs()}
+        assert not [f for f in os.listdir(models_dir) if ".tmp" in f]
+    assert runs["a"]["latency"]["serving"]["calls"] == 1 and runs["a"]["latency"]["serving"]["docs"] == 2
+    assert "benchmark" not in runs["a"]["latency"]
+    bench = runs["b"]["latency"]["benchmark"]
+    assert bench["calls"] == 10 and bench["p95_ms_per_doc"] > 0 and "serving" not in runs["b"]["latency"]
+    assert saved["a"]["latency"]["serving"]["docs"] == 2
+    assert saved["b"]["latency"]["benchmark"]["mean_ms_per_doc"] == bench["mean_ms_per_doc"]
+    assert saved["b"]["latency"]["benchmark"]["updated_at"]
+    print(f"✅ Test passed: latency ({bench['mean_ms_per_doc']} ms/doc)")
+
+
+def test_serving_latency_saves_are_throttled():
+    """Test served predictions rewrite the latency file at most every LATENCY_SAVE_INTERVAL"""
+    with tempfile.TemporaryDirectory() as tmp:
+        models_dir = make_models_dir(tmp)
+        registry = ModelRegistry(models_dir, check_interval=0)
+        with patch.object(registry, "save_latency", wraps=registry.save_latency) as save_mock:
+            for _ in range(5):
+                registry.predictor().predict([TEXT])
+        assert save_mock.call_count == 1
+        with open(os.path.join(models_dir, f"latency_{BASE}.json"), encoding="utf-8") as f:
+            assert json.load(f)["serving"]["calls"] == 1
+    print("✅ Test passed: throttled latency saves")
+
+
+if __name__ == "__main__":
+    test_lists_runs_and_promotes()
+    test_hot_swap()
+    test_bad_promotion_keeps_serving()
+    test_swap_under_load()
+    test_latency_is_recorded_per_model()
+    test_serving_latency_saves_are_throttled()
@@ -0,0 +1,146 @@
+"""
+Test suite for the content-addressed parse cache.
+Tests LRU byte budget, disk tier persistence, counters and parse_resume hits.
+"""
+
+import io
+import os
+import tempfile
+from unittest.mock import patch
+
+from utils.parse_cache import ParseCache, content_key, set_parse_cache, get_parse_cache
+from utils.resume_parser import parse_resume, PARSER_VERSION
+
+
+class NamedBytesIO(io.BytesIO):
+    """BytesIO with a name, like a Streamlit UploadedFile"""
+
+    def __init__(self, content, name):
+        super().__init__(content)
+        self.name = name
+
+
+def test_content_key():
+    """Test key depends on bytes, version and options"""
+    base = content_key(b"resume", "1", "bin")
+    assert base == content_key(b"resume", "1", "bin"), "Key should be deterministic"
+    assert base != content_key(b"resume!", "1", "bin"), "Key should change with bytes"
+    assert base != content_key(b"resume", "2", "bin"), "Key should change with version"
+    assert base != content_key(b"resume", "1", "txt"), "Key should change with options"
+    print("✅ Test passed: content_key")
+
+
+def test_memory_lru_budget():
+    """Test memory tier evicts least recently used entries over the byte budget"""
+    cache = ParseCache(max_bytes=600)
+    cache.put("a", "x" * 200)
+    cache.put("b", "y" * 200)
+    assert cache.get("a") is not None  # "a" becomes most recent
+    cache.put("c", "z" * 200)
+
+    assert "a" in cache, "Recently used entry should survive"
+    assert "b" not in cache, "Least recently used entry should be evicted"
+    assert cache.stats()["memory_bytes"] <= 600, "Memory budget exceeded"
+    assert cache.stats()["evictions"] == 1
+
+    cache.put("huge", "h" * 5000)
+    assert "huge" not in cache, "Entries larger than the budget should not be kept in memory"
+    print("✅ Test passed: LRU byte budget")
+
+
+def test_disk_tier_survives_restart():
+    """Test disk tier serves entries to a fresh cache instance"""
+    with tempfile.TemporaryDirectory() as tmp:
+        first = ParseCache(max_bytes=1024 * 1024, disk_dir=tmp)
+        first.put("key", {"plain_text": "hello"})
+
+        second = ParseCache(max_bytes=1024 * 1024, disk_dir=tmp)
+        assert second.get("key") == {"plain_text": "hello"}
+        assert second.get("key") == {"plain_text": "hello"}
+        stats = second.stats()
+        assert stats["disk_hits"] == 1, "First lookup should come from disk"
+        assert stats["memory_hits"] == 1, "Second lookup should come from memory"
+    print("✅ Test passed: disk tier persistence")
+
+
+def disk_files(root):
+    return sorted(name for _, _, names in os.walk(root) for name in names)
+
+
+def test_disk_tier_budget():
+    """Test the disk tier prunes least recently used pickles over its byte budget"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ParseCache(max_bytes=0, disk_dir=tmp, disk_max_bytes=3500)
+        for key in ("aa1", "bb2", "cc3"):
+            cache.put(key, "x" * 1000)
+            os.utime(cache._disk_path(key), ns=(0, len(disk_files(tmp)) * 10**9))
+        assert cache.get("aa1") is not None  # a disk hit marks it recently used
+        real_walk, locked = os.walk, []
+
+        def walk(top):
+            locked.append(cache._lock.locked())
+            return real_walk(top)
+
+        with patch("utils.parse_cache.os.walk", side_effect=walk):
+            cache.put("dd4", "y" * 1000)
+
+        assert locked == [False], "The disk tier should be rescanned without holding the lock"
+        assert disk_files(tmp) == ["aa1.pkl", "cc3.pkl", "dd4.pkl"], "Least recently used pickle should go"
+        assert cache.stats()["disk_evictions"] == 1
+        assert sum(os.path.getsize(cache._disk_path(k)) for k in ("aa1", "cc3", "dd4")) <= 3500 * 0.9
+    print("✅ Test passed: disk tier budget")
+
+
+def test_failed_disk_write_leaves_no_temp_file():
+    """Test a write that fails halfway removes its temp file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ParseCache(disk_dir=tmp)
+        with patch("utils.parse_cache.os.replace", side_effect=OSError("disk full")):
+            cache.put("key", {"plain_text": "hello"})
+        assert disk_files(tmp) == [], "No temp or partial files should be left behind"
+        assert cache.get("key") == {"plain_text": "hello"}, "Memory tier still serves the entry"
+    print("✅ Test passed: failed disk write cleanup")
+
+
+def test_counters():
+    """Test hit/miss counters"""
+    cache = ParseCache()
+    assert cache.get("missing") is None
+    cache.put("k", [1, 2, 3])
+    cache.get("k")
+    stats = cache.stats()
+    assert stats["misses"] == 1 and stats["hits"] == 1
+    assert stats["hit_rate"] == 0.5
+    print("✅ Test passed: hit/miss counters")
+
+
+def test_parse_resume_uses_cache():
+    """Test parse_resume serves repeated parses from the cache"""
+    cache = ParseCache()
+    set_parse_cache(cache)
+    try:
+        content = b"John Doe\n\nSKILLS\nPython, SQL, Docker\n"
+        first = parse_resume(NamedBytesIO(content, "resume.txt"))
+        second = parse_resume(NamedBytesIO(content, "resume.txt"))
+
+        assert first == second, "Cached result should equal the fresh parse"
+        assert first is not second, "Each caller should get its own copy"
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+        assert content_key(content, PARSER_VERSION, "txt", "legacy", "max_pages=None") in cache
+
+        parse_resume(NamedBytesIO(content, "resume.txt"), use_cache=False)
+        assert cache.stats()["hits"] == 1, "use_cache=False should bypass the cache"
+    finally:
+        set_parse_cache(None)
+    assert get_parse_cache() is not cache
+    print("✅ Test passed: parse_resume cache hits")
+
+
+if __name__ == "__main__":
+    test_content_key()
+    test_memory_lru_budget()
+    test_disk_tier_survives_restart()
+    test_disk_tier_budget()
+    test_failed_disk_write_leaves_no_temp_file()
+    test_counters()
+    test_parse_resume_uses_cache()
@@ -0,0 +1,97 @@
+"""
+Test suite for the typed parse results.
+Checks the dict view against the dicts parse_resume used to return.
+"""
+
+import glob
+import pickle
+
+from utils.parsed_resume import Block, ExperienceEntry, ParsedResume, Section
+from utils.resume_parser import _smart_structure_from_plain, parse_resume
+
+SAMPLE_TEXT = (
+    "Jane Doe\nBackend engineer\n"
+    "EXPERIENCE\nEngineer | Acme | 2020 - Present\nRemote\n- Built Python services\n"
+    "EDUCATION\nB.Tech, GL Bajaj Institute, 2019\n"
+    "SKILLS\nPython, SQL, Docker\n"
+)
+
+
+def ref_flat_text(structured):
+    """flat_text as parse_resume used to build it eagerly"""
+    flat_parts = []
+    for k, v in structured.items():
+        flat_parts.append(f"### {k}")
+        if isinstance(v, str):
+            flat_parts.append(v)
+        else:
+            for item in v:
+                if isinstance(item, dict):
+                    flat_parts.append(f"{item.get('role', '')} | {item.get('company', '')} | {item.get('duration', '')}".strip())
+                    for p in item.get('points', []):
+                        flat_parts.append(f"- {p}")
+                else:
+                    flat_parts.append(f"- {item}")
+        flat_parts.append("")
+    return "\n".join(flat_parts).strip()
+
+
+def sample_result():
+    structured = _smart_structure_from_plain(SAMPLE_TEXT)
+    return ParsedResume(SAMPLE_TEXT, tuple(Section(k, v) for k, v in structured.items()))
+
+
+def test_dict_view():
+    """Test results still read like the old dicts"""
+    result = sample_result()
+    assert result["plain_text"] == result.plain_text
+    assert result.get("skills") == ["Python", "SQL", "Docker"]
+    assert result.get("missing", "x") == "x"
+    assert "flat_text" in result and "sections" not in result
+    try:
+        result["sections"]
+        assert False, "Only the old keys are part of the dict view"
+    except KeyError:
+        pass
+
+    entry = result.section("EXPERIENCE")[0]
+    assert isinstance(entry, ExperienceEntry)
+    assert entry["company"] == "Acme" and entry.get("points") == ["Built Python services"]
+    assert result["structured"]["EXPERIENCE"] == [{
+        "role": "Engineer", "company": "Acme", "duration": "2020 - Present",
+        "points": ["Built Python services"], "meta": ["Remote"],
+    }]
+    # "meta" only appears when there is some, as before
+    assert "meta" not in ExperienceEntry("Engineer", "Acme")
+    assert ExperienceEntry("Engineer").to_dict() == {"role": "Engineer", "company": "", "duration": "", "points": []}
+    print("✅ Test passed: dict view")
+
+
+def test_flat_text_matches_eager_build():
+    """Test lazy flat_text equals the eagerly built one on the sample resumes"""
+    files = sorted(glob.glob("data/*.pdf") + glob.glob("generated/*.pdf") + glob.glob("test_files/*.txt"))
+    assert files, "Expected sample resumes in data/ and generated/"
+    for path in files:
+        with open(path, "rb") as f:
+            result = parse_resume(f, use_cache=False)
+        assert result["flat_text"] == ref_flat_text(result["structured"]), path
+        assert result["skills"] == (result["structured"].get("SKILLS") or [])
+    print(f"✅ Test passed: lazy flat_text ({len(files)} documents)")
+
+
+def test_compact_and_picklable():
+    """Test results have no per-object __dict__ and pickle smaller than the dicts"""
+    result = sample_result()
+    for obj in (result, result.sections[0], result.section("EXPERIENCE")[0], Block(1, (0, 0, 1, 1), "x")):
+        assert not hasattr(obj, "__dict__"), type(obj).__name__
+
+    blob = pickle.dumps(result)
+    assert pickle.loads(blob) == result
+    assert len(blob) < len(pickle.dumps(result.to_dict()))
+    print("✅ Test passed: compact results")
+
+
+if __name__ == "__main__":
+    test_dict_view()
+    test_flat_text_matches_eager_build()
+    test_compact_and_picklable()
@@ -0,0 +1,385 @@
+"""
+Test suite for the resume parser extraction pipeline.
+Builds small PDFs in memory with PyMuPDF so no fixtures are needed.
+"""
+
+import io
+import mmap
+import os
+import pathlib
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+
+import fitz  # PyMuPDF
+
+from utils import resume_parser
+from utils.parse_cache import ParseCache
+from utils.resume_parser import (
+    _extract_blocks_with_pymupdf,
+    _extract_pages_parallel,
+    _merge_blocks,
+    classify_pdf,
+    parse_resume,
+)
+
+
+def make_pdf(pages):
+    """Build a PDF whose pages hold the given lists of text lines"""
+    doc = fitz.open()
+    for lines in pages:
+        page = doc.new_page()
+        y = 60
+        for line in lines:
+            page.insert_text((50, y), line, fontsize=10)
+            y += 14
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def make_mixed_pdf():
+    """Page 1 has real text, page 2 is an image-only 'scan'"""
+    doc = fitz.open()
+    page = doc.new_page()
+    page.insert_text((50, 60), "JANE DOE - Backend Engineer with Python and SQL", fontsize=10)
+    scan = doc.new_page()
+    pix = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 50, 50), False)
+    pix.clear_with(200)
+    scan.insert_image(scan.rect, pixmap=pix)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+class NamedBytesIO(io.BytesIO):
+    """BytesIO with a name, like a Streamlit UploadedFile"""
+
+    def __init__(self, content, name="resume.pdf"):
+        super().__init__(content)
+        self.name = name
+
+
+SAMPLE_PAGES = [
+    ["JANE DOE", "Backend Engineer", "EXPERIENCE", "Engineer | Acme | 2020 - Present"],
+    ["- Built Python services", "- Migrated SQL databases to AWS"],
+    ["EDUCATION", "B.Tech, GL Bajaj Institute, 2019", "SKILLS", "Python, SQL, Docker"],
+]
+
+
+def test_parallel_extraction_matches_serial():
+    """Test page-parallel extraction merges to the same blocks as serial"""
+    data = make_pdf(SAMPLE_PAGES)
+    serial = _extract_blocks_with_pymupdf(data, parallel_threshold=0)
+    pages = _extract_pages_parallel(data, [1, 2, 3], max_workers=2)
+    parallel = _merge_blocks([b for p in pages for b in p["blocks"]])
+    assert serial == parallel, "Parallel extraction should match serial output"
+    assert {b["page"] for b in serial} == {1, 2, 3}
+    print("✅ Test passed: parallel extraction matches serial")
+
+
+def test_ocr_only_scanned_pages():
+    """Test only image-only pages are OCR'd and keep their page order"""
+    data = make_mixed_pdf()
+    with patch.object(resume_parser, "OCR_AVAILABLE", True), \
+            patch.object(resume_parser, "_render_page", wraps=resume_parser._render_page) as render_mock, \
+            patch.object(resume_parser, "_ocr_image", return_value="EDUCATION\nB.Tech 2019") as ocr_mock:
+        parsed = parse_resume(NamedBytesIO(data), use_cache=False)
+
+    assert ocr_mock.call_count == 1, "Only the scanned page should be OCR'd"
+    assert render_mock.call_args[0][1] == 2, "OCR should run on page 2"
+    text = parsed["plain_text"]
+    assert "JANE DOE" in text and "B.Tech 2019" in text
+    assert text.index("JANE DOE") < text.index("B.Tech 2019"), "Pages should stay in order"
+    print("✅ Test passed: page-level OCR fallback")
+
+
+def test_ocr_renders_grayscale_pixmap():
+    """Test the scanned page reaches tesseract as one grayscale image at an adaptive DPI"""
+    data = make_mixed_pdf()
+    with patch.object(resume_parser, "OCR_AVAILABLE", True), \
+            patch.object(resume_parser, "pytesseract", create=True) as tess_mock:
+        tess_mock.image_to_string.return_value = "SKILLS\nPython"
+        parsed = resume_parser._parse_bytes(data, False)
+
+    assert tess_mock.image_to_string.call_count == 1, "Only the scanned page should be OCR'd"
+    assert "SKILLS" in parsed["plain_text"] and "JANE DOE" in parsed["plain_text"]
+    img = tess_mock.image_to_string.call_args[0][0]
+    assert img.mode == "L", "OCR image should be grayscale"
+    # 50px scan stretched over an A4 page -> clamped to the minimum DPI
+    expected_width = round(595 / 72 * resume_parser.OCR_MIN_DPI)
+    assert abs(img.size[0] - expected_width) <= 1, f"Unexpected render width {img.size[0]}"
+    print("✅ Test passed: grayscale pixmap OCR input")
+
+
+def test_ocr_dpi_respects_pixel_budget():
+    """Test huge pages are rendered below the pixel budget"""
+    for width, height in ((72 * 40, 72 * 40), (595, 842), (612, 792)):  # poster, A4, Letter
+        doc = fitz.open()
+        dpi = resume_parser._ocr_dpi(doc.new_page(width=width, height=height))
+        doc.close()
+        assert (width / 72 * dpi) * (height / 72 * dpi) <= resume_parser.OCR_MAX_PIXELS
+        if width < 1000:
+            assert dpi == resume_parser.OCR_MAX_DPI, "Regular pages should render at full DPI"
+    print("✅ Test passed: adaptive OCR DPI")
+
+
+def test_classify_pdf():
+    """Test pre-flight classification of text-native and mixed PDFs"""
+    assert classify_pdf(make_pdf(SAMPLE_PAGES)) == {"kind": "text-native", "pages": ["text"] * 3}
+    assert classify_pdf(make_mixed_pdf()) == {"kind": "mixed", "pages": ["text", "scanned"]}
+    print("✅ Test passed: pre-flight PDF classification")
+
+
+def test_broken_encoding_detection():
+    """Test garbage-heavy text layers are classified as broken"""
+    assert resume_parser._bad_char_ratio("Python SQL") == 0.0
+    assert resume_parser._bad_char_ratio("\ufffd\ufffd\ue001 ab") == 0.6
+    probe = {"chars": 200, "bad_ratio": 0.6, "image_coverage": 0.0}
+    assert resume_parser._classify_page(probe) == resume_parser.PAGE_BROKEN
+    probe["bad_ratio"] = 0.01  # a few private-use bullets are fine
+    assert resume_parser._classify_page(probe) == resume_parser.PAGE_TEXT
+    print("✅ Test passed: broken encoding detection")
+
+
+def test_broken_pages_use_pdfplumber_only():
+    """Test broken pages are extracted by pdfplumber and nothing else"""
+    data = make_pdf(SAMPLE_PAGES)
+    real_plumber = resume_parser._extract_pages_pdfplumber
+    with patch.object(resume_parser, "_classify_page", return_value=resume_parser.PAGE_BROKEN), \
+            patch.object(resume_parser, "_extract_pages_pdfplumber", side_effect=real_plumber) as plumber_mock, \
+            patch.object(resume_parser, "_ocr_image") as ocr_mock:
+        parsed = parse_resume(NamedBytesIO(data), use_cache=False)
+
+    assert plumber_mock.call_args[0][1] == [1, 2, 3], "All broken pages should go to pdfplumber"
+    assert ocr_mock.call_count == 0, "Broken pages should not be OCR'd"
+    assert "Migrated SQL databases" in parsed["plain_text"]
+    print("✅ Test passed: broken pages routed to pdfplumber")
+
+
+def test_max_pages_truncates_and_caches():
+    """Test a page cap returns the first pages, flags them and is cacheable"""
+    data = make_pdf(SAMPLE_PAGES)
+    cache = ParseCache()
+    with patch.object(resume_parser, "get_parse_cache", return_value=cache), \
+            patch.object(resume_parser, "get_page_cache", return_value=ParseCache()):
+        parsed = parse_resume(NamedBytesIO(data), max_pages=2)
+        again = parse_resume(NamedBytesIO(data), max_pages=2)
+        full = parse_resume(NamedBytesIO(data))
+
+    assert parsed["truncated"] and not parsed["timed_out"]
+    assert "Migrated SQL databases" in parsed["plain_text"]
+    assert "GL Bajaj" not in parsed["plain_text"], "Page 3 should not be extracted"
+    assert again == parsed and cache.stats()["hits"] == 1, "Page-capped results should be cached"
+    assert not full["truncated"] and "GL Bajaj" in full["plain_text"]
+    print("✅ Test passed: page cap")
+
+
+def test_time_budget_stops_extraction():
+    """Test an exhausted time budget returns partial text and is not cached"""
+    data = make_pdf(SAMPLE_PAGES)
+    cache = ParseCache()
+    clock = iter(range(1000))  # every clock read advances one second
+    with patch.object(resume_parser, "get_parse_cache", return_value=cache), \
+            patch.object(resume_parser, "get_page_cache", return_value=ParseCache()), \
+            patch.object(resume_parser.time, "monotonic", side_effect=lambda: float(next(clock))):
+        # budget set at t=0; checks before pages 1 and 2 pass, page 3 is over time
+        parsed = parse_resume(NamedBytesIO(data), time_budget=2.5)
+
+    assert parsed["truncated"] and parsed["timed_out"]
+    assert "JANE DOE" in parsed["plain_text"] and "GL Bajaj" not in parsed["plain_text"]
+    assert len(cache) == 0, "Timed-out results must not be cached"
+    print("✅ Test passed: time budget")
+
+
+def test_ocr_timeout_follows_budget():
+    """Test tesseract gets the remaining budget as its timeout and running out of it keeps the text layer"""
+    data = make_mixed_pdf()
+    budget = resume_parser._ParseBudget(time_budget=10)
+
+    def run_out(img, lang, timeout):
+        budget.expires = time.monotonic()  # tesseract used up the rest of the budget
+        raise RuntimeError("Tesseract process timeout")
+
+    with patch.object(resume_parser, "OCR_AVAILABLE", True), \
+            patch.object(resume_parser, "pytesseract", create=True) as tess_mock:
+        tess_mock.image_to_string.side_effect = run_out
+        parsed = resume_parser._parse_bytes(data, False, budget=budget)
+
+    timeout = tess_mock.image_to_string.call_args.kwargs["timeout"]
+    assert 0 < timeout <= 10
+    assert parsed["timed_out"] and "JANE DOE" in parsed["plain_text"]
+    print("✅ Test passed: OCR timeout")
+
+
+def test_ocr_renders_in_calling_thread():
+    """Test pages are rasterised in the parsing thread; only tesseract runs in the pool"""
+    data = make_pdf([["placeholder"]] * 3)
+    caller = threading.get_ident()
+    render_threads, ocr_threads = [], []
+
+    def render(doc, pno):
+        render_threads.append(threading.get_ident())
+        return f"image {pno}"
+
+    def ocr(img, budget=None):
+        ocr_threads.append(threading.get_ident())
+        return f"text of {img}"
+
+    with patch.object(resume_parser, "OCR_AVAILABLE", True), \
+            patch.object(resume_parser, "OCR_MAX_WORKERS", 2), \
+            patch.object(resume_parser, "_render_page", side_effect=render), \
+            patch.object(resume_parser, "_ocr_image", side_effect=ocr):
+        results = resume_parser._ocr_pages(data, [1, 2, 3])
+
+    assert results == {pno: f"text of image {pno}" for pno in (1, 2, 3)}
+    assert render_threads == [caller] * 3
+    assert caller not in ocr_threads and len(ocr_threads) == 3
+    print("✅ Test passed: OCR rendering thread")
+
+
+def test_new_version_reuses_unchanged_pages():
+    """Test a re-upload with one edited page re-extracts only that page"""
+    v1 = make_pdf(SAMPLE_PAGES)
+    v2_pages = [SAMPLE_PAGES[0], ["- Built Go services", "- Migrated SQL databases to GCP"], SAMPLE_PAGES[2]]
+    v2 = make_pdf(v2_pages)
+    with patch.object(resume_parser, "get_parse_cache", return_value=ParseCache()), \
+            patch.object(resume_parser, "get_page_cache", return_value=ParseCache()):
+        first = parse_resume(NamedBytesIO(v1))
+        with patch.object(resume_parser, "_page_record", wraps=resume_parser._page_record) as record_mock:
+            second = parse_resume(NamedBytesIO(v2))
+        # an extra cover page shifts the old pages down by one
+        moved = parse_resume(NamedBytesIO(make_pdf([["COVER LETTER"]] + SAMPLE_PAGES)))
+
+    assert first["reused_pages"] == []
+    assert second["reused_pages"] == [1, 3]
+    assert [c.args[1] for c in record_mock.call_args_list] == [2], "Only the edited page should be extracted"
+    fresh = parse_resume(NamedBytesIO(v2), use_cache=False)
+    assert second["plain_text"] == fresh["plain_text"] and second["structured"] == fresh["structured"]
+    assert moved["reused_pages"] == [2, 3, 4]
+    assert moved["plain_text"].index("COVER LETTER") < moved["plain_text"].index("JANE DOE")
+    print("✅ Test passed: incremental re-parse")
+
+
+def test_reused_scanned_page_skips_ocr():
+    """Test an unchanged scanned page keeps its OCR text without re-running OCR"""
+    v1 = make_mixed_pdf()
+    doc = fitz.open(stream=v1, filetype="pdf")
+    doc[0].insert_text((50, 120), "Now also with Kubernetes", fontsize=10)
+    v2 = doc.tobytes()
+    doc.close()
+    with patch.object(resume_parser, "get_parse_cache", return_value=ParseCache()), \
+            patch.object(resume_parser, "get_page_cache", return_value=ParseCache()), \
+            patch.object(resume_parser, "OCR_AVAILABLE", True), \
+            patch.object(resume_parser, "_ocr_image", return_value="EDUCATION\nB.Tech 2019") as ocr_mock:
+        parse_resume(NamedBytesIO(v1))
+        second = parse_resume(NamedBytesIO(v2))
+
+    assert ocr_mock.call_count == 1, "The scanned page should be OCR'd once"
+    assert second["reused_pages"] == [2]
+    assert "Kubernetes" in second["plain_text"] and "B.Tech 2019" in second["plain_text"]
+    print("✅ Test passed: reused OCR page")
+
+
+def test_inputs_parse_uniformly():
+    """Test bytes, memoryview, paths and file objects give the same result"""
+    data = make_pdf(SAMPLE_PAGES)
+    expected = parse_resume(NamedBytesIO(data), use_cache=False)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "resume.pdf")
+        with open(path, "wb") as f:
+            f.write(data)
+        with patch.object(resume_parser, "_open_pdf", wraps=resume_parser._open_pdf) as open_mock:
+            from_path = parse_resume(path, use_cache=False)
+            with open(path, "rb") as f:
+                from_file = parse_resume(f, use_cache=False)
+        # paths are opened by name and open files through a mapping, neither copied into bytes
+        sources = [c.args[0] for c in open_mock.call_args_list]
+        assert sources[0] == path and isinstance(sources[1], mmap.mmap)
+        from_pathlib = parse_resume(pathlib.Path(path), use_cache=False)
+
+        txt_path = os.path.join(tmp, "resume.txt")
+        with open(txt_path, "wb") as f:
+            f.write(b"Jane Doe\n\nPython, SQL")
+        assert parse_resume(txt_path, use_cache=False)["plain_text"] == "Jane Doe\n\nPython, SQL"
+        empty_path = os.path.join(tmp, "empty.pdf")
+        open(empty_path, "wb").close()
+        assert parse_resume(empty_path, use_cache=False)["plain_text"] == ""
+
+    for result in (from_path, from_file, from_pathlib, parse_resume(data, use_cache=False),
+                   parse_resume(memoryview(data), use_cache=False),
+                   parse_resume(bytearray(data), use_cache=False)):
+        assert result == expected
+
+    # the upload's buffer is released again: it can still be written to
+    upload = NamedBytesIO(data)
+    parse_resume(upload, use_cache=False)
+    upload.write(b"more")
+    print("✅ Test passed: uniform inputs")
+
+
+def test_file_objects_are_read_through_their_descriptor():
+    """Test unlinked files and files opened by a relative path before a chdir still parse"""
+    data = make_pdf(SAMPLE_PAGES)
+    expected = parse_resume(data, use_cache=False)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "resume.pdf")
+        with open(path, "wb") as f:
+            f.write(data)
+
+        with open(path, "rb") as f:
+            os.remove(path)  # upload handlers often unlink temp files right away
+            assert parse_resume(f, use_cache=False) == expected
+
+        with open(path, "wb") as f:
+            f.write(data)
+        os.chdir(tmp)
+        try:
+            f = open("resume.pdf", "rb")
+        finally:
+            os.chdir(cwd)
+        with f:
+            f.seek(100)  # files are read whole, like seek(0) + read()
+            assert parse_resume(f, use_cache=False) == expected
+
+        with tempfile.TemporaryFile(dir=tmp) as f:  # no usable name at all
+            f.write(data)
+            assert parse_resume(f, use_cache=False) == expected
+    print("✅ Test passed: file objects read by descriptor")
+
+
+def test_path_input_uses_cache_key_of_bytes():
+    """Test a path and its bytes share one cache entry"""
+    data = make_pdf(SAMPLE_PAGES)
+    with tempfile.TemporaryDirectory() as tmp, \
+            patch.object(resume_parser, "get_parse_cache", return_value=ParseCache()), \
+            patch.object(resume_parser, "get_page_cache", return_value=ParseCache()):
+        path = os.path.join(tmp, "resume.pdf")
+        with open(path, "wb") as f:
+            f.write(data)
+        parse_resume(path)
+        with patch.object(resume_parser, "_parse_bytes") as parse_mock:
+            parse_resume(NamedBytesIO(data))
+        assert not parse_mock.called, "Second parse should be served from the cache"
+    print("✅ Test passed: path cache key")
+
+
+if __name__ == "__main__":
+    test_parallel_extraction_matches_serial()
+    test_ocr_only_scanned_pages()
+    test_ocr_renders_grayscale_pixmap()
+    test_ocr_dpi_respects_pixel_budget()
+    test_classify_pdf()
+    test_broken_encoding_detection()
+    test_broken_pages_use_pdfplumber_only()
+    test_max_pages_truncates_and_caches()
+    test_time_budget_stops_extraction()
+    test_ocr_timeout_follows_budget()
+    test_ocr_renders_in_calling_thread()
+    test_new_version_reuses_unchanged_pages()
+    test_reused_scanned_page_skips_ocr()
+    test_inputs_parse_uniformly()
+    test_file_objects_are_read_through_their_descriptor()
+    test_path_input_uses_cache_key_of_bytes()
@@ -0,0 +1,124 @@
+"""
+Test suite for the role catalog.
+Checks hot reload on a temp copy and that feedback scores are unchanged.
+"""
+
+import builtins
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+from utils.analyze_resume import get_resume_feedback
+from utils.role_catalog import CATALOG_PATH, RoleCatalog, get_role_catalog
+
+RESUME = (
+    "Jane Doe\nProjects\nExperience\nSkills: Python, SQL, machine learning, Docker, AWS, "
+    "Git, REST APIs. github.com/jane\nEducation\nInternship at Acme\n"
+)
+
+
+def ref_keyword_score(text, selected_role, job_description=""):
+    """Keyword matching as get_resume_feedback did it before the catalog"""
+    with open(CATALOG_PATH, "r") as f:
+        job_roles = json.load(f)
+    role_keywords = []
+    for cat in job_roles.values():
+        if selected_role in cat:
+            role_keywords = cat[selected_role].get("required_skills", [])
+            break
+    if job_description:
+        jd_words = [w.strip(".,()") for w in job_description.lower().split() if len(w) > 5]
+        role_keywords = list(set(role_keywords + jd_words[:5]))
+    missing = [k for k in role_keywords if k.lower() not in text.lower()]
+    total = len(role_keywords)
+    return int((total - len(missing)) / total * 100) if total else 100, set(missing)
+
+
+def write_roles(path, skills):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"Engineering": {"Backend Developer": {"required_skills": skills}}}, f)
+
+
+def test_catalog_index():
+    """Test every role in the file is indexed with lowercased keywords"""
+    catalog = get_role_catalog()
+    with open(CATALOG_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    assert catalog.data == data and catalog.categories() == list(data)
+    for category, roles in data.items():
+        assert catalog.roles(category) == list(roles)
+        for name, info in roles.items():
+            role = catalog.role(name)
+            assert role.category == category and role.keywords == tuple(info["required_skills"])
+            assert role.keywords_lower == tuple(k.lower() for k in info["required_skills"])
+    assert catalog.role("Astronaut") is None
+    print("✅ Test passed: catalog index")
+
+
+def test_hot_reload():
+    """Test the file is re-read only when its mtime changes, and bad edits are ignored"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "roles.json")
+        write_roles(path, ["Python", "SQL"])
+        catalog = RoleCatalog(path, check_interval=0)
+        assert catalog.role("Backend Developer").missing("python only") == ["SQL"]
+        catalog.role("Backend Developer")
+        assert catalog.loads == 1, "An unchanged file should not be parsed again"
+
+        write_roles(path, ["Python", "Go"])
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+        assert catalog.role("Backend Developer").keywords == ("Python", "Go")
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("{ not json")
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 2 * 10**9))
+        assert catalog.role("Backend Developer").keywords == ("Python", "Go"), "Last good catalog stays in service"
+        assert catalog.error and catalog.loads == 2
+    print("✅ Test passed: hot reload")
+
+
+def test_feedback_scores_unchanged_without_file_reads():
+    """Test scores match the per-call JSON load and no file is opened while scoring"""
+    catalog = get_role_catalog()
+    jd = "Seeking engineers with Kubernetes, microservices, PostgreSQL and Terraform experience."
+    expected = {(role, j): ref_keyword_score(RESUME, role, j) for role in catalog.roles() + ["Unknown"]
+                for j in ("", jd)}
+
+    def no_open(*args, **kwargs):
+        raise AssertionError("scoring should not touch the disk")
+
+    with patch.object(builtins, "open", no_open):
+        for (role, j), (score, missing) in expected.items():
+            suggestions, _, keyword_match, _ = get_resume_feedback(RESUME, role, j, predicted_role=role)
+            assert keyword_match == score, (role, j)
+            listed = [s for s in suggestions if s.startswith("Missing key skills")]
+            if missing:
+                shown = set(listed[0].split(": ", 1)[1].rstrip(".").split(", "))
+                assert shown <= missing and len(shown) == min(7, len(missing)), (role, j)
+            else:
+                assert not listed, (role, j)
+    print(f"✅ Test passed: unchanged scores ({len(expected)} role/JD pairs)")
+
+
+def test_rank_roles():
+    """Test ranking scores every role as get_resume_feedback does, best fit first"""
+    catalog = get_role_catalog()
+    ranked = catalog.rank_roles(RESUME)
+    assert [m.role for m in ranked][:2] == [m.role for m in catalog.rank_roles(RESUME, top_n=2)]
+    assert sorted(m.role for m in ranked) == sorted(catalog.roles())
+    for match in ranked:
+        score, missing = ref_keyword_score(RESUME, match.role)
+        assert match.keyword_match == score and set(match.missing) == missing, match.role
+        assert len(match.matched) + len(match.missing) == len(catalog.role(match.role).keywords)
+    scores = [(m.keyword_match, len(m.matched)) for m in ranked]
+    assert scores == sorted(scores, reverse=True)
+    assert ranked[0].keyword_match > ranked[-1].keyword_match
+    print(f"✅ Test passed: role ranking (best fit: {ranked[0].role})")
+
+
+if __name__ == "__main__":
+    test_catalog_index()
+    test_hot_reload()
+    test_feedback_scores_unchanged_without_file_reads()
+    test_rank_roles()
@@ -0,0 +1,85 @@
+"""
+Test suite for the section heading detector.
+Checks the compiled engine against the original per-line heading chain.
+"""
+
+import random
+import re
+from collections import defaultdict
+
+from utils.resume_parser import _smart_structure_from_plain
+from utils.section_detector import DEFAULT_HEADINGS, SectionDetector
+
+
+# --- Reference implementation: the heading loop the detector replaces ---
+def ref_split(lines, extra_headings=()):
+    sections = defaultdict(list)
+    current = "GENERAL"
+    heading_regex = re.compile(r'^[A-Z][A-Z\s]{2,}$')
+    known_headings = set(DEFAULT_HEADINGS)
+    for ln in lines:
+        if re.match(r'^(Skills|Skills:|SKILLS)\b', ln, re.I):
+            current = "SKILLS"
+            continue
+        clean_ln = re.sub(r'[^\w\s]', '', ln).strip()
+        if heading_regex.match(clean_ln) or clean_ln.upper() in known_headings or \
+                (ln in extra_headings and clean_ln):
+            current = clean_ln.upper()
+            sections[current]
+            continue
+        sections[current].append(ln)
+    return sections
+
+
+PIECES = ["Skills", "SKILLS", "skills", "Skillset", "Education", "EDUCATION", "work", "Experience",
+          "Projects", "ABOUT", "Jane", "Doe", "2020", "Python", "B.Tech", "Acme", "ß", "ſkills",
+          ":", "-", "|", "•", "&", "_", "  ", " ", " ", " ", "\t"]
+
+
+def random_line(rng):
+    line = "".join(rng.choice(PIECES) for _ in range(rng.randint(1, 6))).strip()
+    return line or "x"
+
+
+def test_split_matches_reference():
+    """Test random heading-like lines are split exactly like the old loop"""
+    rng = random.Random(9)
+    detector = SectionDetector()
+    for _ in range(5000):
+        lines = [random_line(rng) for _ in range(rng.randint(1, 12))]
+        hints = set(rng.sample(lines, k=min(2, len(lines))))
+        assert detector.split(lines, hints) == ref_split(lines, hints), lines
+    print("✅ Test passed: section split equivalence")
+
+
+def test_register_heading_synonym():
+    """Test pluggable vocabulary routes synonyms into existing sections"""
+    detector = SectionDetector()
+    assert detector.classify("Work History") is None
+    detector.register("Work History", section="EXPERIENCE")
+    assert detector.classify("Work History:") == "EXPERIENCE"
+    assert detector.classify("WORK HISTORY") == "EXPERIENCE"
+
+    plain = "Jane Doe\nWork History\nEngineer | Acme | 2020 - Present\n- Built Python services"
+    structured = _smart_structure_from_plain(plain, detector=detector)
+    assert structured["EXPERIENCE"][0]["company"] == "Acme"
+    assert structured["EXPERIENCE"][0]["points"] == ["Built Python services"]
+    # the shared detector is untouched
+    assert "EXPERIENCE" not in _smart_structure_from_plain(plain)
+    print("✅ Test passed: heading synonyms")
+
+
+def test_register_rejects_empty_heading():
+    """Test headings without word characters are refused"""
+    try:
+        SectionDetector().register("---")
+    except ValueError:
+        print("✅ Test passed: empty heading rejected")
+        return
+    raise AssertionError("Expected ValueError for a punctuation-only heading")
+
+
+if __name__ == "__main__":
+    test_split_matches_reference()
+    test_register_heading_synonym()
+    test_register_rejects_empty_heading()
@@ -0,0 +1,90 @@
+"""
+Test suite for the text normalization engine.
+Checks byte-identical output against the original multi-pass cleanup chain.
+"""
+
+import random
+import re
+
+from utils.sample_corpus import corpus_texts
+from utils.text_normalizer import (
+    UNICODE_FIX_MAP,
+    collapse_whitespace,
+    normalize_text,
+    normalize_unicode_characters,
+)
+
+
+# --- Reference implementation: the cleanup chain the engine replaces ---
+def ref_normalize_unicode(text):
+    for bad, good in UNICODE_FIX_MAP.items():
+        text = text.replace(bad, good)
+    return text
+
+
+def ref_normalize_whitespace(s):
+    s = s.replace('\r', '\n')
+    s = re.sub(r'\n{3,}', '\n\n', s)
+    s = re.sub(r'[ \t]+', ' ', s)
+    return s.strip()
+
+
+def ref_fix_hyphenation(text):
+    text = re.sub(r'-\n\s*', '', text)
+    text = re.sub(r'(?<!\n)\n(?!\n)', ' ', text)
+    return re.sub(r' +', ' ', text)
+
+
+def ref_final(text):
+    """parse_resume's final cleaning"""
+    return ref_fix_hyphenation(ref_normalize_unicode(ref_normalize_whitespace(text)))
+
+
+def ref_blocks(text):
+    """_blocks_to_plain's cleaning"""
+    return ref_fix_hyphenation(ref_normalize_whitespace(text))
+
+
+ALPHABET = ["a", "b", "-", "-", "\n", "\n", "\n", " ", " ", "\t", "\r", "\xa0", " ",
+            "\x0b", "\x00", "", "", "ﬁ", "Ɵ", "•", "1", "."]
+
+
+def random_text(rng, length):
+    return "".join(rng.choice(ALPHABET) for _ in range(length))
+
+
+def test_unicode_map_matches_reference():
+    """Test translate-based unicode fix equals the replace chain"""
+    rng = random.Random(7)
+    for _ in range(500):
+        text = random_text(rng, rng.randint(0, 40))
+        assert normalize_unicode_characters(text) == ref_normalize_unicode(text)
+    print("✅ Test passed: unicode map")
+
+
+def test_fuzz_matches_reference():
+    """Test random whitespace/dash/ligature soup on both cleanup paths"""
+    rng = random.Random(42)
+    for _ in range(20000):
+        text = random_text(rng, rng.randint(0, 30))
+        assert normalize_text(text) == ref_final(text), repr(text)
+        collapsed = collapse_whitespace(text)
+        assert collapsed == ref_blocks(text), repr(text)
+        assert normalize_text(collapsed, collapsed=True) == ref_final(ref_blocks(text)), repr(text)
+    print("✅ Test passed: fuzzed equivalence")
+
+
+def test_corpus_matches_reference():
+    """Test byte-identical output on the sample resumes"""
+    texts = corpus_texts()
+    assert texts, "Expected sample resumes in data/ and generated/"
+    for text in texts:
+        assert normalize_text(text) == ref_final(text)
+        assert normalize_text(collapse_whitespace(text), collapsed=True) == ref_final(ref_blocks(text))
+    print(f"✅ Test passed: corpus equivalence ({len(texts)} documents)")
+
+
+if __name__ == "__main__":
+    test_unicode_map_matches_reference()
+    test_fuzz_matches_reference()
+    test_corpus_matches_reference()
@@ -0,0 +1,67 @@
+"""
+Test suite for the hyperparameter search mode of train_model.
+Runs a small grid into a temp models/ dir.
+"""
+
+import importlib.util
+import json
+import os
+import tempfile
+
+from utils.model_registry import ModelRegistry
+
+DATA_PATH = os.path.abspath("data/synthetic_resumes.csv")
+
+GRID = {"max_features": [500, 3000], "ngram_range": [(1, 1)], "sublinear_tf": [False], "alpha": [0.01, 1.0]}
+
+
+def load_train_script():
+    spec = importlib.util.spec_from_file_location("train_model", os.path.join("scripts", "train_model.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_search_records_candidates_and_selects_best():
+    """Test every candidate is measured in the manifest and the best one is saved as the run only"""
+    train = load_train_script()
+    with tempfile.TemporaryDirectory() as tmp:
+        models_dir = os.path.join(tmp, "models")
+        meta = train.train_model_search(DATA_PATH, models_dir, grid=GRID, n_splits=3, latency_budget_ms=1000,
+                                        n_jobs=2)
+        with open(os.path.join(models_dir, f"run_{meta['run_id']}.json"), encoding="utf-8") as f:
+            assert json.load(f) == meta
+        candidates = meta["candidates"]
+        assert meta["mode"] == "search" and len(candidates) == 4 and meta["cv_folds"] == 3
+        for c in candidates:
+            assert 0 < c["cv_accuracy"] <= 1 and c["fit_time_sec"] > 0
+            assert c["artifact_bytes"] > 0 and c["latency_ms_per_doc"] > 0 and c["within_budget"]
+        selected = [c for c in candidates if c.get("selected")]
+        assert len(selected) == 1 and selected[0]["params"] == meta["params"]
+        assert selected[0]["cv_accuracy"] == max(c["cv_accuracy"] for c in candidates)
+        for base in ("resume_classifier.pkl", "tfidf_vectorizer.pkl", "resume_classifier"):
+            assert not os.path.exists(os.path.join(models_dir, base)), f"{base} belongs to the base model"
+
+        registry = ModelRegistry(models_dir, check_interval=0)
+        registry.promote(meta["run_id"])
+        assert registry.predictor().run_id == meta["run_id"]
+        assert len(registry.predictor().predict(["Python Django REST APIs"])) == 1
+    print(f"✅ Test passed: search (selected {meta['params']})")
+
+
+def test_latency_budget_limits_selection():
+    """Test a budget no candidate meets falls back to the fastest candidate"""
+    train = load_train_script()
+    with tempfile.TemporaryDirectory() as tmp:
+        meta = train.train_model_search(DATA_PATH, os.path.join(tmp, "models"), grid=GRID, n_splits=2,
+                                        latency_budget_ms=0, n_jobs=1)
+    candidates = meta["candidates"]
+    assert not any(c["within_budget"] for c in candidates)
+    selected = next(c for c in candidates if c.get("selected"))
+    assert selected["latency_ms_per_doc"] == min(c["latency_ms_per_doc"] for c in candidates)
+    print("✅ Test passed: latency budget")
+
+
+if __name__ == "__main__":
+    test_search_records_candidates_and_selects_best()
+    test_latency_budget_limits_selection()
@@ -0,0 +1,82 @@
+"""
+Test suite for streaming (out-of-core) training.
+Trains in small chunks into a temp models/ dir and serves the run.
+"""
+
+import importlib.util
+import json
+import os
+import pickle
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from utils.model_artifacts import NBPredictor, SklearnPredictor
+from utils.model_registry import ModelRegistry
+
+DATA_PATH = os.path.abspath("data/synthetic_resumes.csv")
+
+
+def load_train_script():
+    spec = importlib.util.spec_from_file_location("train_model", os.path.join("scripts", "train_model.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_streaming_run_is_recorded_and_served():
+    """Test a chunked run leaves the usual run files only, and the registry serves its export like the pickles"""
+    train = load_train_script()
+    with tempfile.TemporaryDirectory() as tmp:
+        models_dir = os.path.join(tmp, "models")
+        meta = train.train_model_streaming(DATA_PATH, models_dir, chunk_size=300, n_features=2 ** 14)
+        with open(os.path.join(models_dir, f"run_{meta['run_id']}.json"), encoding="utf-8") as f:
+            assert json.load(f) == meta
+        assert meta["mode"] == "streaming" and meta["accuracy"] > 0.8
+        assert meta["samples"] == len(pd.read_csv(DATA_PATH).dropna(subset=["text", "label"]))
+        assert 0 < meta["holdout_samples"] < meta["samples"] / 2
+        for key in ("model", "vectorizer", "arrays"):
+            assert os.path.exists(meta["artifacts"][key]), key
+        for base in ("resume_classifier.pkl", "tfidf_vectorizer.pkl", "resume_classifier"):
+            assert not os.path.exists(os.path.join(models_dir, base)), f"{base} belongs to the base model"
+
+        with open(meta["artifacts"]["model"], "rb") as f:
+            clf = pickle.load(f)
+        with open(meta["artifacts"]["vectorizer"], "rb") as f:
+            vectorizer = pickle.load(f)
+        texts = pd.read_csv(DATA_PATH)["text"].dropna().head(200).tolist()
+        expected = SklearnPredictor(clf, vectorizer).predict(texts)
+        assert list(NBPredictor(meta["artifacts"]["arrays"]).predict(texts)) == list(expected)
+
+        registry = ModelRegistry(models_dir, check_interval=0)
+        assert [run["run_id"] for run in registry.runs()] == [meta["run_id"]]
+        assert registry.active_run_id() is None, "A new run serves only once promoted"
+        registry.promote(meta["run_id"])
+        assert list(registry.predictor().predict(texts)) == list(expected)
+        assert registry.predictor().run_id == meta["run_id"]
+        assert isinstance(registry.predictor().predictor, NBPredictor), "Served from the run's array export"
+    print(f"✅ Test passed: streaming run (accuracy {meta['accuracy']:.4f})")
+
+
+def test_chunk_size_does_not_change_the_model():
+    """Test partial_fit over chunks learns the same counts as one big chunk"""
+    train = load_train_script()
+    models = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for chunk_size in (250, 100_000):
+            models_dir = os.path.join(tmp, str(chunk_size))
+            meta = train.train_model_streaming(DATA_PATH, models_dir, chunk_size=chunk_size, n_features=2 ** 12)
+            with open(meta["artifacts"]["model"], "rb") as f:
+                models.append((pickle.load(f), meta))
+    (small, small_meta), (big, big_meta) = models
+    assert small_meta["holdout_samples"] == big_meta["holdout_samples"]
+    assert list(small.classes_) == list(big.classes_)
+    assert np.allclose(small.feature_count_, big.feature_count_)
+    assert np.array_equal(small.class_count_, big.class_count_)
+    print("✅ Test passed: chunk size independence")
+
+
+if __name__ == "__main__":
+    test_streaming_run_is_recorded_and_served()
+    test_chunk_size_does_not_change_the_model()
@@ -0,0 +1,98 @@
+# utils/analysis_service.py
+"""
+Keeps parsing and scoring separate for the single-resume dashboard.
+
+The parsed document is stored once per upload; changing the target role, the
+job description or the experience level only reruns get_resume_feedback on
+the stored text, which takes milliseconds instead of a full re-parse.
+"""
+from typing import MutableMapping
+
+from utils.resume_parser import DEFAULT_MAX_PAGES, DEFAULT_TIME_BUDGET, parse_resume
+from utils.analyze_resume import get_resume_feedback, predict_role_from_resume
+
+# Keys used inside the state mapping (st.session_state in the app)
+PARSED_KEY = "parsed_resume"
+RESULTS_KEY = "analysis_results"
+
+
+class AnalysisService:
+    """
+    Parse-once / score-many analysis over a mutable mapping such as
+    st.session_state.
+
+    Stored layout:
+      state["parsed_resume"]    -> {"file_id", "parsed", "predicted_role"}
+      state["analysis_results"] -> dashboard results, tagged with "analysis_key"
+    """
+
+    def __init__(self, state: MutableMapping):
+        self.state = state
+
+    # -----------------------
+    # Parsing
+    # -----------------------
+    def needs_parse(self, file_id: str) -> bool:
+        """True if the upload identified by file_id has not been parsed yet."""
+        entry = self.state.get(PARSED_KEY)
+        return not entry or entry.get("file_id") != file_id
+
+    def parsed_document(self, uploaded_file, file_id: str) -> dict:
+        """Return the stored parse for this upload, parsing it on first use."""
+        if self.needs_parse(file_id):
+            uploaded_file.seek(0)
+            # capped, so a pathological upload cannot stall the session
+            parsed = parse_resume(uploaded_file, time_budget=DEFAULT_TIME_BUDGET,
+                                  max_pages=DEFAULT_MAX_PAGES)
+            self.state[PARSED_KEY] = {
+                "file_id": file_id,
+                "parsed": parsed,
+                # depends only on the text, so compute it once per upload
+                "predicted_role": predict_role_from_resume(parsed.get("plain_text", "")),
+            }
+            # results for the previous upload are stale now
+            self.state.pop(RESULTS_KEY, None)
+        return self.state[PARSED_KEY]
+
+    # -----------------------
+    # Scoring
+    # -----------------------
+    def analyze(self, uploaded_file, file_id: str, selected_role: str,
+                job_description: str = "", experience_level: str = "Mid Level") -> dict:
+        """
+        Return dashboard results for the upload and settings, reusing the
+        stored parse and the previous results whenever possible.
+        """
+        key = (file_id, selected_role, job_description or "", experience_level)
+        results = self.state.get(RESULTS_KEY)
+        if results and results.get("analysis_key") == key and not self.needs_parse(file_id):
+            return results
+
+        entry = self.parsed_document(uploaded_file, file_id)
+        results = self.rescore(entry, selected_role, job_description, experience_level)
+        results["analysis_key"] = key
+        self.state[RESULTS_KEY] = results
+        return results
+
+    @staticmethod
+    def rescore(entry: dict, selected_role: str, job_description: str = "",
+                experience_level: str = "Mid Level") -> dict:
+        """Run only the scoring step on an already parsed document."""
+        parsed = entry["parsed"]
+        plain_text = parsed.get("plain_text", "")
+        suggestions, resume_score, keyword_match, predicted_role = get_resume_feedback(
+            plain_text,
+            selected_role,
+            job_description=job_description,
+            experience_level=experience_level,
+            predicted_role=entry.get("predicted_role"),
+        )
+        return {
+            "plain_text": plain_text,
+            "suggestions": suggestions,
+            "score": resume_score,
+            "keyword_match": keyword_match,
+            "predicted_role": predicted_role,
+            "truncated": parsed.get("truncated", False),
+            "timed_out": parsed.get("timed_out", False),
+        }
@@ -1,4 +1,7 @@
-import json
+import numpy as np
+
+from utils.keyword_matcher import KeywordMatcher
+from utils.role_catalog import get_role_catalog
 
 def detect_sections(text):
     text_lower = text.lower()
@@ -21,8 +24,91 @@ def detect_sections(text):
     return missing_sections
 
 
-def get_resume_feedback(text, selected_role, job_description="", experience_level="Mid Level"):
+def _jd_keywords(job_description):
+    # Simple extraction of long words: the first 5 long words of the JD
+    jd_words = [w.strip(".,()") for w in job_description.lower().split() if len(w) > 5]
+    return jd_words[:5]
+
+
+def get_resume_feedback(text, selected_role, job_description="", experience_level="Mid Level", predicted_role=None):
+    """
+    Score a resume for a role. The AI role prediction depends only on the
+    text, so callers that rescore the same resume can pass a previously
+    computed predicted_role to skip the model call.
+    """
     text_lower = text.lower()
+
+    # --- 3. Keyword Matching ---
+    catalog = get_role_catalog()
+    role = catalog.role(selected_role)
+    role_keywords = list(role.keywords) if role else []
+
+    # Enhance with JD keywords if provided
+    if job_description:
+        role_keywords.extend(_jd_keywords(job_description))
+        role_keywords = list(dict.fromkeys(role_keywords))
+        missing_keywords = [k for k in role_keywords if k.lower() not in text_lower]
+    else:
+        missing_keywords = role.missing(catalog.find(text_lower)) if role else []
+
+    if predicted_role is None:
+        predicted_role = predict_role_from_resume(text)
+    return _feedback(text, selected_role, experience_level, len(role_keywords),
+                     len(role_keywords) - len(missing_keywords), missing_keywords, predicted_role)
+
+
+def get_resume_feedback_many(texts, selected_role, job_description="", experience_level="Mid Level",
+                             predicted_roles=None):
+    """
+    get_resume_feedback for a batch of resumes, same results in the same
+    order. The model runs once over one TF-IDF matrix of all texts, and skill
+    coverage comes from one product of a resumes x keywords presence matrix
+    with the keyword counts of the role (the catalog's roles x skills matrix
+    row, plus columns for JD words the catalog lacks).
+    """
+    texts = list(texts)
+    if not texts:
+        return []
+    if predicted_roles is None:
+        predicted_roles = predict_roles(texts)
+
+    catalog = get_role_catalog()
+    skills, role_names, role_matrix = catalog.keyword_matrix()
+    role = catalog.role(selected_role)
+    role_keywords = list(role.keywords) if role else []
+    weights = role_matrix[role_names.index(selected_role)] if role else np.zeros(len(skills), dtype=np.int32)
+
+    column = {k: i for i, k in enumerate(skills)}
+    extra = KeywordMatcher([])
+    always = 0  # an empty keyword is in every text
+    if job_description:
+        role_keywords = list(dict.fromkeys(role_keywords + _jd_keywords(job_description)))
+        extra = KeywordMatcher(k.lower() for k in role_keywords if k.lower() not in column)
+        column.update((k, len(skills) + i) for i, k in enumerate(extra.keywords))
+        weights = np.zeros(len(column), dtype=np.int32)
+        for k in role_keywords:
+            if k:
+                weights[column[k.lower()]] += 1
+            else:
+                always += 1
+
+    texts_lower = [t.lower() for t in texts]
+    found = [catalog.find(t) | extra.find(t) for t in texts_lower]
+    presence = np.zeros((len(texts), len(column)), dtype=np.int32)
+    presence[[r for r, f in enumerate(found) for _ in f], [column[k] for f in found for k in f]] = 1
+    matched = presence @ weights + always
+
+    total = len(role_keywords)
+    results = []
+    for text, f, n_matched, predicted_role in zip(texts, found, matched, predicted_roles):
+        missing_keywords = [k for k in role_keywords if k and k.lower() not in f] if n_matched < total else []
+        results.append(_feedback(text, selected_role, experience_level, total, int(n_matched),
+                                 missing_keywords, predicted_role))
+    return results
+
+
+def _feedback(text, selected_role, experience_level, total_keywords, matched_keywords, missing_keywords,
+              predicted_role):
     suggestions = []
     
     # --- 1. Basic Checks ---
@@ -40,39 +126,10 @@ def get_resume_feedback(text, selected_role, job_description="", experience_leve
     if missing_sections:
         suggestions.append(f"Missing important sections: {', '.join(missing_sections)}.")
 
-    # --- 3. Keyword Matching ---
-    try:
-        with open("utils/job_roles.json", "r") as f:
-            job_roles = json.load(f)
-        
-        # Flattens nested dictionary structure to find role keywords
-        role_keywords = []
-        for cat in job_roles.values():
-            if selected_role in cat:
-                role_keywords = cat[selected_role].get("required_skills", [])
-                break
-    except Exception:
-        role_keywords = []
-
-    # Enhance with JD keywords if provided
-    if job_description:
-        # Simple extraction of long words
-        jd_words = [w.strip(".,()") for w in job_description.lower().split() if len(w) > 5]
-        role_keywords.extend(jd_words[:5]) # add top 5 long words from JD
-        role_keywords = list(set(role_keywords))
-
-    missing_keywords = []
-    for keyword in role_keywords:
-        if keyword.lower() not in text_lower:
-            missing_keywords.append(keyword)
-
     if missing_keywords:
         suggestions.append(f"Missing key skills for {selected_role}: {', '.join(missing_keywords[:7])}.")
 
     # --- 4. Scoring ---
-    total_keywords = len(role_keywords)
-    matched_keywords = total_keywords - len(missing_keywords)
-    
     if total_keywords > 0:
         keyword_match = int((matched_keywords / total_keywords) * 100)
     else:
@@ -93,42 +150,33 @@ def get_resume_feedback(text, selected_role, job_description="", experience_leve
     resume_score = min(100, int(resume_score))
     
     # --- 5. Prediction ---
-    predicted_role = predict_role_from_resume(text)
     if predicted_role != "Unknown" and predicted_role != selected_role:
         suggestions.append(f"AI suggests your resume looks like a **{predicted_role}**.")
 
     return suggestions, resume_score, keyword_match, predicted_role
 
 # --- MODEL INTEGRATION ---
-import pickle
-import os
-import pandas as pd
-
-# Global cache for model
-_MODEL = None
-_VECTORIZER = None
-
-def load_model_artifacts():
-    global _MODEL, _VECTORIZER
-    if _MODEL is None or _VECTORIZER is None:
-        try:
-            with open("models/resume_classifier.pkl", "rb") as f:
-                _MODEL = pickle.load(f)
-            with open("models/tfidf_vectorizer.pkl", "rb") as f:
-                _VECTORIZER = pickle.load(f)
-        except Exception as e:
-            print(f"Error loading model: {e}")
-            return None, None
-    return _MODEL, _VECTORIZER
+from utils.model_registry import get_model_registry
+
+
+def load_role_predictor():
+    """The active role classifier (see utils/model_registry.py); None if unavailable."""
+    return get_model_registry().predictor()
+
 
 def predict_role_from_resume(text):
-    clf, tfidf = load_model_artifacts()
-    if not clf or not tfidf:
+    predictor = load_role_predictor()
+    if predictor is None:
         return "Unknown"
-    
-    # Vectorize text
-    text_vector = tfidf.transform([text])
-    
-    # Predict
-    prediction = clf.predict(text_vector)
-    return prediction[0]
+    return str(predictor.predict([text])[0])
+
+
+def predict_roles(texts):
+    """predict_role_from_resume for many texts in one predict call."""
+    texts = list(texts)
+    predictor = load_role_predictor()
+    if predictor is None:
+        return ["Unknown"] * len(texts)
+    if not texts:
+        return []
+    return [str(role) for role in predictor.predict(texts)]
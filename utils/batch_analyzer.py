@@ -1,11 +1,66 @@
 # utils/batch_analyzer.py
 import time
 from typing import List, Dict
-from utils.resume_parser import parse_resume
-from utils.analyze_resume import get_resume_feedback
+from utils.resume_parser import DEFAULT_MAX_PAGES, DEFAULT_TIME_BUDGET, parse_resume
+from utils.analyze_resume import get_resume_feedback, get_resume_feedback_many
 
 
-def analyze_single_resume(uploaded_file, selected_role, job_description="", experience_level="Mid Level"):
+def _parse_for_analysis(uploaded_file, time_budget=DEFAULT_TIME_BUDGET, max_pages=DEFAULT_MAX_PAGES):
+    """
+    Parse one file for scoring. Returns (plain_text, truncated, timed_out)
+    or, when no usable text came out, the error result dict.
+    """
+    # Parse resume; a file that hits the limits is scored on its partial text
+    uploaded_file.seek(0)  # Reset file pointer
+    parsed = parse_resume(uploaded_file, time_budget=time_budget, max_pages=max_pages)
+    plain_text = parsed.get("plain_text", "")
+    truncated = parsed.get("truncated", False)
+    timed_out = parsed.get("timed_out", False)
+
+    if not plain_text or len(plain_text.strip()) < 50:
+        return _error_result(uploaded_file,
+                             ("Parsing timed out before any text was extracted" if timed_out
+                              else "Failed to extract text from resume"),
+                             truncated, timed_out)
+    return plain_text, truncated, timed_out
+
+
+def _error_result(uploaded_file, error, truncated=False, timed_out=False):
+    return {
+        "filename": uploaded_file.name,
+        "status": "error",
+        "error": error,
+        "plain_text": "",
+        "suggestions": [],
+        "score": 0,
+        "keyword_match": 0,
+        "predicted_role": "Unknown",
+        "file_size": uploaded_file.size,
+        "truncated": truncated,
+        "timed_out": timed_out
+    }
+
+
+def _success_result(uploaded_file, parsed, feedback):
+    plain_text, truncated, timed_out = parsed
+    suggestions, resume_score, keyword_match, predicted_role = feedback
+    return {
+        "filename": uploaded_file.name,
+        "status": "success",
+        "plain_text": plain_text,
+        "suggestions": suggestions,
+        "score": int(resume_score),
+        "keyword_match": int(keyword_match),
+        "predicted_role": predicted_role,
+        "file_size": uploaded_file.size,
+        "word_count": len(plain_text.split()),
+        "truncated": truncated,
+        "timed_out": timed_out
+    }
+
+
+def analyze_single_resume(uploaded_file, selected_role, job_description="", experience_level="Mid Level",
+                          time_budget=DEFAULT_TIME_BUDGET, max_pages=DEFAULT_MAX_PAGES):
     """
     Analyzes a single resume file.
 
@@ -14,61 +69,29 @@ def analyze_single_resume(uploaded_file, selected_role, job_description="", expe
         selected_role: Target job role for analysis
         job_description: Optional job description for enhanced matching
         experience_level: Experience level (Entry Level, Mid Level, Senior, Executive)
+        time_budget: Seconds allowed for parsing (None = no limit)
+        max_pages: Pages to parse at most (None = no limit)
 
     Returns:
         dict: Analysis results containing filename, parsed text, suggestions, score, etc.
+              "truncated" / "timed_out" flag resumes that were only partly parsed.
     """
     try:
-        # Parse resume
-        uploaded_file.seek(0)  # Reset file pointer
-        parsed = parse_resume(uploaded_file)
-        plain_text = parsed.get("plain_text", "")
-
-        if not plain_text or len(plain_text.strip()) < 50:
-            return {
-                "filename": uploaded_file.name,
-                "status": "error",
-                "error": "Failed to extract text from resume",
-                "plain_text": "",
-                "suggestions": [],
-                "score": 0,
-                "keyword_match": 0,
-                "predicted_role": "Unknown",
-                "file_size": uploaded_file.size
-            }
+        parsed = _parse_for_analysis(uploaded_file, time_budget, max_pages)
+        if isinstance(parsed, dict):
+            return parsed
 
         # Analyze resume
-        suggestions, resume_score, keyword_match, predicted_role = get_resume_feedback(
-            plain_text,
+        feedback = get_resume_feedback(
+            parsed[0],
             selected_role,
             job_description=job_description,
             experience_level=experience_level
         )
-
-        return {
-            "filename": uploaded_file.name,
-            "status": "success",
-            "plain_text": plain_text,
-            "suggestions": suggestions,
-            "score": int(resume_score),
-            "keyword_match": int(keyword_match),
-            "predicted_role": predicted_role,
-            "file_size": uploaded_file.size,
-            "word_count": len(plain_text.split())
-        }
+        return _success_result(uploaded_file, parsed, feedback)
 
     except Exception as e:
-        return {
-            "filename": uploaded_file.name,
-            "status": "error",
-            "error": str(e),
-            "plain_text": "",
-            "suggestions": [],
-            "score": 0,
-            "keyword_match": 0,
-            "predicted_role": "Unknown",
-            "file_size": uploaded_file.size
-        }
+        return _error_result(uploaded_file, str(e))
 
 
 def batch_analyze_resumes(
@@ -81,6 +104,9 @@ def batch_analyze_resumes(
     """
     Analyzes multiple resume files in batch.
 
+    All files are parsed first, then every parsed resume is scored in one
+    get_resume_feedback_many call (one model call for the whole batch).
+
     Args:
         uploaded_files: List of Streamlit UploadedFile objects
         selected_role: Target job role for analysis
@@ -92,6 +118,7 @@ def batch_analyze_resumes(
         list: List of analysis result dictionaries, one per file
     """
     results = []
+    parsed_files = []  # (index in results, file, parsed)
     total_files = len(uploaded_files)
 
     for idx, uploaded_file in enumerate(uploaded_files, 1):
@@ -99,20 +126,38 @@ def batch_analyze_resumes(
         if progress_callback:
             progress_callback(idx, total_files)
 
-        # Analyze single resume
-        result = analyze_single_resume(
-            uploaded_file,
-            selected_role,
-            job_description,
-            experience_level
-        )
-
-        results.append(result)
+        try:
+            parsed = _parse_for_analysis(uploaded_file)
+        except Exception as e:
+            parsed = _error_result(uploaded_file, str(e))
+        if isinstance(parsed, dict):
+            results.append(parsed)
+        else:
+            results.append(None)
+            parsed_files.append((len(results) - 1, uploaded_file, parsed))
 
         # Small delay to prevent overwhelming the system
         if idx < total_files:
             time.sleep(0.1)
 
+    try:
+        feedbacks = get_resume_feedback_many(
+            [parsed[0] for _, _, parsed in parsed_files],
+            selected_role,
+            job_description=job_description,
+            experience_level=experience_level
+        )
+    except Exception:
+        # score one by one so a bad resume only fails itself
+        feedbacks = None
+    for n, (i, uploaded_file, parsed) in enumerate(parsed_files):
+        try:
+            feedback = feedbacks[n] if feedbacks is not None else get_resume_feedback(
+                parsed[0], selected_role, job_description=job_description, experience_level=experience_level)
+            results[i] = _success_result(uploaded_file, parsed, feedback)
+        except Exception as e:
+            results[i] = _error_result(uploaded_file, str(e))
+
     return results
 
 
@@ -134,7 +179,8 @@ def get_batch_summary(results: List[Dict]) -> Dict:
             "average_score": 0,
             "highest_score": 0,
             "lowest_score": 0,
-            "average_keyword_match": 0
+            "average_keyword_match": 0,
+            "truncated": 0
         }
 
     successful_results = [r for r in results if r["status"] == "success"]
@@ -151,6 +197,7 @@ def get_batch_summary(results: List[Dict]) -> Dict:
         "highest_score": max(scores) if scores else 0,
         "lowest_score": min(scores) if scores else 0,
         "average_keyword_match": sum(keyword_matches) / len(keyword_matches) if keyword_matches else 0,
+        "truncated": sum(1 for r in results if r.get("truncated")),
         "best_resume": max(successful_results, key=lambda x: x["score"])["filename"] if successful_results else None,
         "worst_resume": min(successful_results, key=lambda x: x["score"])["filename"] if successful_results else None
     }
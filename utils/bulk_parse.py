@@ -0,0 +1,295 @@
+# utils/bulk_parse.py
+"""
+Headless bulk parser: pre-parse a directory or a zip of resumes offline.
+
+Files are fanned out over a process pool and one JSON line per resume is
+written to the output as soon as it finishes, so the output can be tailed
+while a large archive is being parsed. Files on disk are handed to the
+parser by path (memory-mapped, not read into the heap); zip members are
+read first, which read_ms accounts for. Files no extractor can read (the
+parser's strict mode raises) and files that yield no text at all are
+failures. Every record carries its own timings and, for failures, the error
+type and message:
+
+  {"id": "cvs/jane.pdf", "status": "ok", "size": 48213, "chars": 3120,
+   "timings": {"read_ms": 0.4, "parse_ms": 38.2, "total_ms": 38.9},
+   "result": {"plain_text": ..., "structured": ..., "skills": [...],
+              "truncated": false, "timed_out": false}}
+  {"id": "cvs/broken.pdf", "status": "error", ...,
+   "error": {"type": "ValueError", "message": "..."}}
+
+Re-running with the same output file resumes: ids already in the file are
+skipped (failed ones too, unless --retry-errors, which appends a new record
+for them: the last record of an id wins), and a line cut off by a crash is
+dropped before new records are appended.
+
+Usage: python -m utils.bulk_parse INPUT_DIR_OR_ZIP OUTPUT.jsonl [--workers N]
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from utils.resume_parser import DEFAULT_MAX_PAGES, DEFAULT_TIME_BUDGET, parse_resume
+
+# Files picked up from the input
+EXTENSIONS = (".pdf", ".docx", ".txt")
+
+# Tasks in flight per worker: keeps every worker busy without queueing a
+# whole archive's worth of futures
+IN_FLIGHT_PER_WORKER = 2
+
+# A task that was running when the pool died this many times is recorded as
+# an error instead of being retried (it most likely crashed the worker)
+MAX_CRASHES = 2
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+# Error type of a file that parsed without an error but produced no text
+# (e.g. a blank or image-only PDF without OCR)
+EMPTY_DOCUMENT = "EmptyDocument"
+
+# (id, input path, zip member or None)
+Task = Tuple[str, str, Optional[str]]
+
+
+# -----------------------
+# Inputs
+# -----------------------
+def iter_tasks(source: str) -> Iterator[Task]:
+    """
+    Resume files under a directory (recursively) or inside a zip, in
+    sorted order. Ids are paths relative to the directory / zip members.
+    Raises ValueError right away for any other input.
+    """
+    if os.path.isdir(source):
+        return _dir_tasks(source)
+    if zipfile.is_zipfile(source):
+        return _zip_tasks(source)
+    raise ValueError(f"Input must be a directory or a zip file: {source}")
+
+
+def _dir_tasks(source: str) -> Iterator[Task]:
+    for root, dirs, files in os.walk(source):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(EXTENSIONS):
+                path = os.path.join(root, name)
+                yield os.path.relpath(path, source).replace(os.sep, "/"), path, None
+
+
+def _zip_tasks(source: str) -> Iterator[Task]:
+    with zipfile.ZipFile(source) as zf:
+        names = sorted(i.filename for i in zf.infolist() if not i.is_dir())
+    for name in names:
+        if name.lower().endswith(EXTENSIONS):
+            yield name, source, name
+
+
+# Per-worker open archives, so members are read without reopening the zip
+_ZIPS: Dict[str, zipfile.ZipFile] = {}
+
+
+def _read_member(path: str, member: str) -> bytes:
+    zf = _ZIPS.get(path)
+    if zf is None:
+        zf = _ZIPS[path] = zipfile.ZipFile(path)
+    return zf.read(member)
+
+
+# -----------------------
+# Worker
+# -----------------------
+def parse_task(task: Task, time_budget: Optional[float] = None,
+               max_pages: Optional[int] = None) -> dict:
+    """Read and parse one file; never raises, failures become error records."""
+    task_id, path, member = task
+    record = {"id": task_id, "status": STATUS_OK}
+    started = time.perf_counter()
+    parse_started = started
+    try:
+        if member is None:
+            # parse_resume memory-maps the file; nothing to read up front
+            record["size"] = os.path.getsize(path)
+            upload = path
+        else:
+            data = _read_member(path, member)
+            record["size"] = len(data)
+            upload = io.BytesIO(data)
+            upload.name = task_id
+        parse_started = time.perf_counter()
+        parsed = parse_resume(upload, use_cache=False, time_budget=time_budget, max_pages=max_pages,
+                              strict=True)
+        record["chars"] = len(parsed.plain_text)
+        if parsed.plain_text.strip():
+            record["result"] = {
+                "plain_text": parsed.plain_text,
+                "structured": parsed.structured,
+                "skills": parsed.skills,
+                "truncated": parsed.truncated,
+                "timed_out": parsed.timed_out,
+            }
+        else:
+            record["status"] = STATUS_ERROR
+            record["error"] = {"type": EMPTY_DOCUMENT, "message": "No text could be extracted"}
+    except Exception as e:
+        record["status"] = STATUS_ERROR
+        record["error"] = {"type": type(e).__name__, "message": str(e)}
+    finished = time.perf_counter()
+    record["timings"] = {
+        "read_ms": round((parse_started - started) * 1000, 3),
+        "parse_ms": round((finished - parse_started) * 1000, 3),
+        "total_ms": round((finished - started) * 1000, 3),
+    }
+    return record
+
+
+# -----------------------
+# Output / resume
+# -----------------------
+def load_done(output: str, retry_errors: bool = False) -> Set[str]:
+    """
+    Ids already recorded in output. A trailing partial line (the process was
+    killed mid-write) is cut off so appended records start on a fresh line.
+    """
+    done = set()
+    if not os.path.exists(output):
+        return done
+    good_end = 0
+    with open(output, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            good_end += len(line)
+            if record.get("status") == STATUS_OK or not retry_errors:
+                done.add(record["id"])
+    if good_end != os.path.getsize(output):
+        with open(output, "r+b") as f:
+            f.truncate(good_end)
+    return done
+
+
+def _error_record(task: Task, message: str) -> dict:
+    return {"id": task[0], "status": STATUS_ERROR, "error": {"type": "WorkerCrash", "message": message},
+            "timings": {"read_ms": 0.0, "parse_ms": 0.0, "total_ms": 0.0}}
+
+
+def run(source: str, output: str, workers: Optional[int] = None,
+        time_budget: Optional[float] = DEFAULT_TIME_BUDGET, max_pages: Optional[int] = DEFAULT_MAX_PAGES,
+        retry_errors: bool = False, progress=None) -> dict:
+    """
+    Parse every resume in source into output (JSONL), resuming from
+    whatever output already holds. Returns counts and the elapsed time.
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = iter_tasks(source)
+    done = load_done(output, retry_errors)
+    stats = {"ok": 0, "error": 0, "skipped": 0, "elapsed_s": 0.0}
+
+    def not_done():
+        for task in tasks:
+            if task[0] in done:
+                stats["skipped"] += 1
+            else:
+                yield task
+
+    pending = not_done()
+    crashes: Dict[str, int] = {}
+    retry: List[Task] = []
+    started = time.perf_counter()
+
+    with open(output, "a", encoding="utf-8") as out:
+        def write(record):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            stats[record["status"]] += 1
+            if progress:
+                progress(record)
+
+        exhausted = False
+        while not exhausted or retry:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            in_flight = {}
+            try:
+                while True:
+                    while len(in_flight) < workers * IN_FLIGHT_PER_WORKER:
+                        task = retry.pop() if retry else next(pending, None)
+                        if task is None:
+                            exhausted = True
+                            break
+                        try:
+                            fut = pool.submit(parse_task, task, time_budget, max_pages)
+                        except BrokenProcessPool:
+                            retry.append(task)  # never started: not its fault
+                            raise
+                        in_flight[fut] = task
+                    if not in_flight:
+                        break
+                    finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        record = fut.result()  # raises BrokenProcessPool if the worker died
+                        del in_flight[fut]
+                        write(record)
+            except BrokenProcessPool:
+                # a worker died (e.g. a segfault in a PDF library): retry what
+                # was in flight on a fresh pool, giving up on repeat offenders
+                for fut, task in in_flight.items():
+                    if fut.done() and not fut.cancelled() and fut.exception() is None:
+                        write(fut.result())
+                        continue
+                    crashes[task[0]] = crashes.get(task[0], 0) + 1
+                    if crashes[task[0]] >= MAX_CRASHES:
+                        write(_error_record(task, "Worker process died while parsing this file"))
+                    else:
+                        retry.append(task)
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+    stats["elapsed_s"] = round(time.perf_counter() - started, 3)
+    return stats
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", help="directory or .zip of resumes (PDF, DOCX, TXT)")
+    parser.add_argument("output", help="JSONL file to write / resume")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--time-budget", type=float, default=DEFAULT_TIME_BUDGET or 0,
+                        help="seconds per file, 0 = no limit")
+    parser.add_argument("--max-pages", type=int, default=DEFAULT_MAX_PAGES or 0,
+                        help="pages per file, 0 = no limit")
+    parser.add_argument("--retry-errors", action="store_true",
+                        help="parse again files recorded as errors")
+    parser.add_argument("--quiet", action="store_true", help="no per-file progress")
+    args = parser.parse_args(argv)
+
+    def progress(record):
+        print(f"{record['status']:>5} {record['timings']['total_ms']:>9.1f} ms  {record['id']}",
+              file=sys.stderr)
+
+    try:
+        stats = run(args.input, args.output, args.workers, args.time_budget or None,
+                    args.max_pages or None, args.retry_errors, None if args.quiet else progress)
+    except ValueError as e:
+        parser.error(str(e))
+    parsed = stats["ok"] + stats["error"]
+    rate = parsed / stats["elapsed_s"] if stats["elapsed_s"] else 0.0
+    print(f"parsed {parsed} ({stats['ok']} ok, {stats['error']} errors), "
+          f"skipped {stats['skipped']} already done, {stats['elapsed_s']:.1f}s ({rate:.1f} files/s)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
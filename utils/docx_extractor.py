@@ -0,0 +1,213 @@
+# utils/docx_extractor.py
+"""
+Native DOCX text extraction.
+
+Streams word/document.xml out of the zip with an incremental XML parser and
+clears every paragraph once it has been read, so memory stays flat no matter
+how large the document is. Paragraphs come out as parser blocks with their
+heading / list information, ready for the same pipeline as PDF blocks.
+"""
+import io
+import mmap
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Union
+
+from utils.parsed_resume import Block
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+_P = W_NS + "p"
+_T = W_NS + "t"
+_TAB = W_NS + "tab"
+_BR = W_NS + "br"
+_CR = W_NS + "cr"
+_PPR = W_NS + "pPr"
+_PSTYLE = W_NS + "pStyle"
+_NUMPR = W_NS + "numPr"
+_OUTLINE = W_NS + "outlineLvl"
+_STYLE = W_NS + "style"
+_NAME = W_NS + "name"
+_VAL = W_NS + "val"
+_STYLE_ID = W_NS + "styleId"
+_TBL = W_NS + "tbl"
+_BODY = W_NS + "body"
+
+# Block styles
+STYLE_HEADING = "heading"
+STYLE_LIST = "list"
+STYLE_PARAGRAPH = "paragraph"
+
+
+class _MappedFile(io.RawIOBase):
+    """
+    Read-only file object over an mmap with its own position, so zipfile
+    reads the mapping in place (mmap has no seekable() before Python 3.13).
+    """
+
+    def __init__(self, mapped: mmap.mmap):
+        super().__init__()
+        self._mapped = mapped
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._mapped)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        chunk = self._mapped[self._pos:self._pos + len(buffer)]
+        buffer[:len(chunk)] = chunk
+        self._pos += len(chunk)
+        return len(chunk)
+
+
+def _zip_source(source: Union[str, bytes, bytearray, memoryview, mmap.mmap]):
+    """
+    ZipFile input: a path as is, an mmap read in place, any other bytes-like
+    buffer wrapped in a file object.
+    """
+    if isinstance(source, str):
+        return source
+    if isinstance(source, mmap.mmap):
+        return _MappedFile(source)
+    return io.BytesIO(source)
+
+
+def is_docx(file_bytes) -> bool:
+    """True for a zip container (any bytes-like buffer) holding word/document.xml."""
+    if not len(file_bytes) or bytes(file_bytes[:2]) != b"PK":
+        return False
+    try:
+        with zipfile.ZipFile(_zip_source(file_bytes)) as zf:
+            return "word/document.xml" in zf.namelist()
+    except zipfile.BadZipFile:
+        return False
+
+
+def _heading_styles(zf: zipfile.ZipFile) -> Dict[str, str]:
+    """
+    Map paragraph style ids to STYLE_HEADING / STYLE_LIST using
+    word/styles.xml (style ids are localized, the names are not).
+    """
+    styles = {}
+    try:
+        stream = zf.open("word/styles.xml")
+    except KeyError:
+        return styles
+    with stream:
+        for _event, elem in ET.iterparse(stream, events=("end",)):
+            if elem.tag != _STYLE:
+                continue
+            style_id = elem.get(_STYLE_ID, "")
+            name_el = elem.find(_NAME)
+            name = (name_el.get(_VAL, "") if name_el is not None else "").lower()
+            if name.startswith("heading") or name == "title" or elem.find(f"{_PPR}/{_OUTLINE}") is not None:
+                styles[style_id] = STYLE_HEADING
+            elif name.startswith("list"):
+                styles[style_id] = STYLE_LIST
+            elem.clear()
+    return styles
+
+
+def _paragraph_style(p, styles: Dict[str, str]) -> str:
+    ppr = p.find(_PPR)
+    if ppr is None:
+        return STYLE_PARAGRAPH
+    if ppr.find(_OUTLINE) is not None:
+        return STYLE_HEADING
+    pstyle = ppr.find(_PSTYLE)
+    style_id = pstyle.get(_VAL, "") if pstyle is not None else ""
+    style = styles.get(style_id)
+    if style is None and style_id.lower().startswith(("heading", "title")):
+        style = STYLE_HEADING
+    if style is None and ppr.find(_NUMPR) is not None:
+        style = STYLE_LIST
+    return style or STYLE_PARAGRAPH
+
+
+def _paragraph_text(p) -> str:
+    parts = []
+    for el in p.iter():
+        if el.tag == _T:
+            parts.append(el.text or "")
+        elif el.tag == _TAB:
+            parts.append("\t")
+        elif el.tag in (_BR, _CR):
+            parts.append("\n")
+    return "".join(parts)
+
+
+def extract_docx_blocks(source) -> List[Block]:
+    """
+    Paragraph blocks of a DOCX file in document order:
+      Block(page=1, bbox=(0, n, 0, n), text="...", style=heading|list|paragraph)
+    DOCX has no fixed layout, so bbox only records the paragraph index.
+    source is the file's bytes (any bytes-like buffer) or its path.
+    """
+    blocks = []
+    with zipfile.ZipFile(_zip_source(source)) as zf:
+        styles = _heading_styles(zf)
+        with zf.open("word/document.xml") as stream:
+            body = None
+            p_depth = 0
+            tbl_depth = 0
+            for event, elem in ET.iterparse(stream, events=("start", "end")):
+                tag = elem.tag
+                if event == "start":
+                    if tag == _P:
+                        p_depth += 1
+                    elif tag == _TBL:
+                        tbl_depth += 1
+                    elif tag == _BODY:
+                        body = elem
+                    continue
+
+                if tag == _TBL:
+                    tbl_depth -= 1
+                    if not tbl_depth and body is not None:
+                        body.clear()  # whole table read: release it
+                    continue
+                if tag != _P:
+                    continue
+                p_depth -= 1
+                if p_depth:
+                    continue  # nested paragraph (e.g. text box); outer one collects it
+
+                text = _paragraph_text(elem).strip()
+                if text:
+                    n = len(blocks)
+                    blocks.append(Block(page=1, bbox=(0, n, 0, n), text=text,
+                                        style=_paragraph_style(elem, styles)))
+                elem.clear()
+                if not tbl_depth and body is not None:
+                    body.clear()  # drop finished paragraphs so the tree never grows
+    return blocks
+
+
+def docx_blocks_to_lines(blocks: List[Block]) -> List[str]:
+    """
+    Plain lines for the parser: list items get a "- " bullet so the
+    bulleted / experience sub-parsers recognise them.
+    """
+    lines = []
+    for b in blocks:
+        text = b.text
+        if b.style == STYLE_LIST and not text.startswith(("-", "•")):
+            text = "- " + text
+        lines.append(text)
+    return lines
+
+
+def extract_docx_text(file_bytes: bytes) -> str:
+    """Paragraph text of a DOCX file, one paragraph per line."""
+    return "\n".join(docx_blocks_to_lines(extract_docx_blocks(file_bytes)))
@@ -0,0 +1,486 @@
+# utils/grammar_service.py
+"""
+Process-wide grammar checking service.
+
+Creating a language_tool_python.LanguageTool boots a Java server, which takes
+seconds, so it must not happen per request. GrammarService starts a single
+backend lazily on first use, keeps it warm between requests and serves every
+Streamlit session through one bounded request queue drained by a few worker
+threads:
+
+  * a full queue fails fast with GrammarServiceBusy instead of piling up
+    requests behind a slow JVM
+  * a backend that has been idle for HEALTH_INTERVAL seconds is probed with
+    a short sentence before it serves again; a failed probe, or a check that
+    fails with one of the backend's own errors (connection / server errors,
+    see BACKEND_ERRORS), closes it and starts a new one (the failed check is
+    retried once on it). Any other error is the request's own and goes back
+    to the caller with the backend left running
+  * after a failed start (e.g. no Java installed) new starts are held off
+    for RESTART_BACKOFF seconds, so requests fail fast in the meantime
+
+check_document() splits a resume into lines / sentences and checks only the
+chunks it has not seen before, several at a time; results are cached per
+chunk by a hash of its text (GRAMMAR_CACHE_MB, memory only), so re-checking
+an edited resume only sends the changed lines. Rules that look across
+sentence boundaries are given up for that.
+
+Backends are picked with GRAMMAR_BACKEND: "languagetool" (default) or
+"stub", a small rule-based checker that needs neither Java nor the network,
+for tests and local development.
+"""
+import atexit
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from concurrent.futures import TimeoutError as FuturesTimeout
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from utils.parse_cache import ParseCache, content_key
+
+BACKEND_ENV = "GRAMMAR_BACKEND"
+BACKEND_LANGUAGETOOL = "languagetool"
+BACKEND_STUB = "stub"
+
+DEFAULT_LANGUAGE = "en-US"
+DEFAULT_WORKERS = int(os.getenv("GRAMMAR_WORKERS", "2") or 2)
+DEFAULT_QUEUE_SIZE = int(os.getenv("GRAMMAR_QUEUE_SIZE", "32") or 32)
+# seconds a caller waits for its check (the first one includes the JVM start)
+DEFAULT_TIMEOUT = 60.0
+
+# Chunk result cache; bump CHUNK_CACHE_VERSION when chunking changes results
+CHUNK_CACHE_MB = float(os.getenv("GRAMMAR_CACHE_MB", "8") or 0)
+CHUNK_CACHE_VERSION = "1"
+
+HEALTH_INTERVAL = 30.0
+RESTART_BACKOFF = 30.0
+PROBE_TEXT = "This is a short sentence."
+
+# Errors from a check that mean the backend itself broke and is restarted:
+# OSError covers dropped connections, timeouts and requests' exceptions.
+# Backends may list more in a `failures` attribute.
+BACKEND_ERRORS: Tuple[type, ...] = (OSError,)
+
+# shutdown() returns within SHUTDOWN_TIMEOUT seconds even if a worker is stuck
+# in a backend call; idle workers notice the stop flag every WORKER_POLL seconds
+SHUTDOWN_TIMEOUT = 5.0
+WORKER_POLL = 0.5
+
+
+@dataclass(frozen=True)
+class GrammarIssue:
+    """One problem found in the checked text; offset / length index into it."""
+    message: str
+    replacements: Tuple[str, ...]
+    offset: int
+    length: int
+    rule_id: str = ""
+
+
+class GrammarServiceBusy(RuntimeError):
+    """The request queue is full."""
+
+
+class GrammarServiceUnavailable(RuntimeError):
+    """The backend could not be started (and is in its restart backoff)."""
+
+
+# -----------------------
+# Chunking
+# -----------------------
+_LINE = re.compile(r"[^\n]+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def split_chunks(text: str) -> List[Tuple[int, str]]:
+    """
+    (offset, chunk) for every sentence of every non-blank line (bullets are
+    lines), stripped of surrounding whitespace; offset is where the chunk
+    starts in text.
+    """
+    chunks = []
+
+    def add(start, end):
+        piece = text[start:end]
+        stripped = piece.strip()
+        if stripped:
+            chunks.append((start + len(piece) - len(piece.lstrip()), stripped))
+
+    for line in _LINE.finditer(text):
+        pos = line.start()
+        for end in _SENTENCE_END.finditer(text, line.start(), line.end()):
+            add(pos, end.start())
+            pos = end.end()
+        add(pos, line.end())
+    return chunks
+
+
+# -----------------------
+# Backends
+# -----------------------
+class LanguageToolBackend:
+    """A local LanguageTool server via language_tool_python (needs Java)."""
+    name = BACKEND_LANGUAGETOOL
+
+    def __init__(self, language: str = DEFAULT_LANGUAGE):
+        import language_tool_python  # optional: only this backend needs it
+        from language_tool_python.exceptions import JavaError, ServerError
+        self.failures = BACKEND_ERRORS + (JavaError, ServerError)
+        self._tool = language_tool_python.LanguageTool(language)
+
+    def check(self, text: str) -> List[GrammarIssue]:
+        issues = []
+        for m in self._tool.check(text):
+            # attribute names differ between language_tool_python releases
+            issues.append(GrammarIssue(
+                message=m.message,
+                replacements=tuple(m.replacements),
+                offset=m.offset,
+                length=getattr(m, "error_length", getattr(m, "errorLength", 0)),
+                rule_id=getattr(m, "rule_id", getattr(m, "ruleId", "")),
+            ))
+        return issues
+
+    def close(self):
+        self._tool.close()
+
+
+_STUB_RULES = (
+    (re.compile(r"\b(\w+)\s+(\1)\b", re.I), "ENGLISH_WORD_REPEAT_RULE",
+     "Possible typo: you repeated a word", lambda m: m.group(1)),
+    (re.compile(r"(?<![\w'])i(?![\w'])"), "I_LOWERCASE",
+     "The personal pronoun 'I' should be uppercase", lambda m: "I"),
+    (re.compile(r"(?<=\S) {2,}(?=\S)"), "WHITESPACE_RULE",
+     "Possible typo: you repeated a whitespace", lambda m: " "),
+)
+
+
+class StubBackend:
+    """Rule-based stand-in with LanguageTool-style rule ids; no Java needed."""
+    name = BACKEND_STUB
+
+    def __init__(self, language: str = DEFAULT_LANGUAGE):
+        self.language = language
+
+    def check(self, text: str) -> List[GrammarIssue]:
+        issues = []
+        for pattern, rule_id, message, replacement in _STUB_RULES:
+            for m in pattern.finditer(text):
+                issues.append(GrammarIssue(message, (replacement(m),), m.start(), m.end() - m.start(), rule_id))
+        issues.sort(key=lambda issue: issue.offset)
+        return issues
+
+    def close(self):
+        pass
+
+
+BACKENDS = {BACKEND_LANGUAGETOOL: LanguageToolBackend, BACKEND_STUB: StubBackend}
+
+
+def backend_from_env():
+    """Backend class named by GRAMMAR_BACKEND, instantiated."""
+    name = os.getenv(BACKEND_ENV, BACKEND_LANGUAGETOOL).strip().lower() or BACKEND_LANGUAGETOOL
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown {BACKEND_ENV} {name!r}; expected one of {', '.join(BACKENDS)}")
+    return BACKENDS[name]()
+
+
+# -----------------------
+# Service
+# -----------------------
+class GrammarService:
+    """
+    One lazily started backend shared by all callers through a bounded queue.
+    backend_factory builds a backend (default: from GRAMMAR_BACKEND).
+    """
+
+    def __init__(self, backend_factory: Optional[Callable] = None, workers: int = DEFAULT_WORKERS,
+                 queue_size: int = DEFAULT_QUEUE_SIZE, health_interval: float = HEALTH_INTERVAL,
+                 restart_backoff: float = RESTART_BACKOFF):
+        self._factory = backend_factory or backend_from_env
+        self._chunk_cache = ParseCache(max_bytes=int(CHUNK_CACHE_MB * 1024 * 1024))
+        self._queue = queue.Queue(maxsize=max(1, queue_size))
+        self._workers = max(1, workers)
+        self._threads = []
+        self._backend = None
+        self._lock = threading.Lock()  # backend lifecycle and thread start-up
+        self._last_ok = 0.0
+        self._start_failed_at = None
+        self._closed = False
+        self._stop = threading.Event()
+        self.health_interval = health_interval
+        self.restart_backoff = restart_backoff
+
+        # counters
+        self.served = 0
+        self.failures = 0
+        self.restarts = 0
+        self.last_error = None
+
+    # -----------------------
+    # Public API
+    # -----------------------
+    def check(self, text: str, timeout: Optional[float] = DEFAULT_TIMEOUT) -> List[GrammarIssue]:
+        """
+        Check text and wait for the result. Raises GrammarServiceBusy when the
+        queue is full, GrammarServiceUnavailable when no backend can be
+        started, and concurrent.futures.TimeoutError after timeout seconds
+        (the request is dropped if it has not started yet).
+        """
+        fut = self.submit(text)
+        try:
+            return fut.result(timeout)
+        except FuturesTimeout:
+            fut.cancel()
+            raise
+
+    def submit(self, text: str) -> Future:
+        """Queue a check without waiting; the Future resolves to a list of GrammarIssue."""
+        if self._closed:
+            raise RuntimeError("Grammar service is shut down")
+        self._start_workers()
+        fut = Future()
+        try:
+            self._queue.put_nowait((text, fut))
+        except queue.Full:
+            raise GrammarServiceBusy("Grammar service queue is full, try again shortly") from None
+        return fut
+
+    def check_document(self, text: str, timeout: Optional[float] = DEFAULT_TIMEOUT) -> List[GrammarIssue]:
+        """
+        Check text chunk by chunk (see split_chunks): cached chunks are not
+        sent again, identical chunks are checked once, and the rest are
+        checked concurrently. Issues come back in text order with offsets
+        into text. Raises like check().
+        """
+        chunks = split_chunks(text)
+        results: Dict[str, Tuple[GrammarIssue, ...]] = {}
+        todo = []
+        for _, chunk in chunks:
+            if chunk in results:
+                continue
+            cached = self._chunk_cache.get(self._chunk_key(chunk))
+            results[chunk] = cached
+            if cached is None:
+                todo.append(chunk)
+        self._check_chunks(todo, results, timeout)
+
+        issues = []
+        for offset, chunk in chunks:
+            issues.extend(replace(issue, offset=issue.offset + offset) for issue in results[chunk])
+        return issues
+
+    def warm_up(self) -> Future:
+        """Start the backend in the background (e.g. at app start-up)."""
+        return self.submit(PROBE_TEXT)
+
+    def health(self) -> dict:
+        """Service state, probing the backend now if it is running."""
+        with self._lock:
+            healthy = self._backend is not None and self._probe()
+            return {
+                "backend": getattr(self._backend, "name", None),
+                "running": self._backend is not None,
+                "healthy": healthy,
+                "queued": self._queue.qsize(),
+                "served": self.served,
+                "failures": self.failures,
+                "restarts": self.restarts,
+                "last_error": self.last_error,
+                "chunk_cache_hits": self._chunk_cache.memory_hits,
+                "chunk_cache_misses": self._chunk_cache.misses,
+            }
+
+    def shutdown(self, timeout: float = SHUTDOWN_TIMEOUT):
+        """
+        Stop the workers, cancel queued checks and close the backend, taking
+        at most about timeout seconds: a worker stuck in a long backend call
+        is left behind (it is a daemon thread).
+        """
+        deadline = time.monotonic() + timeout
+        self._closed = True
+        self._stop.set()
+        while True:
+            try:
+                _, fut = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if fut is not None:
+                fut.cancel()
+        for _ in self._threads:
+            try:
+                self._queue.put_nowait((None, None))  # wake idle workers now
+            except queue.Full:
+                break
+        for t in self._threads:
+            t.join(timeout=max(0.0, deadline - time.monotonic()))
+        self._threads = []
+        # a stuck worker may hold the lock; close the backend without it then
+        locked = self._lock.acquire(timeout=max(0.0, deadline - time.monotonic()))
+        try:
+            self._close_backend()
+        finally:
+            if locked:
+                self._lock.release()
+
+    # -----------------------
+    # Chunked checks
+    # -----------------------
+    @staticmethod
+    def _chunk_key(chunk: str) -> str:
+        return content_key(chunk.encode("utf-8"), CHUNK_CACHE_VERSION)
+
+    def _check_chunks(self, todo: List[str], results: dict, timeout: Optional[float]):
+        """
+        Check chunks through the queue, at most two per worker in flight so a
+        long resume cannot take every queue slot from other sessions.
+        """
+        pending = deque(todo)
+        in_flight = {}
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            while pending or in_flight:
+                while pending and len(in_flight) < 2 * self._workers:
+                    try:
+                        fut = self.submit(pending[0])
+                    except GrammarServiceBusy:
+                        if not in_flight:
+                            raise
+                        break  # wait for one of ours to finish first
+                    in_flight[fut] = pending.popleft()
+                remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+                done, _ = wait(in_flight, timeout=remaining, return_when=FIRST_COMPLETED)
+                if not done:
+                    raise FuturesTimeout()
+                for fut in done:
+                    chunk = in_flight.pop(fut)
+                    issues = tuple(fut.result())
+                    results[chunk] = issues
+                    self._chunk_cache.put(self._chunk_key(chunk), issues)
+        finally:
+            for fut in in_flight:
+                fut.cancel()
+
+    # -----------------------
+    # Workers
+    # -----------------------
+    def _start_workers(self):
+        if self._threads:
+            return
+        with self._lock:
+            if not self._threads:
+                for i in range(self._workers):
+                    t = threading.Thread(target=self._work, name=f"grammar-{i}", daemon=True)
+                    t.start()
+                    self._threads.append(t)
+
+    def _work(self):
+        while not self._stop.is_set():
+            try:
+                text, fut = self._queue.get(timeout=WORKER_POLL)
+            except queue.Empty:
+                continue
+            if fut is None:
+                return
+            if self._stop.is_set():
+                fut.cancel()
+                return
+            if not fut.set_running_or_notify_cancel():
+                continue  # the caller gave up waiting
+            try:
+                issues = self._run(text)
+            except Exception as e:
+                self.failures += 1
+                fut.set_exception(e)
+            else:
+                self.served += 1
+                fut.set_result(issues)
+
+    def _run(self, text: str) -> List[GrammarIssue]:
+        backend = self._ensure_backend()
+        try:
+            issues = backend.check(text)
+        except getattr(backend, "failures", BACKEND_ERRORS) as e:
+            # the server may have died under us: restart and retry once
+            self._restart(backend, e)
+            issues = self._ensure_backend().check(text)
+        self._last_ok = time.monotonic()
+        return issues
+
+    # -----------------------
+    # Backend lifecycle
+    # -----------------------
+    def _ensure_backend(self):
+        with self._lock:
+            if self._backend is not None and time.monotonic() - self._last_ok > self.health_interval:
+                if not self._probe():
+                    self.restarts += 1
+                    self._close_backend()
+            if self._backend is None:
+                if self._start_failed_at is not None \
+                        and time.monotonic() - self._start_failed_at < self.restart_backoff:
+                    raise GrammarServiceUnavailable(f"Grammar backend unavailable: {self.last_error}")
+                try:
+                    self._backend = self._factory()
+                except Exception as e:
+                    self._start_failed_at = time.monotonic()
+                    self.last_error = f"{type(e).__name__}: {e}"
+                    raise GrammarServiceUnavailable(f"Grammar backend failed to start: {e}") from e
+                self._start_failed_at = None
+                self._last_ok = time.monotonic()
+            return self._backend
+
+    def _probe(self) -> bool:
+        """Check a known sentence on the running backend (caller holds the lock)."""
+        try:
+            self._backend.check(PROBE_TEXT)
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            return False
+        self._last_ok = time.monotonic()
+        return True
+
+    def _restart(self, backend, error: Exception):
+        with self._lock:
+            self.last_error = f"{type(error).__name__}: {error}"
+            if self._backend is backend:  # another worker may have restarted it already
+                self.restarts += 1
+                self._close_backend()
+
+    def _close_backend(self):
+        backend, self._backend = self._backend, None
+        if backend is not None:
+            try:
+                backend.close()
+            except Exception:
+                pass
+
+
+# -----------------------
+# Process-wide instance
+# -----------------------
+_SERVICE = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def get_grammar_service() -> GrammarService:
+    """Return the shared service, configured from the environment on first use."""
+    global _SERVICE
+    if _SERVICE is None:
+        with _SERVICE_LOCK:
+            if _SERVICE is None:
+                _SERVICE = GrammarService()
+                atexit.register(_SERVICE.shutdown)
+    return _SERVICE
+
+
+def set_grammar_service(service: Optional[GrammarService]) -> None:
+    """Replace the shared service (None builds a new one from the environment on next use)."""
+    global _SERVICE
+    with _SERVICE_LOCK:
+        _SERVICE = service
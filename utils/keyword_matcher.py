@@ -0,0 +1,72 @@
+# utils/keyword_matcher.py
+"""
+Aho-Corasick keyword matcher.
+
+Compiles a fixed set of keywords into one automaton, so a single scan of a
+text reports every keyword that occurs in it, however many keywords there
+are. Matching is plain substring matching, exactly like `keyword in text`
+for each keyword (overlapping and nested keywords such as "java" and
+"javascript" are both reported); callers lowercase text and keywords
+themselves.
+
+The goto / failure function is flattened into a transition table at build
+time, so the scan is one dict lookup per character with no failure-link
+walking.
+"""
+from collections import deque
+from typing import FrozenSet, Iterable, List, Set, Tuple
+
+
+class KeywordMatcher:
+    """Finds which of a fixed set of keywords occur in a text."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: Tuple[str, ...] = tuple(dict.fromkeys(k for k in keywords if k))
+
+        # trie
+        goto: List[dict] = [{}]
+        out: List[Set[str]] = [set()]
+        for keyword in self.keywords:
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append(set())
+                state = nxt
+            out[state].add(keyword)
+
+        # failure links in BFS order (the root's children fail to the root);
+        # each state's table is completed with its failure state's, which is
+        # shallower and so already complete
+        delta = [dict(g) for g in goto]
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in goto[state].items():
+                fail[child] = delta[fail[state]].get(ch, 0)
+                out[child] |= out[fail[child]]
+                queue.append(child)
+            for ch, target in delta[fail[state]].items():
+                delta[state].setdefault(ch, target)
+
+        self._delta = delta
+        self._out: List[FrozenSet[str]] = [frozenset(o) for o in out]
+
+    @property
+    def states(self) -> int:
+        return len(self._delta)
+
+    def find(self, text: str) -> Set[str]:
+        """Keywords occurring in text, in one pass over it."""
+        delta, out = self._delta, self._out
+        state = 0
+        found: Set[str] = set()
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return found
@@ -0,0 +1,251 @@
+# utils/layout.py
+"""
+Block layout: reading order + merging of PyMuPDF text blocks.
+
+Two strategies, selectable per parse (parse_resume(..., layout=...)):
+
+  legacy   sort every block by (page, y, x) and merge each block into the
+           previous one when it sits right below it. Two-column resumes come
+           out interleaved line by line.
+  columns  column-aware; works on text lines rather than PyMuPDF blocks,
+           which happily group both columns of a row. A sweep line over the
+           x-intervals of the narrower lines finds the columns of a page;
+           lines crossing a gutter (name header, full-width summary) cut the
+           page into bands, and inside a band the columns are read left to
+           right, each top to bottom. A sparse column sitting on its left
+           neighbour's rows (right-aligned dates) is treated as part of it.
+
+Both run in O(n log n) per page (the column pass sorts the row positions of
+all lines once and finds row neighbours with a sliding window) and share the
+same merge rule, which joins consecutive lines of a column back into
+paragraphs.
+"""
+import os
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, deque
+from dataclasses import replace
+from typing import List, Optional, Tuple
+
+from utils.parsed_resume import Block
+
+LAYOUT_LEGACY = "legacy"
+LAYOUT_COLUMNS = "columns"
+LAYOUTS = (LAYOUT_LEGACY, LAYOUT_COLUMNS)
+
+# Default strategy when a caller does not pick one
+DEFAULT_LAYOUT = os.environ.get("RESUME_PARSER_LAYOUT", LAYOUT_LEGACY)
+
+# Merge rule: next block starts less than this far below the previous one...
+MERGE_MAX_Y_GAP = 18
+# ...and its left edge is within this distance
+MERGE_MAX_X_DIFF = 30
+
+# Blocks at least this wide (fraction of the page's text width) are left out
+# of column detection
+SPAN_WIDTH_RATIO = 0.6
+# x-intervals closer than this (points) belong to the same column
+COLUMN_GAP = 2.0
+# Blocks whose tops are within this distance (points) sit on the same row
+ROW_TOLERANCE = 3.0
+# A cluster with at most this share of its left neighbour's block count, and
+# at least this share of its blocks on the neighbour's rows, is a row-aligned
+# companion (role | dates), not an independent column
+ROW_ALIGNED_RATIO = 0.5
+
+
+def check_layout(layout: str) -> str:
+    """Validate a layout name"""
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {layout!r}; expected one of {', '.join(LAYOUTS)}")
+    return layout
+
+
+def _reading_key(b: Block):
+    return (b.page, round(b.bbox[1]), round(b.bbox[0]))
+
+
+def _merge_in_order(blocks: List[Block], groups: Optional[List[int]] = None) -> List[Block]:
+    """
+    Join each block into the previous one when it continues it. With
+    groups (a column id per block), a block on the same row as, and to the
+    right of, the block before it in the same column (role ... dates) is
+    joined as well.
+    """
+    merged = []
+    prev = None
+    for i, b in enumerate(blocks):
+        if not merged:
+            merged.append(replace(b))
+            prev = b
+            continue
+        last = merged[-1]
+        # vertical gap
+        y_gap = b.bbox[1] - last.bbox[3]
+        x_diff = abs(b.bbox[0] - last.bbox[0])
+        same_row = groups is not None and groups[i] == groups[i - 1] \
+            and abs(b.bbox[1] - prev.bbox[1]) <= ROW_TOLERANCE and b.bbox[0] >= prev.bbox[2]
+        # if close vertically and near same x, join as same paragraph line
+        if (0 <= y_gap < MERGE_MAX_Y_GAP and x_diff < MERGE_MAX_X_DIFF) or same_row:
+            last.text = (last.text.rstrip() + ' ' + b.text.lstrip()).strip()
+            last.bbox = (
+                min(last.bbox[0], b.bbox[0]),
+                min(last.bbox[1], b.bbox[1]),
+                max(last.bbox[2], b.bbox[2]),
+                max(last.bbox[3], b.bbox[3]),
+            )
+        else:
+            merged.append(replace(b))
+        prev = b
+    return merged
+
+
+# -----------------------
+# Column-aware ordering
+# -----------------------
+def _x_clusters(blocks: List[Block]) -> List[List[Block]]:
+    """Sweep over x-intervals sorted by left edge; overlapping intervals form one cluster."""
+    clusters = []
+    end = None
+    for b in sorted(blocks, key=lambda b: b.bbox[0]):
+        if end is None or b.bbox[0] > end + COLUMN_GAP:
+            clusters.append([b])
+            end = b.bbox[2]
+        else:
+            clusters[-1].append(b)
+            end = max(end, b.bbox[2])
+    return clusters
+
+
+def _earliest_on_row(clusters: List[List[Block]]) -> List[List[int]]:
+    """
+    For every block of every cluster, the index of the first cluster with a
+    block on its row (tops within ROW_TOLERANCE, the block itself included).
+    One sort of all tops, then a sliding-window minimum over them.
+    """
+    tops = sorted((b.bbox[1], c, i) for c, cluster in enumerate(clusters) for i, b in enumerate(cluster))
+    earliest = [[c] * len(cluster) for c, cluster in enumerate(clusters)]
+    window = deque()  # positions in tops inside the row window, cluster index increasing
+    end = 0
+    for y, c, i in tops:
+        while end < len(tops) and tops[end][0] <= y + ROW_TOLERANCE:
+            while window and tops[window[-1]][1] >= tops[end][1]:
+                window.pop()
+            window.append(end)
+            end += 1
+        while tops[window[0]][0] < y - ROW_TOLERANCE:
+            window.popleft()
+        earliest[c][i] = tops[window[0]][1]
+    return earliest
+
+
+def _row_aligned(index: int, earliest: List[int], column_size: int) -> bool:
+    """
+    True when cluster `index`, whose blocks have the given earliest clusters
+    on their rows, is a sparse companion of the column to its left
+    (right-aligned dates, locations) rather than a text column: it has far
+    fewer blocks than that column, and most of them sit on a row of the
+    content to its left.
+    """
+    if len(earliest) > ROW_ALIGNED_RATIO * column_size:
+        return False
+    aligned = sum(1 for e in earliest if e < index)
+    return aligned >= ROW_ALIGNED_RATIO * len(earliest)
+
+
+def _columns(blocks: List[Block], span_width: float) -> List[List[float]]:
+    """
+    Column x-intervals of a page. Only blocks narrower than span_width take
+    part, so headers and full-width lines cannot bridge the gutter. A cluster
+    only starts a new column when it sits beside the content to its left;
+    clusters above / below it (footers) or row-aligned with it (dates) are
+    folded into the previous column.
+    """
+    columns = []
+    sizes = []
+    top, bottom = float("inf"), float("-inf")
+    clusters = _x_clusters([b for b in blocks if b.bbox[2] - b.bbox[0] < span_width])
+    rows = _earliest_on_row(clusters)
+    for index, cluster in enumerate(clusters):
+        c_top = min(b.bbox[1] for b in cluster)
+        c_bottom = max(b.bbox[3] for b in cluster)
+        x0 = min(b.bbox[0] for b in cluster)
+        x1 = max(b.bbox[2] for b in cluster)
+        beside = c_top < bottom and c_bottom > top
+        if columns and (not beside or _row_aligned(index, rows[index], sizes[-1])):
+            columns[-1][1] = max(columns[-1][1], x1)
+            sizes[-1] += len(cluster)
+        else:
+            columns.append([x0, x1])
+            sizes.append(len(cluster))
+        top, bottom = min(top, c_top), max(bottom, c_bottom)
+    return columns
+
+
+def _page_order(blocks: List[Block]) -> Tuple[List[Block], List[int]]:
+    """
+    Reading order of one page, plus a column id per block (unique per band
+    and column). Blocks crossing a gutter cut the page into bands; inside a
+    band each column is read top to bottom, left to right.
+    """
+    blocks = sorted(blocks, key=_reading_key)
+    left = min(b.bbox[0] for b in blocks)
+    right = max(b.bbox[2] for b in blocks)
+    columns = _columns(blocks, SPAN_WIDTH_RATIO * (right - left))
+    if len(columns) < 2:
+        return blocks, [0] * len(blocks)
+
+    starts = [c[0] for c in columns]
+    ends = [c[1] for c in columns]
+    ordered = []
+    groups = []
+    band = [[] for _ in columns]
+
+    def emit(column):
+        group = groups[-1] + 1 if groups else 0
+        groups.extend([group] * len(column))
+        ordered.extend(column)
+
+    def close_band():
+        for column in band:
+            emit(column)
+            column.clear()
+
+    for b in blocks:
+        x0, _, x1, _ = b.bbox
+        first = bisect_right(ends, x0)        # first column ending after x0
+        last = bisect_left(starts, x1) - 1    # last column starting before x1
+        if first < last:
+            # crosses a gutter: close the band
+            close_band()
+            emit([b])
+        else:
+            # inside one column (or in a gutter: take the nearest one to the right)
+            band[min(first, len(columns) - 1)].append(b)
+    close_band()
+    return ordered, groups
+
+
+# -----------------------
+# Public API
+# -----------------------
+def merge_blocks(blocks: List[Block], layout: str = LAYOUT_LEGACY) -> List[Block]:
+    """
+    Order and merge text blocks with the given layout strategy.
+    Blocks are utils.parsed_resume.Block objects; bbox is (x0, y0, x1, y1).
+    """
+    if not blocks:
+        return blocks
+    if check_layout(layout) == LAYOUT_LEGACY:
+        return _merge_in_order(sorted(blocks, key=_reading_key))
+
+    pages = defaultdict(list)
+    for b in blocks:
+        pages[b.page].append(b)
+    ordered = []
+    groups = []
+    for page in sorted(pages):
+        page_blocks, page_groups = _page_order(pages[page])
+        offset = groups[-1] + 1 if groups else 0
+        ordered.extend(page_blocks)
+        groups.extend(g + offset for g in page_groups)
+    return _merge_in_order(ordered, groups)
@@ -0,0 +1,425 @@
+# utils/model_artifacts.py
+"""
+Role classifier artifacts: fast loading, prewarm and failure backoff.
+
+The classifier is a TF-IDF vectorizer plus a multinomial Naive Bayes model,
+trained by scripts/train_model.py and pickled to models/. Besides the
+pickles, the fitted arrays are exported to models/resume_classifier/:
+
+  feature_log_prob.npy   classes x features, float64
+  class_log_prior.npy    classes
+  idf.npy                features
+  vocabulary.npy         features, the term of each column (not for
+                         hashing vectorizers: columns are term hashes)
+  classes.npy            classes, the label of each row
+  manifest.json          format, shapes, vectorizer parameters, stop words
+
+Inference from the export is NBPredictor: the vectorizer's word analyzer,
+TF-IDF weighting and the NB argmax in plain Python and NumPy, computed in
+the same order as scikit-learn so predictions are identical. Serving a
+prediction imports neither scikit-learn, scipy nor pandas.
+
+The arrays are opened with np.load(mmap_mode="r"): pages are read on first
+touch and shared between processes through the page cache, and nothing is
+unpickled. The manifest records the SHA-256 of the pickles it was exported
+from; the pickles are only loaded when the export is missing or their
+digests no longer match (the export is then refreshed, if models/ is
+writable). File times are not used, so a checkout or copy that touches the
+pickles does not make the export look stale.
+
+All paths are relative to the package, not the working directory. A failed
+load is remembered for FAILURE_BACKOFF seconds, so a missing or broken model
+costs one attempt per backoff period instead of one per prediction.
+prewarm() starts the load in a background thread at app start, so the first
+prediction does not pay for it.
+"""
+import hashlib
+import json
+import os
+import pickle
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+MODELS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
+MODEL_PATH = os.path.join(MODELS_DIR, "resume_classifier.pkl")
+VECTORIZER_PATH = os.path.join(MODELS_DIR, "tfidf_vectorizer.pkl")
+ARRAYS_DIR = os.path.join(MODELS_DIR, "resume_classifier")
+
+FORMAT_VERSION = 2
+MANIFEST = "manifest.json"
+
+# Seconds before a failed load is attempted again
+FAILURE_BACKOFF = 60.0
+
+# Hashed terms remembered by NBPredictor for hashing exports
+HASH_CACHE_SIZE = 200_000
+
+# Vectorizer parameters that are set from the export instead of stored
+_DERIVED_PARAMS = ("vocabulary", "dtype")
+
+
+# -----------------------
+# Export
+# -----------------------
+def _save_atomic(path: str, write) -> None:
+    tmp = f"{path}.tmp{os.getpid()}"
+    try:
+        with open(tmp, "wb") as f:
+            write(f)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _vectorizer_parts(vectorizer):
+    """
+    (kind, tokenizing step, weighting step) of a TfidfVectorizer ("tfidf")
+    or of a HashingVectorizer -> TfidfTransformer pipeline ("hashing", as
+    trained by train_model.py --streaming).
+    """
+    steps = getattr(vectorizer, "steps", None)
+    if steps is None:
+        return "tfidf", vectorizer, vectorizer
+    if len(steps) != 2 or not hasattr(steps[0][1], "n_features") or not hasattr(steps[1][1], "sublinear_tf"):
+        raise ValueError("Only HashingVectorizer -> TfidfTransformer pipelines can be exported")
+    return "hashing", steps[0][1], steps[1][1]
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def export_arrays(clf, tfidf, out_dir: str = ARRAYS_DIR, sources: Optional[Dict[str, str]] = None) -> str:
+    """
+    Write the fitted arrays of clf / tfidf to out_dir. The manifest is
+    written last, so a reader never sees it next to half-written arrays.
+    sources: {"model": path, "vectorizer": path} of the pickles clf / tfidf
+    were saved to; their SHA-256 goes into the manifest so loaders can tell
+    whether the export is current.
+    Raises ValueError for vectorizers that cannot be rebuilt from arrays
+    (custom callables).
+    """
+    kind, tokens, weighting = _vectorizer_parts(tfidf)
+    params = {k: v for k, v in tokens.get_params().items() if k not in _DERIVED_PARAMS}
+    if any(callable(v) for v in params.values()):
+        raise ValueError("Vectorizers with a custom tokenizer, preprocessor or analyzer cannot be exported")
+    stop_words = tokens.get_stop_words()
+    params["stop_words"] = sorted(stop_words) if stop_words else None
+
+    arrays = {
+        "feature_log_prob": np.ascontiguousarray(clf.feature_log_prob_, dtype=np.float64),
+        "class_log_prior": np.ascontiguousarray(clf.class_log_prior_, dtype=np.float64),
+        "classes": np.array(clf.classes_, dtype=str),
+    }
+    if kind == "hashing":
+        if params["norm"] is not None:
+            raise ValueError("The hashing step must not normalize (norm=None); the weighting step does")
+        n_features = tokens.n_features
+        params.update(norm=weighting.norm, use_idf=weighting.use_idf, smooth_idf=weighting.smooth_idf,
+                      sublinear_tf=weighting.sublinear_tf)
+    else:
+        terms = sorted(tfidf.vocabulary_, key=tfidf.vocabulary_.get)
+        n_features = len(terms)
+        arrays["vocabulary"] = np.array(terms, dtype=str)
+    # unused (all ones) when the vectorizer does not weight by idf
+    arrays["idf"] = np.ascontiguousarray(weighting.idf_ if weighting.use_idf else np.ones(n_features),
+                                         dtype=np.float64)
+
+    os.makedirs(out_dir, exist_ok=True)
+    for name, array in arrays.items():
+        _save_atomic(os.path.join(out_dir, f"{name}.npy"), lambda f, a=array: np.save(f, a, allow_pickle=False))
+
+    manifest = {
+        "format": FORMAT_VERSION,
+        "classifier": type(clf).__name__,
+        "vectorizer": kind,
+        "n_classes": len(arrays["classes"]),
+        "n_features": n_features,
+        "dtype": np.dtype(tokens.dtype).name,
+        "vectorizer_params": params,
+        "sources": {name: file_sha256(path) for name, path in (sources or {}).items()},
+    }
+    _save_atomic(os.path.join(out_dir, MANIFEST),
+                 lambda f: f.write(json.dumps(manifest, indent=2).encode("utf-8")))
+    return out_dir
+
+
+def murmurhash3_32(data: bytes, seed: int = 0) -> int:
+    """Signed 32-bit MurmurHash3 (x86), as sklearn.utils.murmurhash3_32 computes it."""
+    mask = 0xFFFFFFFF
+    h = seed & mask
+    length = len(data)
+    body = length - length % 4
+    for i in range(0, body, 4):
+        k = int.from_bytes(data[i:i + 4], "little")
+        k = (k * 0xCC9E2D51) & mask
+        k = ((k << 15) | (k >> 17)) & mask
+        h ^= (k * 0x1B873593) & mask
+        h = ((h << 13) | (h >> 19)) & mask
+        h = (h * 5 + 0xE6546B64) & mask
+    tail = data[body:]
+    if tail:
+        k = int.from_bytes(tail, "little")
+        k = (k * 0xCC9E2D51) & mask
+        k = ((k << 15) | (k >> 17)) & mask
+        h ^= (k * 0x1B873593) & mask
+    h ^= length
+    h ^= h >> 16
+    h = (h * 0x85EBCA6B) & mask
+    h ^= h >> 13
+    h = (h * 0xC2B2AE35) & mask
+    h ^= h >> 16
+    return h - (1 << 32) if h & 0x80000000 else h
+
+
+# -----------------------
+# Load
+# -----------------------
+class NBPredictor:
+    """
+    TF-IDF + multinomial NB inference on the exported arrays, without
+    scikit-learn. Mirrors TfidfVectorizer(analyzer="word").transform (or a
+    HashingVectorizer -> TfidfTransformer pipeline) and MultinomialNB.predict
+    step by step, including the order of the float operations (sorted
+    columns, sequential sums), so it returns the same labels as the pipeline
+    it was exported from.
+    """
+
+    def __init__(self, arrays_dir: str = ARRAYS_DIR, mmap: bool = True):
+        with open(os.path.join(arrays_dir, MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != FORMAT_VERSION or manifest.get("classifier") != "MultinomialNB":
+            raise ValueError(f"Unsupported model export in {arrays_dir}")
+        params = manifest["vectorizer_params"]
+        hashing = manifest.get("vectorizer", "tfidf") == "hashing"
+        if (params["analyzer"] != "word" or params["strip_accents"] is not None or params["input"] != "content"
+                or manifest["dtype"] != "float64" or params["norm"] not in ("l1", "l2", None)
+                or (hashing and params["alternate_sign"])):
+            raise ValueError(f"Model export in {arrays_dir} needs scikit-learn to run")
+
+        mode = "r" if mmap else None
+        names = ("feature_log_prob", "class_log_prior", "idf", "classes") + (() if hashing else ("vocabulary",))
+        arrays = {name: np.load(os.path.join(arrays_dir, f"{name}.npy"), mmap_mode=mode, allow_pickle=False)
+                  for name in names}
+        n_classes, n_features = manifest["n_classes"], manifest["n_features"]
+        if (arrays["feature_log_prob"].shape != (n_classes, n_features) or len(arrays["idf"]) != n_features
+                or len(arrays.get("vocabulary", arrays["idf"])) != n_features or len(arrays["classes"]) != n_classes):
+            raise ValueError(f"Model export in {arrays_dir} does not match its manifest")
+
+        self.classes = arrays["classes"]
+        self.n_features = n_features
+        # term -> column: a lookup table, or the hashing trick (terms outside
+        # the table / feature space are simply not counted)
+        if hashing:
+            self.vocabulary = None
+            self._hash_cache: Dict[str, int] = {}
+        else:
+            self.vocabulary = {str(term): i for i, term in enumerate(arrays["vocabulary"])}
+        self.idf = arrays["idf"] if params["use_idf"] else None
+        self.feature_log_prob_t = arrays["feature_log_prob"].T  # features x classes, as sklearn multiplies
+        self.class_log_prior = arrays["class_log_prior"]
+        self.lowercase = params["lowercase"]
+        self.encoding, self.decode_error = params["encoding"], params["decode_error"]
+        self.token_pattern = re.compile(params["token_pattern"])
+        self.stop_words = frozenset(params["stop_words"] or ())
+        self.ngram_range = tuple(params["ngram_range"])
+        self.binary, self.sublinear_tf, self.norm = params["binary"], params["sublinear_tf"], params["norm"]
+
+    def analyze(self, doc) -> List[str]:
+        """The vectorizer's word analyzer: decode, lowercase, tokenize, stop words, n-grams."""
+        if isinstance(doc, bytes):
+            doc = doc.decode(self.encoding, self.decode_error)
+        if self.lowercase:
+            doc = doc.lower()
+        tokens = [w for w in self.token_pattern.findall(doc) if w not in self.stop_words]
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+        original = tokens
+        tokens = list(original) if min_n == 1 else []
+        for n in range(max(min_n, 2), min(max_n + 1, len(original) + 1)):
+            for i in range(len(original) - n + 1):
+                tokens.append(" ".join(original[i:i + n]))
+        return tokens
+
+    def _hashed_column(self, term: str) -> int:
+        # HashingVectorizer(alternate_sign=False): |murmurhash3_32(term)| mod n_features
+        column = self._hash_cache.get(term)
+        if column is None:
+            column = abs(murmurhash3_32(term.encode("utf-8"))) % self.n_features
+            if len(self._hash_cache) < HASH_CACHE_SIZE:
+                self._hash_cache[term] = column
+        return column
+
+    def transform_one(self, doc) -> Tuple[np.ndarray, np.ndarray]:
+        """(columns, weights) of one document's TF-IDF row, columns sorted."""
+        vocabulary = self.vocabulary
+        if vocabulary is None:
+            counts = Counter(self._hashed_column(t) for t in self.analyze(doc))
+        else:
+            counts = Counter(vocabulary[t] for t in self.analyze(doc) if t in vocabulary)
+        cols = np.array(sorted(counts), dtype=np.intp)
+        data = np.array([1.0 if self.binary else float(counts[c]) for c in cols.tolist()], dtype=np.float64)
+        if self.sublinear_tf:
+            np.log(data, data)
+            data += 1.0
+        if self.idf is not None:
+            data *= self.idf[cols]
+        if self.norm is not None and len(data):
+            # row norm as a sequential sum, like sklearn's inplace_csr_row_normalize_*
+            total = np.cumsum(np.abs(data) if self.norm == "l1" else data * data)[-1]
+            if total != 0.0:
+                data /= total if self.norm == "l1" else np.sqrt(total)
+        return cols, data
+
+    def joint_log_likelihood(self, docs: Iterable) -> np.ndarray:
+        """docs x classes; each row is sum(w * log P(term | class)) + log prior."""
+        rows = []
+        for doc in docs:
+            cols, data = self.transform_one(doc)
+            if len(cols):
+                # accumulated in column order, as a CSR x dense product does
+                rows.append(np.cumsum(data[:, None] * self.feature_log_prob_t[cols], axis=0)[-1])
+            else:
+                rows.append(np.zeros(len(self.classes)))
+        if not rows:
+            return np.empty((0, len(self.classes)))
+        return np.vstack(rows) + self.class_log_prior
+
+    def predict(self, docs: Iterable) -> np.ndarray:
+        return self.classes[np.argmax(self.joint_log_likelihood(docs), axis=1)]
+
+
+class SklearnPredictor:
+    """The pickled pipeline behind NBPredictor's interface (when it cannot be exported)."""
+
+    def __init__(self, clf, tfidf):
+        self.clf, self.tfidf = clf, tfidf
+
+    def predict(self, docs: Iterable) -> np.ndarray:
+        return self.clf.predict(self.tfidf.transform(list(docs)))
+
+
+def load_pickles(model_path: str = MODEL_PATH, vectorizer_path: str = VECTORIZER_PATH):
+    with open(model_path, "rb") as f:
+        clf = pickle.load(f)
+    with open(vectorizer_path, "rb") as f:
+        tfidf = pickle.load(f)
+    return clf, tfidf
+
+
+class ModelArtifacts:
+    """Loads the classifier once, from the array export when it is current."""
+
+    def __init__(self, model_path: str = MODEL_PATH, vectorizer_path: str = VECTORIZER_PATH,
+                 arrays_dir: str = ARRAYS_DIR, failure_backoff: float = FAILURE_BACKOFF):
+        self.model_path = model_path
+        self.vectorizer_path = vectorizer_path
+        self.arrays_dir = arrays_dir
+        self.failure_backoff = failure_backoff
+        self.source: Optional[str] = None  # "arrays" or "pickle" once loaded
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self.attempts = 0
+        self._predictor = None
+        self._failed_at = float("-inf")
+        self._lock = threading.Lock()
+        self._prewarm_thread: Optional[threading.Thread] = None
+
+    def _sources(self) -> Dict[str, str]:
+        return {"model": self.model_path, "vectorizer": self.vectorizer_path}
+
+    def _arrays_current(self) -> bool:
+        """The export exists and was made from the pickles as they are now (or they are gone)."""
+        try:
+            with open(os.path.join(self.arrays_dir, MANIFEST), encoding="utf-8") as f:
+                recorded = json.load(f).get("sources") or {}
+        except (OSError, ValueError):
+            return False
+        for name, path in self._sources().items():
+            try:
+                digest = file_sha256(path)
+            except FileNotFoundError:
+                continue  # nothing to compare with: serve the export
+            if recorded.get(name) != digest:
+                return False
+        return True
+
+    def _load(self):
+        if self._arrays_current():
+            try:
+                predictor = NBPredictor(self.arrays_dir)
+                self.source = "arrays"
+                return predictor
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Model export unusable, loading pickles: {e}")
+        clf, tfidf = load_pickles(self.model_path, self.vectorizer_path)
+        self.source = "pickle"
+        try:
+            export_arrays(clf, tfidf, out_dir=self.arrays_dir, sources=self._sources())
+            return NBPredictor(self.arrays_dir)
+        except (OSError, ValueError) as e:
+            print(f"Could not export model arrays: {e}")
+        return SklearnPredictor(clf, tfidf)
+
+    def get(self):
+        """The predictor (NBPredictor, or SklearnPredictor as a fallback), or None while unavailable."""
+        predictor = self._predictor
+        if predictor is not None:
+            return predictor
+        with self._lock:
+            if self._predictor is not None:
+                return self._predictor
+            if time.monotonic() - self._failed_at < self.failure_backoff:
+                return None
+            self.attempts += 1
+            started = time.perf_counter()
+            try:
+                self._predictor = self._load()
+            except Exception as e:
+                self._failed_at = time.monotonic()
+                self.error = f"{type(e).__name__}: {e}"
+                print(f"Error loading model: {e}")
+                return None
+            self.load_seconds = time.perf_counter() - started
+            self.error = None
+            return self._predictor
+
+    def prewarm(self) -> threading.Thread:
+        """Load in a daemon thread (once); callers arriving meanwhile wait for it."""
+        with self._lock:
+            if self._prewarm_thread is None:
+                self._prewarm_thread = threading.Thread(target=self.get, name="model-prewarm", daemon=True)
+                self._prewarm_thread.start()
+            return self._prewarm_thread
+
+    def reset(self) -> None:
+        """Forget the loaded model and any failure; the next get() loads again."""
+        with self._lock:
+            self._predictor = None
+            self._failed_at = float("-inf")
+            self._prewarm_thread = None
+
+
+_ARTIFACTS: Optional[ModelArtifacts] = None
+_ARTIFACTS_LOCK = threading.Lock()
+
+
+def get_model_artifacts() -> ModelArtifacts:
+    """Return the shared loader for the models/ artifacts."""
+    global _ARTIFACTS
+    if _ARTIFACTS is None:
+        with _ARTIFACTS_LOCK:
+            if _ARTIFACTS is None:
+                _ARTIFACTS = ModelArtifacts()
+    return _ARTIFACTS
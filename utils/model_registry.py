@@ -0,0 +1,407 @@
+# utils/model_registry.py
+"""
+Model registry over the runs scripts/train_model.py records.
+
+Every training run leaves models/run_{run_id}.json (accuracy, sample count,
+versioned artifact paths) next to its versioned pickles and array export.
+The registry lists those runs and serves the one named by the pointer file
+models/active_model.json:
+
+  {"run_id": "20250101_120000", "promoted_at": "2025-01-01T12:30:00"}
+
+Promoting a run rewrites the pointer atomically. Serving processes notice
+the new pointer (its mtime is checked at most every CHECK_INTERVAL seconds),
+load the run in the thread that noticed it while every other request keeps
+using the current model, then swap the reference in one assignment. A run
+that fails to load leaves the current model in service. Without a pointer
+the base artifacts (models/resume_classifier.pkl and its export) are served,
+as before; training never overwrites them, so a new run serves only once
+it is promoted.
+
+Every prediction is timed per model, and `bench` measures runs that are not
+serving traffic. Both summaries are saved to models/latency_{run_id}.json
+(serving ones at most every LATENCY_SAVE_INTERVAL seconds, last writing
+process wins), so `python -m utils.model_registry list` shows accuracy next
+to inference cost from any process:
+
+  {"serving": {"calls": ..., "mean_ms_per_doc": ..., "updated_at": ...},
+   "benchmark": {...}}
+
+Usage: python -m utils.model_registry {list,promote RUN_ID,bench [RUN_ID ...]}
+"""
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from utils.model_artifacts import MODELS_DIR, ModelArtifacts, get_model_artifacts
+
+POINTER = "active_model.json"
+
+# Key of the base artifacts in latency stats and listings
+BASE = "base"
+
+# Seconds between pointer mtime checks; 0 checks on every prediction
+CHECK_INTERVAL = 2.0
+
+# Per-document latencies kept per model for the percentiles
+LATENCY_WINDOW = 1000
+
+# Seconds between saves of a served model's latency summary
+LATENCY_SAVE_INTERVAL = 30.0
+
+
+class LatencyStats:
+    """Calls, documents and a window of recent per-document latencies of one model."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.calls = 0
+        self.docs = 0
+        self.seconds = 0.0
+        self._recent = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, docs: int) -> None:
+        with self._lock:
+            self.calls += 1
+            self.docs += docs
+            self.seconds += seconds
+            if docs:
+                self._recent.append(seconds / docs)
+
+    def summary(self) -> dict:
+        with self._lock:
+            recent = sorted(self._recent)
+            calls, docs, seconds = self.calls, self.docs, self.seconds
+
+        def pct(p):
+            return round(recent[min(len(recent) - 1, int(p * len(recent)))] * 1000, 3) if recent else None
+
+        return {
+            "calls": calls,
+            "docs": docs,
+            "mean_ms_per_doc": round(seconds / docs * 1000, 3) if docs else None,
+            "p50_ms_per_doc": pct(0.50),
+            "p95_ms_per_doc": pct(0.95),
+        }
+
+
+class TimedPredictor:
+    """A loaded model tagged with its run id; predict() records latency."""
+
+    def __init__(self, run_id: str, predictor, stats: LatencyStats, on_record: Optional[Callable[[], None]] = None):
+        self.run_id = run_id
+        self.predictor = predictor
+        self.stats = stats
+        self.on_record = on_record
+
+    def predict(self, docs: Iterable):
+        docs = list(docs)
+        started = time.perf_counter()
+        result = self.predictor.predict(docs)
+        self.stats.record(time.perf_counter() - started, len(docs))
+        if self.on_record is not None:
+            self.on_record()
+        return result
+
+
+class ModelRegistry:
+    """Lists training runs and serves the active one, hot-swapping on promotion."""
+
+    def __init__(self, models_dir: str = MODELS_DIR, check_interval: float = CHECK_INTERVAL,
+                 base: Optional[ModelArtifacts] = None):
+        self.models_dir = models_dir
+        self.pointer_path = os.path.join(models_dir, POINTER)
+        self.check_interval = check_interval
+        self.error: Optional[str] = None
+        self.swaps = 0
+        if base is None:
+            base = get_model_artifacts() if models_dir == MODELS_DIR else ModelArtifacts(
+                os.path.join(models_dir, "resume_classifier.pkl"),
+                os.path.join(models_dir, "tfidf_vectorizer.pkl"),
+                os.path.join(models_dir, "resume_classifier"))
+        self._base = base
+        self._loaders: Dict[str, ModelArtifacts] = {}
+        self._stats: Dict[str, LatencyStats] = {}        # serving, this process
+        self._bench_stats: Dict[str, LatencyStats] = {}  # benchmark(), this process
+        self._saved_at: Dict[str, float] = {}
+        self._latency_lock = threading.Lock()
+        self._active: Optional[TimedPredictor] = None
+        self._pointer_mtime: Optional[int] = None
+        self._checked_at = float("-inf")
+        self._swap_lock = threading.Lock()
+        self._prewarm_thread: Optional[threading.Thread] = None
+
+    # -----------------------
+    # Runs
+    # -----------------------
+    def _resolve(self, path: str) -> str:
+        # run manifests store paths relative to the repository root
+        return path if os.path.isabs(path) else os.path.join(os.path.dirname(self.models_dir), path)
+
+    def runs(self) -> List[dict]:
+        """Run manifests, oldest first, with "active" and in-process "latency" added."""
+        active = self.active_run_id()
+        runs = []
+        for path in sorted(glob.glob(os.path.join(self.models_dir, "run_*.json"))):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    run = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if "run_id" in run:
+                run["active"] = run["run_id"] == active
+                run["latency"] = self.latency(run["run_id"])
+                runs.append(run)
+        return runs
+
+    def run(self, run_id: str) -> dict:
+        path = os.path.join(self.models_dir, f"run_{run_id}.json")
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise KeyError(f"No training run {run_id!r} in {self.models_dir}") from None
+
+    def active_run_id(self) -> Optional[str]:
+        """Run named by the pointer file, or None (serve the base artifacts)."""
+        try:
+            with open(self.pointer_path, encoding="utf-8") as f:
+                return json.load(f)["run_id"]
+        except FileNotFoundError:
+            return None
+
+    def promote(self, run_id: Optional[str]) -> None:
+        """Point serving at run_id (None: back to the base artifacts)."""
+        if run_id is None:
+            if os.path.exists(self.pointer_path):
+                os.remove(self.pointer_path)
+            return
+        self.run(run_id)  # raises KeyError for unknown runs
+        _write_atomic(self.pointer_path,
+                      {"run_id": run_id, "promoted_at": datetime.utcnow().isoformat(timespec="seconds")})
+
+    def _loader(self, run_id: str) -> ModelArtifacts:
+        if run_id == BASE:
+            return self._base
+        loader = self._loaders.get(run_id)
+        if loader is None:
+            artifacts = self.run(run_id).get("artifacts", {})
+            arrays = artifacts.get("arrays") or os.path.join(os.path.basename(self.models_dir),
+                                                              f"resume_classifier_{run_id}")
+            loader = self._loaders[run_id] = ModelArtifacts(
+                self._resolve(artifacts["model"]), self._resolve(artifacts["vectorizer"]), self._resolve(arrays))
+        return loader
+
+    def _stats_for(self, run_id: str) -> LatencyStats:
+        return self._stats.setdefault(run_id, LatencyStats())
+
+    def _latency_path(self, run_id: str) -> str:
+        return os.path.join(self.models_dir, f"latency_{run_id}.json")
+
+    def _saved_latency(self, run_id: str) -> dict:
+        try:
+            with open(self._latency_path(run_id), encoding="utf-8") as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return saved if isinstance(saved, dict) else {}
+
+    def save_latency(self, run_id: str) -> None:
+        """Write this process's serving / benchmark summaries of run_id to its latency file."""
+        measured = {kind: stats[run_id].summary() for kind, stats in
+                    (("serving", self._stats), ("benchmark", self._bench_stats)) if run_id in stats}
+        if not measured:
+            return
+        now = datetime.utcnow().isoformat(timespec="seconds")
+        with self._latency_lock:
+            saved = self._saved_latency(run_id)
+            saved.update({kind: {**summary, "updated_at": now} for kind, summary in measured.items()})
+            try:
+                _write_atomic(self._latency_path(run_id), saved)
+            except OSError as e:
+                self.error = f"Could not save latency of {run_id}: {e}"
+            self._saved_at[run_id] = time.monotonic()
+
+    def _served(self, run_id: str) -> None:
+        # called after every served prediction; saves at most every LATENCY_SAVE_INTERVAL
+        if time.monotonic() - self._saved_at.get(run_id, float("-inf")) >= LATENCY_SAVE_INTERVAL:
+            self.save_latency(run_id)
+
+    def latency(self, run_id: str) -> Optional[dict]:
+        """
+        {"serving": summary, "benchmark": summary} for run_id (either may be
+        missing): the latency file, with this process's newer numbers on top.
+        None if run_id was never measured.
+        """
+        latency = self._saved_latency(run_id)
+        for kind, stats in (("serving", self._stats), ("benchmark", self._bench_stats)):
+            if run_id in stats:
+                latency[kind] = stats[run_id].summary()
+        return latency or None
+
+    # -----------------------
+    # Serving
+    # -----------------------
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if self._active is not None and now - self._checked_at < self.check_interval:
+            return
+        # one thread checks / loads; the others keep serving the current model
+        # (or wait, if there is none yet)
+        if not self._swap_lock.acquire(blocking=self._active is None):
+            return
+        try:
+            if self._active is not None and now - self._checked_at < self.check_interval:
+                return
+            self._checked_at = now
+            try:
+                mtime = os.stat(self.pointer_path).st_mtime_ns
+            except OSError:
+                mtime = None
+            if self._active is not None and mtime == self._pointer_mtime:
+                return
+            error = None
+            try:
+                run_id = self.active_run_id() or BASE
+                loader = self._loader(run_id)
+            except (OSError, ValueError, KeyError) as e:
+                error = self.error = f"Bad model pointer {self.pointer_path}: {e}"
+                if self._active is not None:
+                    return
+                run_id, loader = BASE, self._base  # nothing served yet: fall back
+            if self._active is not None and self._active.run_id == run_id:
+                self._pointer_mtime = mtime
+                return
+            predictor = loader.get()
+            if predictor is None:
+                self.error = f"Could not load model {run_id}: {loader.error}"
+                return
+            self._active = TimedPredictor(run_id, predictor, self._stats_for(run_id),
+                                          lambda: self._served(run_id))
+            self._pointer_mtime = mtime
+            self.swaps += 1
+            self.error = error
+            # let go of models that are no longer served
+            self._loaders = {k: v for k, v in self._loaders.items() if k == run_id}
+        finally:
+            self._swap_lock.release()
+
+    def predictor(self) -> Optional[TimedPredictor]:
+        """The model to serve, swapped in when the pointer changed; None if none can load."""
+        self._refresh()
+        return self._active
+
+    def prewarm(self) -> threading.Thread:
+        """Load the active model in a daemon thread (once)."""
+        if self._prewarm_thread is None:
+            self._prewarm_thread = threading.Thread(target=self.predictor, name="model-registry-prewarm",
+                                                    daemon=True)
+            self._prewarm_thread.start()
+        return self._prewarm_thread
+
+    def benchmark(self, run_id: str, texts: List[str], repeat: int = 3) -> dict:
+        """
+        Time run_id on texts one document at a time, without serving it, and
+        save the summary as the run's "benchmark" latency.
+        """
+        loader = self._loader(run_id)
+        predictor = loader.get()
+        if predictor is None:
+            raise RuntimeError(f"Could not load model {run_id}: {loader.error}")
+        stats = self._bench_stats[run_id] = LatencyStats()
+        timed = TimedPredictor(run_id, predictor, stats)
+        for _ in range(repeat):
+            for text in texts:
+                timed.predict([text])
+        self.save_latency(run_id)
+        return stats.summary()
+
+
+def _write_atomic(path: str, data: dict) -> None:
+    tmp = f"{path}.tmp{os.getpid()}.{threading.get_ident()}"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+_REGISTRY: Optional[ModelRegistry] = None
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Return the shared registry of models/."""
+    global _REGISTRY
+    if _REGISTRY is None:
+        with _REGISTRY_LOCK:
+            if _REGISTRY is None:
+                _REGISTRY = ModelRegistry()
+    return _REGISTRY
+
+
+# -----------------------
+# CLI
+# -----------------------
+def _sample_texts(path: str, limit: int) -> List[str]:
+    with open(path, encoding="utf-8") as f:
+        return [row["text"] for _, row in zip(range(limit), csv.DictReader(f))]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="training runs with accuracy and measured latency")
+    promote = sub.add_parser("promote", help="serve a run (picked up by running apps)")
+    promote.add_argument("run_id", help="run id, or 'base' for the base artifacts")
+    bench = sub.add_parser("bench", help="measure per-document latency of runs")
+    bench.add_argument("run_ids", nargs="*", help="default: every run")
+    bench.add_argument("--data", default=os.path.join(os.path.dirname(MODELS_DIR), "data", "synthetic_resumes.csv"))
+    bench.add_argument("--samples", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    registry = ModelRegistry()
+    if args.command == "promote":
+        try:
+            registry.promote(None if args.run_id == BASE else args.run_id)
+        except KeyError as e:
+            parser.error(str(e))
+        print(f"active model: {args.run_id}")
+        return 0
+
+    if args.command == "bench":
+        texts = _sample_texts(args.data, args.samples)
+        for run_id in args.run_ids or [BASE] + [run["run_id"] for run in registry.runs()]:
+            registry.benchmark(run_id, texts)
+
+    def cost(latency):
+        # a benchmark is comparable across runs; serving numbers depend on traffic
+        for kind in ("benchmark", "serving"):
+            summary = (latency or {}).get(kind)
+            if summary and summary.get("mean_ms_per_doc") is not None:
+                return (f"{summary['mean_ms_per_doc']:.3f} ms/doc (p95 {summary['p95_ms_per_doc']:.3f}, "
+                        f"{kind})")
+        return "latency not measured"
+
+    for run in registry.runs():
+        marker = "*" if run["active"] else " "
+        print(f"{marker} {run['run_id']}  accuracy {run.get('accuracy', float('nan')):.4f}  "
+              f"samples {run.get('samples', '?'):>6}  {cost(run['latency'])}")
+    marker = "*" if registry.active_run_id() is None else " "
+    print(f"{marker} {BASE} (models/resume_classifier.pkl)  {cost(registry.latency(BASE))}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,344 @@
+# utils/parse_cache.py
+"""
+Content-addressed cache for parse_resume results.
+
+Entries are keyed by a SHA-256 of the file bytes plus the parser version, so
+re-uploading or re-analyzing the same resume never runs the PyMuPDF ->
+pdfplumber -> OCR chain twice.
+
+Two tiers:
+  * memory - LRU bounded by the total size of the pickled entries
+  * disk   - optional directory of pickles that survives process restarts,
+             bounded by total file size; the least recently used files
+             (by mtime, refreshed on every disk hit) are pruned first
+
+A second, memory-only instance (get_page_cache) holds extracted page blocks
+keyed by page content hash, so a new version of a resume only re-extracts
+the pages that changed.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+# Environment overrides for the process-wide cache
+CACHE_DIR_ENV = "RESUME_PARSE_CACHE_DIR"
+CACHE_MB_ENV = "RESUME_PARSE_CACHE_MB"
+CACHE_DISK_MB_ENV = "RESUME_PARSE_CACHE_DISK_MB"  # 0: disk tier unbounded
+PAGE_CACHE_MB_ENV = "RESUME_PAGE_CACHE_MB"
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 64 MB of pickled results
+DEFAULT_PAGE_MAX_BYTES = 32 * 1024 * 1024  # 32 MB of pickled page blocks
+DEFAULT_DISK_MAX_BYTES = 512 * 1024 * 1024  # 512 MB of pickles in the disk tier
+
+# A full disk tier is pruned down to this fraction of its budget, so pruning
+# (a directory scan) runs once per batch of writes rather than on every write
+DISK_PRUNE_TARGET = 0.9
+
+
+def content_key(file_bytes: bytes, version: str, *extra) -> str:
+    """
+    Build a cache key from the raw bytes, the parser version and any
+    extra options that change the parse output (e.g. the file extension).
+    """
+    h = hashlib.sha256()
+    h.update(str(version).encode("utf-8"))
+    h.update(b"\0")
+    for part in extra:
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\0")
+    h.update(file_bytes)
+    return h.hexdigest()
+
+
+class ParseCache:
+    """
+    Two-tier (memory LRU + optional disk) cache of parse results.
+
+    Values are stored pickled, which gives an exact byte size for the memory
+    budget and hands every caller its own copy of the result.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, disk_dir: Optional[str] = None,
+                 disk_max_bytes: Optional[int] = DEFAULT_DISK_MAX_BYTES):
+        self.max_bytes = max(0, int(max_bytes))
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes  # None: unbounded
+        self._disk_size: Optional[int] = None  # estimate, rescanned when pruning
+        self._pruning = False  # one thread rescans the disk tier at a time
+        self._entries = OrderedDict()  # key -> pickled bytes
+        self._size = 0
+        self._lock = threading.Lock()
+
+        # counters
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    # -----------------------
+    # Public API
+    # -----------------------
+    def get(self, key: str):
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return pickle.loads(blob)
+
+        blob = self._read_disk(key)
+        if blob is not None:
+            try:
+                value = pickle.loads(blob)
+            except Exception:
+                self._remove_disk(key)
+            else:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._store_memory(key, blob)
+                return value
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value) -> None:
+        """Store value in memory and, if configured, on disk."""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._store_memory(key, blob)
+        self._write_disk(key, blob)
+
+    def clear(self, disk: bool = False) -> None:
+        """Drop the memory tier (and the disk tier if disk=True)."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            if disk:
+                self._disk_size = None
+        if disk and self.disk_dir and os.path.isdir(self.disk_dir):
+            for root, _dirs, files in os.walk(self.disk_dir):
+                for name in files:
+                    if name.endswith(".pkl"):
+                        try:
+                            os.remove(os.path.join(root, name))
+                        except OSError:
+                            pass
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current memory usage."""
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (hits / lookups) if lookups else 0.0,
+                "evictions": self.evictions,
+                "disk_evictions": self.disk_evictions,
+                "entries": len(self._entries),
+                "memory_bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "disk_dir": self.disk_dir,
+                "disk_max_bytes": self.disk_max_bytes,
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            if key in self._entries:
+                return True
+        path = self._disk_path(key)
+        return bool(path and os.path.exists(path))
+
+    # -----------------------
+    # Memory tier (caller holds the lock)
+    # -----------------------
+    def _store_memory(self, key: str, blob: bytes) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(old)
+        # entries bigger than the whole budget only go to disk
+        if len(blob) > self.max_bytes:
+            return
+        self._entries[key] = blob
+        self._size += len(blob)
+        while self._size > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self.evictions += 1
+
+    # -----------------------
+    # Disk tier
+    # -----------------------
+    def _disk_path(self, key: str) -> Optional[str]:
+        if not self.disk_dir:
+            return None
+        return os.path.join(self.disk_dir, key[:2], f"{key}.pkl")
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        path = self._disk_path(key)
+        if not path:
+            return None
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+        except OSError:
+            return None
+        try:
+            os.utime(path)  # recently used: pruned last
+        except OSError:
+            pass
+        return blob
+
+    def _write_disk(self, key: str, blob: bytes) -> None:
+        path = self._disk_path(key)
+        if not path:
+            return
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # write to a temp file first so readers never see a partial pickle
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(blob)
+                os.replace(tmp, path)
+            except BaseException:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+                raise
+        except OSError as e:
+            print(f"Parse cache disk write failed: {e}")
+            return
+        self._account_disk(len(blob))
+
+    def _account_disk(self, written: int) -> None:
+        if self.disk_max_bytes is None:
+            return
+        with self._lock:
+            if self._disk_size is not None:
+                self._disk_size += written
+                if self._disk_size <= self.disk_max_bytes:
+                    return
+            if self._pruning:
+                return  # another thread is already rescanning
+            self._pruning = True
+        try:
+            self._prune_disk()
+        finally:
+            with self._lock:
+                self._pruning = False
+
+    def _prune_disk(self) -> None:
+        """
+        Rescan the disk tier (other processes may share it) and delete the
+        least recently used pickles until it is within DISK_PRUNE_TARGET of
+        disk_max_bytes. The scan and deletes run without the lock, so lookups
+        and memory writes are not held up by directory I/O; the lock is taken
+        only to record the new size and eviction count.
+        """
+        files = []
+        for root, _dirs, names in os.walk(self.disk_dir):
+            for name in names:
+                if name.endswith(".pkl"):
+                    try:
+                        st = os.stat(os.path.join(root, name))
+                    except OSError:
+                        continue
+                    files.append((st.st_mtime_ns, st.st_size, os.path.join(root, name)))
+        total = sum(size for _, size, _ in files)
+        evicted = 0
+        if total > self.disk_max_bytes:
+            target = self.disk_max_bytes * DISK_PRUNE_TARGET
+            for _, size, file_path in sorted(files):
+                if total <= target:
+                    break
+                try:
+                    os.remove(file_path)
+                except OSError:
+                    continue
+                total -= size
+                evicted += 1
+        with self._lock:
+            self._disk_size = total
+            self.disk_evictions += evicted
+
+    def _remove_disk(self, key: str) -> None:
+        path = self._disk_path(key)
+        if path:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+# -----------------------
+# Process-wide instance
+# -----------------------
+_CACHE = None
+_PAGE_CACHE = None
+_CACHE_LOCK = threading.Lock()
+
+
+def _env_bytes(name: str, default: int) -> int:
+    try:
+        return int(float(os.getenv(name, "")) * 1024 * 1024)
+    except ValueError:
+        return default
+
+
+def get_parse_cache() -> ParseCache:
+    """Return the shared cache, configured from the environment on first use."""
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = ParseCache(max_bytes=_env_bytes(CACHE_MB_ENV, DEFAULT_MAX_BYTES),
+                                    disk_dir=os.getenv(CACHE_DIR_ENV) or None,
+                                    disk_max_bytes=_env_bytes(CACHE_DISK_MB_ENV, DEFAULT_DISK_MAX_BYTES) or None)
+    return _CACHE
+
+
+def get_page_cache() -> ParseCache:
+    """Return the shared page-block cache (memory only)."""
+    global _PAGE_CACHE
+    if _PAGE_CACHE is None:
+        with _CACHE_LOCK:
+            if _PAGE_CACHE is None:
+                _PAGE_CACHE = ParseCache(max_bytes=_env_bytes(PAGE_CACHE_MB_ENV, DEFAULT_PAGE_MAX_BYTES))
+    return _PAGE_CACHE
+
+
+def set_page_cache(cache: Optional[ParseCache]) -> None:
+    """Replace the shared page cache (None re-reads the environment on next use)."""
+    global _PAGE_CACHE
+    with _CACHE_LOCK:
+        _PAGE_CACHE = cache
+
+
+def set_parse_cache(cache: Optional[ParseCache]) -> None:
+    """Replace the shared cache (None re-reads the environment on next use)."""
+    global _CACHE
+    with _CACHE_LOCK:
+        _CACHE = cache
+
+
+def parse_cache_stats() -> dict:
+    """Counters of the shared cache, for sizing it against real traffic."""
+    return get_parse_cache().stats()
@@ -0,0 +1,155 @@
+# utils/parsed_resume.py
+"""
+Typed results of the resume parser.
+
+parse_resume used to return nested dicts of lists of dicts, with the same
+content stored twice (plain_text and an eagerly built flat_text). Results
+now are __slots__ dataclasses: no per-object __dict__, field names are not
+repeated in every pickle, and flat_text / structured / skills are built on
+access from the sections instead of being stored.
+
+Every class keeps a read-only dict view (result["plain_text"],
+entry.get("points"), "meta" in entry, to_dict()) so code written against
+the old dicts keeps working.
+"""
+from dataclasses import dataclass, field
+from typing import ClassVar, List, Tuple, Union
+
+
+class _DictView:
+    """Read-only mapping access over a fixed set of attribute names."""
+    __slots__ = ()
+    _KEYS: ClassVar[Tuple[str, ...]] = ()
+
+    def keys(self) -> List[str]:
+        return list(self._KEYS)
+
+    def __getitem__(self, key: str):
+        if key not in self.keys():
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key) if key in self.keys() else default
+
+    def __contains__(self, key) -> bool:
+        return key in self.keys()
+
+    def items(self) -> List[tuple]:
+        return [(k, getattr(self, k)) for k in self.keys()]
+
+    def to_dict(self) -> dict:
+        """Plain nested dicts / lists, as parse_resume used to return."""
+        return {k: _plain(v) for k, v in self.items()}
+
+    def __reduce__(self):
+        # rebuild from positional field values (the dataclass __slots__ order);
+        # much cheaper than the generic slots __getstate__ / __setstate__ pair
+        cls = type(self)
+        return cls, tuple(getattr(self, name) for name in cls.__slots__)
+
+
+def _plain(value):
+    if isinstance(value, _DictView):
+        return value.to_dict()
+    if isinstance(value, (list, tuple)):
+        return [_plain(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _plain(v) for k, v in value.items()}
+    return value
+
+
+@dataclass(slots=True)
+class Block(_DictView):
+    """A piece of text at a position: a PyMuPDF block / line or a DOCX paragraph."""
+    page: int
+    bbox: tuple
+    text: str
+    style: str = ""  # DOCX paragraph style (see utils/docx_extractor.py)
+
+    _KEYS: ClassVar[Tuple[str, ...]] = ("page", "bbox", "text", "style")
+
+
+@dataclass(slots=True)
+class ExperienceEntry(_DictView):
+    """One role of an EXPERIENCE section."""
+    role: str = ""
+    company: str = ""
+    duration: str = ""
+    points: List[str] = field(default_factory=list)
+    meta: List[str] = field(default_factory=list)  # short detail lines ("Remote")
+
+    _KEYS: ClassVar[Tuple[str, ...]] = ("role", "company", "duration", "points", "meta")
+
+    def keys(self) -> List[str]:
+        # "meta" only shows up in the dict view when there is some
+        return list(self._KEYS) if self.meta else list(self._KEYS[:-1])
+
+
+@dataclass(slots=True)
+class Section(_DictView):
+    """
+    A resume section. items is a string for SUMMARY, otherwise a list of
+    strings (skills, bullets), ExperienceEntry objects or education dicts.
+    """
+    name: str
+    items: Union[str, list]
+
+    _KEYS: ClassVar[Tuple[str, ...]] = ("name", "items")
+
+
+@dataclass(slots=True)
+class ParsedResume(_DictView):
+    """
+    Result of parse_resume. Only plain_text and the sections are stored;
+    flat_text, structured and skills are derived on access.
+    """
+    plain_text: str
+    sections: Tuple[Section, ...] = ()
+    truncated: bool = False       # not every page was extracted
+    timed_out: bool = False       # ... because the time budget ran out
+    reused_pages: List[int] = field(default_factory=list)  # PDF pages taken from the page cache
+
+    _KEYS: ClassVar[Tuple[str, ...]] = (
+        "plain_text", "flat_text", "structured", "skills", "truncated", "timed_out", "reused_pages",
+    )
+
+    def section(self, name: str):
+        """Items of the named section, or None."""
+        for sec in self.sections:
+            if sec.name == name:
+                return sec.items
+        return None
+
+    @property
+    def structured(self) -> dict:
+        """Sections as {name: plain items}, the mode-B JSON structure."""
+        return {sec.name: _plain(sec.items) for sec in self.sections}
+
+    @property
+    def skills(self) -> List[str]:
+        return list(self.section("SKILLS") or [])
+
+    @property
+    def flat_text(self) -> str:
+        """Sections and bullets for human display, built on every access."""
+        flat_parts = []
+        for sec in self.sections:
+            flat_parts.append(f"### {sec.name}")
+            v = sec.items
+            if isinstance(v, str):
+                flat_parts.append(v)
+            else:
+                for item in v:
+                    if isinstance(item, (ExperienceEntry, dict)):
+                        # experience entries (education dicts go through the same path)
+                        role = item.get('role', '')
+                        comp = item.get('company', '')
+                        dur = item.get('duration', '')
+                        flat_parts.append(f"{role} | {comp} | {dur}".strip())
+                        for p in item.get('points', []):
+                            flat_parts.append(f"- {p}")
+                    else:
+                        flat_parts.append(f"- {item}")
+            flat_parts.append("")  # spacer
+        return "\n".join(flat_parts).strip()
@@ -7,6 +7,8 @@ import fitz  # PyMuPDF
 from io import BytesIO
 from PIL import Image
 
+from utils.docx_extractor import extract_docx_text
+
 
 def generate_pdf_preview(file_bytes, page_number=0, zoom=2.0):
     """
@@ -95,10 +97,13 @@ def generate_docx_preview(file_bytes, max_chars=1000):
         str: Preview text extracted from DOCX
     """
     try:
-        # For DOCX, we'll first convert to PDF using PyMuPDF
-        # Or extract text directly if possible
-        # For now, return a placeholder
-        return "DOCX preview: First page content will be displayed here.\n\nNote: Full DOCX text extraction coming soon!"
+        text = extract_docx_text(file_bytes)
+
+        # Limit to max_chars
+        if len(text) > max_chars:
+            text = text[:max_chars] + "\n\n... (preview truncated)"
+
+        return text or "DOCX preview: No text found in document"
 
     except Exception as e:
         print(f"Error generating DOCX preview: {e}")
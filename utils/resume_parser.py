@@ -1,9 +1,55 @@
 # utils/resume_parser.py
 import fitz  # PyMuPDF
+import hashlib
 import re
 import io
-from collections import defaultdict
-from typing import List, Dict
+import mmap
+import os
+import stat
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeout
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import List, Dict, Optional, Union
+
+from utils.docx_extractor import STYLE_HEADING, docx_blocks_to_lines, extract_docx_blocks, is_docx
+from utils.layout import DEFAULT_LAYOUT, LAYOUT_COLUMNS, LAYOUT_LEGACY, check_layout, merge_blocks
+from utils.parse_cache import ParseCache, content_key, get_page_cache, get_parse_cache
+from utils.parsed_resume import Block, ExperienceEntry, ParsedResume, Section
+from utils.section_detector import SectionDetector, get_section_detector
+from utils.text_normalizer import collapse_whitespace, normalize_text
+
+# Bump whenever a change alters parse_resume output, so cached results
+# produced by an older parser are never served.
+PARSER_VERSION = "6"
+
+# Page-parallel PyMuPDF extraction is used for documents with at least this
+# many pages (0 disables it). Forking a pool costs more than extracting a
+# short CV, see scripts/benchmark_page_extraction.py for the crossover point.
+PARALLEL_PAGE_THRESHOLD = int(os.getenv("RESUME_PARSER_PARALLEL_PAGES", "0") or 0)
+PARALLEL_MAX_WORKERS = int(os.getenv("RESUME_PARSER_MAX_WORKERS", "0") or 0) or min(4, os.cpu_count() or 1)
+
+# Pre-flight page classification: pages with fewer characters than
+# OCR_PAGE_MIN_CHARS whose images cover at least SCANNED_MIN_IMAGE_COVERAGE
+# of the page are scanned (OCR'd, at most OCR_MAX_WORKERS at a time); pages
+# where BROKEN_TEXT_RATIO of the text is unmappable glyphs go to pdfplumber.
+OCR_PAGE_MIN_CHARS = 20
+SCANNED_MIN_IMAGE_COVERAGE = 0.5
+BROKEN_TEXT_RATIO = 0.3
+OCR_MAX_WORKERS = int(os.getenv("RESUME_PARSER_OCR_WORKERS", "0") or 0) or min(4, os.cpu_count() or 1)
+
+# OCR rasterisation: render at the scan's own resolution within these DPI
+# bounds, and never above OCR_MAX_PIXELS per page (A4 / Letter at 300 DPI).
+OCR_MIN_DPI = 150
+OCR_MAX_DPI = 300
+OCR_MAX_PIXELS = 2550 * 3508
+
+# Limits for interactive callers (the Streamlit app, batch analysis): a
+# pathological upload returns partial text instead of stalling the session.
+# parse_resume itself is unlimited unless limits are passed in.
+DEFAULT_TIME_BUDGET = float(os.getenv("RESUME_PARSER_TIME_BUDGET", "30") or 0) or None
+DEFAULT_MAX_PAGES = int(os.getenv("RESUME_PARSER_MAX_PAGES", "20") or 0) or None
 
 # Optional fallbacks
 try:
@@ -12,107 +58,272 @@ except Exception:
     pdfplumber = None
 
 try:
-    from pdf2image import convert_from_bytes
     import pytesseract
+    from PIL import Image
     OCR_AVAILABLE = True
 except Exception:
     OCR_AVAILABLE = False
 
 
 # -----------------------
-# Low-level helpers
+# Input sources
 # -----------------------
+# A document to extract: a path on disk, opened by MuPDF / pdfplumber / zipfile
+# themselves, a memory-mapped file, or an in-memory buffer
+PdfSource = Union[str, bytes, bytearray, memoryview, mmap.mmap]
+
+
+def _open_pdf(source: PdfSource):
+    if isinstance(source, str):
+        return fitz.open(source, filetype='pdf')
+    if isinstance(source, mmap.mmap):
+        source = memoryview(source)  # MuPDF takes buffers, not mmap objects
+    return fitz.open(stream=source, filetype='pdf')
+
+
+def _open_pdfplumber(source: PdfSource, **kwargs):
+    # a path or an mmap (a seekable file object) is read in place
+    return pdfplumber.open(source if isinstance(source, (str, mmap.mmap)) else io.BytesIO(source), **kwargs)
+
+
+def _disk_fileno(file_obj) -> Optional[int]:
+    """File descriptor of a file object backed by a regular file on disk, else None."""
+    try:
+        fileno = file_obj.fileno()
+        if not stat.S_ISREG(os.fstat(fileno).st_mode):
+            return None
+    except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+        return None
+    flush = getattr(file_obj, "flush", None)
+    if flush is not None:
+        try:
+            flush()  # pending writes of a w+b file must reach the mapping
+        except (OSError, ValueError):
+            pass
+    return fileno
+
+
+@contextmanager
+def _mapped(fileno: int):
+    """Read-only mmap of the whole file; empty files give b"" (they cannot be mapped)."""
+    if os.fstat(fileno).st_size == 0:
+        yield b""
+        return
+    mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+    try:
+        yield mapped
+    finally:
+        try:
+            mapped.close()
+        except BufferError:
+            pass  # a view is still alive somewhere; unmapped when it is collected
+
+
+@contextmanager
+def _input_buffer(file_obj):
+    """
+    Yield (data, path, name) for any parse_resume input without copying it:
+      * a path (str / os.PathLike): the file is memory-mapped, so the OS
+        page cache backs the data, and the path is handed to the extractors
+        to open the file themselves
+      * a file object backed by a file on disk: its descriptor is
+        memory-mapped (so files unlinked after opening, or opened by a
+        relative path before a chdir, still work); the extractors read the
+        mapping
+      * bytes / bytearray / memoryview: used as is
+      * an in-memory file (io.BytesIO, Streamlit UploadedFile): a view of
+        its buffer
+      * any other file-like object: read() once
+    File objects are always read whole, like seek(0) + read().
+    """
+    if isinstance(file_obj, (str, os.PathLike)):
+        path = os.fspath(file_obj)
+        with open(path, "rb") as f, _mapped(f.fileno()) as data:
+            yield data, path, path
+        return
+
+    if isinstance(file_obj, (bytes, bytearray, memoryview)):
+        yield file_obj, None, ""
+        return
+
+    name = getattr(file_obj, "name", "") or ""
+    if not isinstance(name, str):
+        name = ""  # e.g. the int name of a file opened from a descriptor
+    fileno = _disk_fileno(file_obj)
+    if fileno is not None:
+        with _mapped(fileno) as data:
+            yield data, None, name
+        return
+    if hasattr(file_obj, "getbuffer"):
+        view = file_obj.getbuffer()
+        try:
+            yield view, None, name
+        finally:
+            view.release()  # let the caller write to / resize its buffer again
+        return
+    file_obj.seek(0)
+    yield file_obj.read(), None, name
 
-# Fix common PDF ligature / weird Unicode extracted characters
-UNICODE_FIX_MAP = {
-    "Ɵ": "ti",
-    "Ŧ": "T",
-    "Ŋ": "N",
-    "ƞ": "n",
-    "Ō": "o",
-    "ō": "o",
-    "ſ": "s",
-    "ﬀ": "ff",
-    "ﬁ": "fi",
-    "ﬂ": "fl",
-    "ﬃ": "ffi",
-    "ﬄ": "ffl",
-    "ﬅ": "ft",
-    "ﬆ": "st",
-    "": "-",     # fancy bullet
-    "": "-",     # bullet
-    "•": "•",     # preserve real bullet
-}
-
-
-def normalize_unicode_characters(text: str) -> str:
-    """Fix broken unicode from stylized PDFs (ligatures, mis-encodings)."""
-    for bad, good in UNICODE_FIX_MAP.items():
-        text = text.replace(bad, good)
-    return text
-
-def _normalize_whitespace(s: str) -> str:
-    s = s.replace('\r', '\n')
-    s = re.sub(r'\n{3,}', '\n\n', s)  # collapse many blank lines
-    s = re.sub(r'[ \t]+', ' ', s)
-    s = s.strip()
-    return s
-
-
-def _fix_hyphenation(text: str) -> str:
-    # remove hyphen+newline splits (word-breaking at line endings)
-    text = re.sub(r'-\n\s*', '', text)
-    # convert single newline within paragraph to space
-    text = re.sub(r'(?<!\n)\n(?!\n)', ' ', text)
-    # collapse multiple spaces
-    text = re.sub(r' +', ' ', text)
-    return text
 
+# -----------------------
+# Low-level helpers
+# -----------------------
 
 def _is_bullet_token(tok: str) -> bool:
     tok = (tok or "").strip()
     return bool(re.match(r'^[-•\u2022\u25E6\u2043]|\d+[\.\)]', tok))
 
 
-def _merge_blocks(blocks: List[dict]) -> List[dict]:
+class _ParseBudget:
+    """
+    Page and wall-clock limits for one parse. Extraction stages check it
+    between pages and record whether it cut the document short.
+    """
+
+    def __init__(self, time_budget: Optional[float] = None, max_pages: Optional[int] = None):
+        self.expires = None if time_budget is None else time.monotonic() + time_budget
+        self.max_pages = max_pages
+        self.page_count = 0     # pages in the document, once known
+        self.timed_out = False
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None without a time budget"""
+        if self.expires is None:
+            return None
+        return max(0.0, self.expires - time.monotonic())
+
+    def expired(self) -> bool:
+        if not self.timed_out and self.expires is not None and time.monotonic() >= self.expires:
+            self.timed_out = True
+        return self.timed_out
+
+    def page_limit(self, page_count: int) -> int:
+        """Record the document length and return how many pages to extract."""
+        self.page_count = page_count
+        if self.max_pages is None:
+            return page_count
+        return min(page_count, self.max_pages)
+
+    @property
+    def truncated(self) -> bool:
+        return self.timed_out or (self.max_pages is not None and self.page_count > self.max_pages)
+
+
+def _merge_blocks(blocks: List[Block], layout: str = LAYOUT_LEGACY) -> List[Block]:
     """
     Merge close blocks (helps join broken lines/columns)
     Blocks expected to have keys: bbox=(x0,y0,x1,y1), text (str)
+    The reading order comes from the layout strategy (see utils/layout.py).
     """
-    if not blocks:
-        return blocks
-    merged = []
-    blocks_sorted = sorted(blocks, key=lambda b: (round(b['bbox'][1]), round(b['bbox'][0])))
-    for b in blocks_sorted:
-        if not merged:
-            merged.append(b.copy())
-            continue
-        last = merged[-1]
-        # vertical gap
-        y_gap = b['bbox'][1] - last['bbox'][3]
-        x_diff = abs(b['bbox'][0] - last['bbox'][0])
-        # if close vertically and near same x, join as same paragraph line
-        if 0 <= y_gap < 18 and x_diff < 30:
-            last['text'] = (last['text'].rstrip() + ' ' + b['text'].lstrip()).strip()
-            last['bbox'] = (
-                min(last['bbox'][0], b['bbox'][0]),
-                min(last['bbox'][1], b['bbox'][1]),
-                max(last['bbox'][2], b['bbox'][2]),
-                max(last['bbox'][3], b['bbox'][3]),
-            )
-        else:
-            merged.append(b.copy())
-    return merged
+    return merge_blocks(blocks, layout)
 
 
 # -----------------------
 # Extractors
 # -----------------------
-def _extract_blocks_with_pymupdf(file_bytes: bytes):
-    doc = fitz.open(stream=file_bytes, filetype='pdf')
+# Page classes from the pre-flight probe; each picks exactly one extractor
+PAGE_TEXT = "text"        # native text layer      -> PyMuPDF blocks
+PAGE_BROKEN = "broken"    # unmappable glyphs      -> pdfplumber
+PAGE_SCANNED = "scanned"  # image-only             -> OCR
+PAGE_EMPTY = "empty"      # no text and no scan    -> nothing
+
+_TEXTPAGE_FLAGS = fitz.TEXTFLAGS_DICT & ~fitz.TEXT_PRESERVE_IMAGES
+
+
+def _bad_char_ratio(text: str) -> float:
+    """Share of non-space characters that are replacement, private-use or control chars."""
+    total = bad = 0
+    for ch in text:
+        if ch.isspace():
+            continue
+        total += 1
+        code = ord(ch)
+        if code == 0xFFFD or 0xE000 <= code <= 0xF8FF or code < 0x20:
+            bad += 1
+    return (bad / total) if total else 0.0
+
+
+def _image_coverage(page) -> float:
+    """Fraction of the page area covered by images (overlaps counted twice, capped at 1)."""
+    area = page.rect.width * page.rect.height
+    if area <= 0:
+        return 0.0
+    covered = 0.0
+    for info in page.get_image_info():
+        r = fitz.Rect(info.get("bbox", (0, 0, 0, 0))) & page.rect
+        if not r.is_empty:
+            covered += r.width * r.height
+    return min(1.0, covered / area)
+
+
+def _probe_page(page) -> dict:
+    """
+    Cheap pre-flight look at one page: font count, text length, share of
+    garbage characters and (only when there is little text) image coverage.
+    The text page built for the probe is returned so the PyMuPDF extractor
+    can reuse it instead of re-reading the page.
+    """
+    probe = {"fonts": len(page.get_fonts()), "chars": 0, "bad_ratio": 0.0,
+             "image_coverage": 0.0, "textpage": None}
+    if probe["fonts"]:
+        tp = page.get_textpage(flags=_TEXTPAGE_FLAGS)
+        text = page.get_text("text", textpage=tp)
+        probe["textpage"] = tp
+        probe["chars"] = len(text.strip())
+        probe["bad_ratio"] = _bad_char_ratio(text)
+    if probe["chars"] < OCR_PAGE_MIN_CHARS:
+        probe["image_coverage"] = _image_coverage(page)
+    probe["kind"] = _classify_page(probe)
+    return probe
+
+
+def _classify_page(probe: dict) -> str:
+    if probe["chars"] < OCR_PAGE_MIN_CHARS:
+        if probe["image_coverage"] >= SCANNED_MIN_IMAGE_COVERAGE:
+            return PAGE_SCANNED
+        if not probe["chars"]:
+            return PAGE_EMPTY
+    if probe["bad_ratio"] >= BROKEN_TEXT_RATIO:
+        return PAGE_BROKEN
+    return PAGE_TEXT
+
+
+def classify_pdf(source: PdfSource) -> dict:
+    """
+    Pre-flight classification of a PDF without extracting it.
+    Returns {"kind": "text-native" | "broken-encoding" | "scanned" | "mixed" | "empty",
+             "pages": [page kind, ...]}
+    """
+    doc = _open_pdf(source)
+    try:
+        kinds = [_probe_page(page)["kind"] for page in doc]
+    finally:
+        doc.close()
+    found = set(kinds) - {PAGE_EMPTY}
+    if not found:
+        kind = "empty"
+    elif len(found) > 1:
+        kind = "mixed"
+    else:
+        kind = {PAGE_TEXT: "text-native", PAGE_BROKEN: "broken-encoding",
+                PAGE_SCANNED: "scanned"}[found.pop()]
+    return {"kind": kind, "pages": kinds}
+
+
+def _page_record(page, pno: int, layout: str = LAYOUT_LEGACY) -> dict:
+    """
+    Probe one page and run the PyMuPDF extractor only where it applies.
+    Returns {"page", "kind", "blocks", "rect"}; scanned and broken pages are
+    left for the OCR / pdfplumber extractors. The column layout gets one
+    block per text line, since a PyMuPDF block can hold both columns of a row.
+    """
+    per_line = layout == LAYOUT_COLUMNS
+    probe = _probe_page(page)
     blocks = []
-    for pno, page in enumerate(doc, start=1):
-        d = page.get_text("dict")
+    if probe["kind"] in (PAGE_TEXT, PAGE_BROKEN):
+        # broken pages keep PyMuPDF blocks only as a fallback for when
+        # pdfplumber is unavailable; they come from the probe's text page
+        d = page.get_text("dict", textpage=probe["textpage"])
         for block in d.get("blocks", []):
             if block.get("type") != 0:
                 continue
@@ -124,86 +335,328 @@ def _extract_blocks_with_pymupdf(file_bytes: bytes):
                 for span in line.get("spans", []):
                     line_text += span.get("text", "")
                 if line_text.strip():
+                    if per_line:
+                        blocks.append(Block(pno, tuple(line["bbox"]), line_text.strip()))
+                        continue
                     lines.append(line_text.strip())
             text = "\n".join(lines).strip()
             if text:
-                blocks.append({
-                    "page": pno,
-                    "bbox": (x0, y0, x1, y1),
-                    "text": text
-                })
+                blocks.append(Block(pno, (x0, y0, x1, y1), text))
+    return {
+        "page": pno,
+        "kind": probe["kind"],
+        "blocks": blocks,
+        "rect": tuple(page.rect),
+    }
+
+
+# -----------------------
+# Page content hashing (incremental re-parse)
+# -----------------------
+def _stream_digest(doc, xref: int, digests: Dict[int, bytes]) -> bytes:
+    """SHA-256 of an object's raw stream, memoised per document (logos repeat on every page)."""
+    digest = digests.get(xref)
+    if digest is None:
+        try:
+            digest = hashlib.sha256(doc.xref_stream_raw(xref) or b"").digest()
+        except Exception:
+            digest = b""
+        digests[xref] = digest
+    return digest
+
+
+def _page_hash(page, layout: str, digests: Dict[int, bytes]) -> str:
+    """
+    Hash of everything that decides a page's extracted text: the content
+    stream, the fonts it uses (the subset tag changes with the glyph set),
+    the form XObjects and images it draws, the page geometry, the layout
+    and the parser version. Equal hashes across uploads mean the page's
+    blocks can be reused; object numbers are left out since they shift
+    whenever another page changes.
+    """
+    doc = page.parent
+    h = hashlib.sha256()
+    h.update(f"{PARSER_VERSION}|{layout}|{tuple(page.rect)}|{page.rotation}".encode())
+    h.update(page.read_contents())
+    for font in page.get_fonts():
+        h.update(repr(font[1:]).encode())  # ext, type, basefont, name, encoding
+    for xobj in page.get_xobjects():
+        h.update(xobj[1].encode())
+        h.update(_stream_digest(doc, xobj[0], digests))
+    for img in page.get_images(full=True):
+        h.update(img[7].encode())  # resource name
+        h.update(_stream_digest(doc, img[0], digests))
+    return h.hexdigest()
+
+
+def _reuse_record(record: dict, pno: int) -> dict:
+    """A cached page record renumbered to the page's position in this upload."""
+    record["page"] = pno
+    record["reused"] = True
+    for b in record["blocks"]:
+        b.page = pno
+    return record
+
+
+# Per-worker document, opened once from the path / bytes handed to the pool initializer
+_WORKER_DOC = None
+
+
+def _init_page_worker(source: PdfSource):
+    global _WORKER_DOC
+    _WORKER_DOC = _open_pdf(source)
+
+
+def _extract_page_list(page_numbers: List[int], layout: str = LAYOUT_LEGACY) -> List[dict]:
+    """Worker task: page records for the given 1-based pages of the worker's document."""
+    return [_page_record(_WORKER_DOC[pno - 1], pno, layout) for pno in page_numbers]
+
+
+def _extract_pages_parallel(source: PdfSource, page_numbers: List[int], max_workers: int,
+                            layout: str = LAYOUT_LEGACY, budget: Optional[_ParseBudget] = None) -> List[dict]:
+    """
+    Split the (1-based, ascending) pages into contiguous runs, extract them in
+    a process pool (each worker reopens the document once) and concatenate
+    the results in page order. When the time budget runs out, the runs
+    finished so far are returned and the pool is abandoned without waiting
+    for the rest.
+    """
+    workers = max(1, min(max_workers, len(page_numbers)))
+    step = -(-len(page_numbers) // workers)  # ceil division
+    chunks = [page_numbers[i:i + step] for i in range(0, len(page_numbers), step)]
+    pool = ProcessPoolExecutor(max_workers=len(chunks), initializer=_init_page_worker,
+                               initargs=(source if isinstance(source, (str, bytes)) else bytes(source),))
+    pages = []
+    try:
+        futures = [pool.submit(_extract_page_list, chunk, layout) for chunk in chunks]
+        for fut in futures:
+            try:
+                pages.extend(fut.result(timeout=budget.remaining() if budget else None))
+            except FuturesTimeout:
+                budget.timed_out = True
+                break
+    finally:
+        pool.shutdown(wait=not (budget and budget.timed_out), cancel_futures=True)
+    return pages
+
+
+def _extract_pages(source: PdfSource, parallel_threshold: Optional[int] = None,
+                   layout: str = LAYOUT_LEGACY, budget: Optional[_ParseBudget] = None,
+                   page_cache: Optional[ParseCache] = None) -> List[dict]:
+    """
+    Page records for every page, in page order. Documents with at least
+    parallel_threshold pages (default PARALLEL_PAGE_THRESHOLD, 0 = never) are
+    extracted page-parallel; the records are the same either way.
+    With a budget, only the first max_pages pages are extracted and
+    extraction stops once the time budget is spent.
+    With a page_cache, every record carries its content "hash"; pages whose
+    hash is cached are taken from it (marked "reused") and only the others
+    are extracted. Storing finished pages is left to the caller.
+    """
+    if parallel_threshold is None:
+        parallel_threshold = PARALLEL_PAGE_THRESHOLD
+    doc = _open_pdf(source)
+    page_count = len(doc) if budget is None else budget.page_limit(len(doc))
+
+    hashes = {}
+    reused = {}
+    if page_cache is not None:
+        digests = {}
+        for pno in range(1, page_count + 1):
+            hashes[pno] = _page_hash(doc[pno - 1], layout, digests)
+            cached = page_cache.get(hashes[pno])
+            if cached is not None:
+                reused[pno] = _reuse_record(cached, pno)
+    todo = [pno for pno in range(1, page_count + 1) if pno not in reused]
+
+    extracted = None
+    if parallel_threshold and len(todo) >= parallel_threshold and PARALLEL_MAX_WORKERS > 1:
+        try:
+            extracted = _extract_pages_parallel(source, todo, PARALLEL_MAX_WORKERS, layout, budget)
+        except Exception as e:
+            # e.g. process creation not allowed in this environment
+            print(f"Parallel page extraction failed, falling back to serial: {e}")
+    if extracted is None:
+        extracted = []
+        for pno in todo:
+            if budget is not None and budget.expired():
+                break
+            extracted.append(_page_record(doc[pno - 1], pno, layout))
+    doc.close()
+
+    for record in extracted:
+        if page_cache is not None:
+            record["hash"] = hashes[record["page"]]
+        reused[record["page"]] = record
+    return [reused[pno] for pno in sorted(reused)]
+
+
+def _extract_blocks_with_pymupdf(source: PdfSource, parallel_threshold: Optional[int] = None,
+                                 layout: str = LAYOUT_LEGACY):
+    pages = _extract_pages(source, parallel_threshold, layout)
     # try to merge small fragments
-    merged = _merge_blocks(blocks)
+    merged = _merge_blocks([b for p in pages for b in p["blocks"]], layout)
     return merged
 
 
-def _extract_text_pdfplumber(file_bytes: bytes):
+def _extract_text_pdfplumber(source: PdfSource, budget: Optional[_ParseBudget] = None):
     if not pdfplumber:
         return ""
     out = []
-    with pdfplumber.open(io.BytesIO(file_bytes)) as pdf:
-        for page in pdf.pages:
+    with _open_pdfplumber(source) as pdf:
+        pages = pdf.pages
+        if budget is not None:
+            pages = pages[:budget.page_limit(len(pages))]
+        for page in pages:
+            if budget is not None and budget.expired():
+                break
             t = page.extract_text() or ""
             out.append(t)
     return "\n\n".join(out)
 
 
-def _ocr_pdf_bytes(file_bytes: bytes):
-    """Return OCR text if available."""
-    if not OCR_AVAILABLE:
+def _extract_pages_pdfplumber(source: PdfSource, page_numbers: List[int],
+                              budget: Optional[_ParseBudget] = None) -> Dict[int, str]:
+    """pdfplumber text for the given 1-based pages only (used for broken-encoding pages)."""
+    if not pdfplumber or not page_numbers:
+        return {}
+    out = {}
+    with _open_pdfplumber(source, pages=list(page_numbers)) as pdf:
+        for page in pdf.pages:
+            if budget is not None and budget.expired():
+                break  # pages not reached keep their PyMuPDF text
+            t = page.extract_text() or ""
+            if t.strip():
+                out[page.page_number] = t
+    return out
+
+
+def _ocr_dpi(page) -> int:
+    """
+    Pick a render DPI for OCR: the highest native resolution of the page's
+    images (rendering above it adds no detail), clamped to
+    [OCR_MIN_DPI, OCR_MAX_DPI] and to the OCR_MAX_PIXELS budget.
+    """
+    dpi = OCR_MAX_DPI
+    native = []
+    for info in page.get_image_info():
+        x0, y0, x1, y1 = info.get("bbox", (0, 0, 0, 0))
+        if x1 - x0 > 0 and info.get("width"):
+            native.append(info["width"] * 72.0 / (x1 - x0))
+    if native:
+        dpi = min(dpi, max(OCR_MIN_DPI, int(max(native))))
+
+    width_in = page.rect.width / 72.0
+    height_in = page.rect.height / 72.0
+    if width_in > 0 and height_in > 0:
+        budget_dpi = int((OCR_MAX_PIXELS / (width_in * height_in)) ** 0.5)
+        dpi = min(dpi, budget_dpi)
+    return max(1, dpi)
+
+
+def _render_page(doc, pno: int):
+    """
+    Grayscale PIL image of a page (1-based page number) at the adaptive OCR
+    DPI. PyMuPDF is not thread-safe, even across separate documents, so this
+    must run in the thread that parses the document.
+    """
+    page = doc[pno - 1]
+    pix = page.get_pixmap(dpi=_ocr_dpi(page), colorspace=fitz.csGRAY, alpha=False)
+    return Image.frombytes("L", (pix.width, pix.height), pix.samples)
+
+
+def _ocr_image(img, budget: Optional[_ParseBudget] = None) -> str:
+    """
+    Tesseract text of a rendered page. Safe to call from worker threads:
+    pytesseract runs tesseract in a subprocess. With a time budget,
+    tesseract is killed when the budget runs out.
+    """
+    if budget is not None and budget.expired():
         return ""
-    pages = convert_from_bytes(file_bytes, dpi=300)
-    texts = []
-    for img in pages:
-        texts.append(pytesseract.image_to_string(img, lang='eng'))
-    return "\n\n".join(texts)
+    timeout = 0  # no limit
+    if budget is not None and budget.expires is not None:
+        timeout = max(budget.remaining(), 0.001)
+    return pytesseract.image_to_string(img, lang='eng', timeout=timeout)
+
+
+def _ocr_pages(source: PdfSource, page_numbers: List[int],
+               budget: Optional[_ParseBudget] = None) -> Dict[int, str]:
+    """
+    OCR only the given pages, so latency follows the number of scanned pages
+    rather than the document length. Pages are rendered one by one in this
+    thread (PyMuPDF must not be used from several threads) and only the
+    tesseract calls go to a bounded worker pool; rendering waits for a free
+    worker, so at most OCR_MAX_WORKERS page images are in memory.
+    Returns {page number: text} for pages that produced text.
+    """
+    if not OCR_AVAILABLE or not page_numbers:
+        return {}
+    results = {}
+
+    def collect(done):
+        for fut in done:
+            pno = futures.pop(fut)
+            try:
+                text = fut.result()
+            except Exception:
+                # tesseract killed at the end of the time budget, or a bad page
+                if budget is not None:
+                    budget.expired()
+                continue
+            if text.strip():
+                results[pno] = text
+
+    workers = max(1, min(OCR_MAX_WORKERS, len(page_numbers)))
+    futures = {}
+    doc = _open_pdf(source)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for pno in page_numbers:
+                if budget is not None and budget.expired():
+                    break
+                if len(futures) >= workers:
+                    collect(wait(futures, return_when=FIRST_COMPLETED).done)
+                try:
+                    img = _render_page(doc, pno)
+                except Exception:
+                    continue  # a bad page
+                futures[pool.submit(_ocr_image, img, budget)] = pno
+                del img
+            collect(list(futures))
+    finally:
+        doc.close()
+    return results
 
 
 # -----------------------
 # High-level parsing heuristics
 # -----------------------
-def _blocks_to_plain(blocks: List[dict]) -> str:
+def _blocks_to_plain(blocks: List[Block]) -> str:
     if not blocks:
         return ""
     lines = []
     for b in blocks:
         # split block's text into lines
-        for ln in b['text'].splitlines():
+        for ln in b.text.splitlines():
             ln2 = ln.strip()
             if ln2:
                 lines.append(ln2)
         # add separator between blocks to preserve paragraphs
         lines.append("")
-    merged = "\n".join(lines)
-    merged = _normalize_whitespace(merged)
-    merged = _fix_hyphenation(merged)
-    return merged
+    return collapse_whitespace("\n".join(lines))
 
 
-def _smart_structure_from_plain(plain: str) -> Dict:
+def _smart_structure_from_plain(plain: str, extra_headings=(), detector: Optional[SectionDetector] = None) -> Dict:
     """
     Heuristic structural parser: split into sections using heading patterns,
     detect Experience sections and parse role/company/dates + bullets.
+    extra_headings: lines known to be headings from the source format
+    (e.g. DOCX heading styles), used on top of the text heuristics.
+    detector: heading vocabulary to use (default: the shared one, see
+    utils/section_detector.py).
     """
     lines = [ln.strip() for ln in plain.splitlines() if ln.strip() != ""]
-    sections = defaultdict(list)
-    current = "GENERAL"
-    heading_regex = re.compile(r'^[A-Z][A-Z\s]{2,}$')  # all-caps-ish heading
-    # also allow common headings case-insensitive
-    known_headings = {"EXPERIENCE", "WORK EXPERIENCE", "EDUCATION", "SKILLS", "PROJECTS", "SUMMARY", "ABOUT", "CONTACT", "COURSES", "HOBBIES", "ACHIEVEMENTS"}
-
-    for ln in lines:
-        # detect explicit "Skills:" style headers
-        if re.match(r'^(Skills|Skills:|SKILLS)\b', ln, re.I):
-            current = "SKILLS"
-            continue
-        # all-caps heading or known heading word
-        clean_ln = re.sub(r'[^\w\s]', '', ln).strip()
-        if heading_regex.match(clean_ln) or clean_ln.upper() in known_headings:
-            current = clean_ln.upper()
-            sections[current]  # ensure exists
-            continue
-        sections[current].append(ln)
+    sections = (detector or get_section_detector()).split(lines, extra_headings)
 
     # Now post-process certain sections
     structured = {}
@@ -226,6 +679,19 @@ def _smart_structure_from_plain(plain: str) -> Dict:
     return structured
 
 
+# Sub-parser patterns, compiled once
+_SKILL_SEPARATORS = re.compile(r'[,/•\n]|;|-')
+_HAS_LETTER = re.compile(r'[A-Za-z]')
+_EDU_YEAR = re.compile(r'(\b20\d{2}\b|\b19\d{2}\b|\b\d{4}\b)')
+_INSTITUTION = re.compile(r'\b(University|Institute|College|School|Baccalaureate|Bachelor|Master|B\.Tech|BTech|MBA|GL Bajaj)\b', re.I)
+_HEADER_SPLIT = re.compile(r'\s[\|\-–—]\s|\s{2,}')
+_HEADER_DATE = re.compile(r'\d{4}|\bPresent\b', re.I)
+_DURATION = re.compile(r'(\b\d{4}\b(?:\s*[-–—]\s*\b(?:Present|\d{4})\b)?)')
+_YEAR_RANGE = re.compile(r'\b(19|20)\d{2}\b(?:\s*[-–—]\s*\b(?:Present|\d{4})\b)?')
+_ROLE_SPLIT = re.compile(r'\s[\|\-–—]\s')
+_LEADING_BULLET = re.compile(r'^[-•\u2022\.\s]+')
+
+
 def _parse_bulleted_block(lines: List[str]) -> List[str]:
     out = []
     buffer = []
@@ -241,13 +707,13 @@ def _parse_bulleted_block(lines: List[str]) -> List[str]:
 def _parse_skills_block(lines: List[str]) -> List[str]:
     text = " ".join(lines)
     # try to split by commas or bullets or slashes
-    candidates = re.split(r'[,/•\n]|;|-', text)
+    candidates = _SKILL_SEPARATORS.split(text)
     skills = []
     for c in candidates:
         c = c.strip()
         if len(c) >= 2 and len(c) < 40:
             # filter out numbers and stray words
-            if re.search(r'[A-Za-z]', c):
+            if _HAS_LETTER.search(c):
                 skills.append(c)
     # dedupe preserve order
     seen = set()
@@ -266,14 +732,14 @@ def _parse_education_block(lines: List[str]) -> List[dict]:
     cur = {}
     for ln in lines:
         # year range pattern
-        yr = re.search(r'(\b20\d{2}\b|\b19\d{2}\b|\b\d{4}\b)', ln)
+        yr = _EDU_YEAR.search(ln)
         if yr and cur:
             # finalize previous
             cur['note'] = cur.get('note', '').strip()
             results.append(cur)
             cur = {}
         # heuristics: if contains 'University' or 'Institute' or 'School'
-        if re.search(r'\b(University|Institute|College|School|Baccalaureate|Bachelor|Master|B\.Tech|BTech|MBA|GL Bajaj)\b', ln, re.I):
+        if _INSTITUTION.search(ln):
             if cur:
                 # store previous then new
                 results.append(cur)
@@ -286,7 +752,7 @@ def _parse_education_block(lines: List[str]) -> List[dict]:
     return results
 
 
-def _parse_experience_block(lines: List[str]) -> List[dict]:
+def _parse_experience_block(lines: List[str]) -> List[ExperienceEntry]:
     """
     Heuristic parser for EXPERIENCE lines.
     Looks for patterns like:
@@ -299,46 +765,47 @@ def _parse_experience_block(lines: List[str]) -> List[dict]:
     for ln in lines:
         # If this line looks like a role/company/date header
         # common separators: ' | ', ' - ', '—', '–'
-        header_match = re.split(r'\s[\|\-–—]\s|\s{2,}', ln)
+        # (only lines with a year or "Present" can be headers, so split those alone)
+        header_match = _HEADER_SPLIT.split(ln) if _HEADER_DATE.search(ln) else ()
         # header_match is list of chunks
-        if len(header_match) >= 2 and re.search(r'\d{4}|\bPresent\b|\bPresent\b', ln, re.I):
+        if len(header_match) >= 2:
             # treat this as new experience header
             if cur:
                 entries.append(cur)
-            cur = {"role": header_match[0].strip(), "company": header_match[1].strip() if len(header_match) > 1 else "", "duration": "", "points": []}
+            cur = ExperienceEntry(header_match[0].strip(), header_match[1].strip() if len(header_match) > 1 else "")
             # try to extract duration from the full line
-            dur = re.search(r'(\b\d{4}\b(?:\s*[-–—]\s*\b(?:Present|\d{4})\b)?)', ln)
+            dur = _DURATION.search(ln)
             if dur:
-                cur["duration"] = dur.group(0)
+                cur.duration = dur.group(0)
             continue
 
         # If line contains a year-range (but didn't match above)
-        year_range = re.search(r'\b(19|20)\d{2}\b(?:\s*[-–—]\s*\b(?:Present|\d{4})\b)?', ln)
+        year_range = _YEAR_RANGE.search(ln)
         if year_range and ("," in ln or "@" in ln or "-" in ln):
             # try to split role/company and duration
-            parts = re.split(r'\s[\|\-–—]\s', ln)
+            parts = _ROLE_SPLIT.split(ln)
             if cur:
                 # finalize previous, start new
                 entries.append(cur)
-            cur = {"role": parts[0].strip(), "company": (parts[1].strip() if len(parts) > 1 else ""), "duration": year_range.group(0), "points": []}
+            cur = ExperienceEntry(parts[0].strip(), (parts[1].strip() if len(parts) > 1 else ""), year_range.group(0))
             continue
 
         # bullets or indented lines -> add to points
         if _is_bullet_token(ln[:2]) or ln.startswith(("•", "-", "—")):
             if not cur:
                 # If no header, create a generic entry
-                cur = {"role": "", "company": "", "duration": "", "points": []}
-            cur['points'].append(re.sub(r'^[-•\u2022\.\s]+', '', ln).strip())
+                cur = ExperienceEntry()
+            cur.points.append(_LEADING_BULLET.sub('', ln).strip())
             continue
 
         # If regular sentence and we have current entry, attach as explanation
         if cur:
             # long sentences often belong to points
             if len(ln.split()) > 6:
-                cur['points'].append(ln)
+                cur.points.append(ln)
             else:
                 # maybe short details e.g., "Remote" or "Full-time"
-                cur.setdefault('meta', []).append(ln)
+                cur.meta.append(ln)
         else:
             # not part of experience; skip
             continue
@@ -348,7 +815,7 @@ def _parse_experience_block(lines: List[str]) -> List[dict]:
     # post-process: collapse empty entries
     final = []
     for e in entries:
-        if not e.get('role') and not e.get('company') and not e.get('points'):
+        if not e.role and not e.company and not e.points:
             continue
         final.append(e)
     return final
@@ -357,110 +824,185 @@ def _parse_experience_block(lines: List[str]) -> List[dict]:
 # -----------------------
 # Public API
 # -----------------------
-def parse_resume(file_obj) -> dict:
+def parse_resume(file_obj, use_cache: bool = True, layout: Optional[str] = None,
+                 time_budget: Optional[float] = None, max_pages: Optional[int] = None,
+                 strict: bool = False) -> ParsedResume:
     """
-    Accepts a file-like object (e.g. Streamlit uploaded_file).
-    Supports PDF, DOCX, and TXT files.
-    Returns:
+    Accepts a file-like object (e.g. Streamlit uploaded_file), bytes /
+    bytearray / memoryview, or a path. Paths and files opened from disk are
+    memory-mapped and opened by name by the extractors, so batch jobs never
+    copy the document into the Python heap.
+    Supports PDF, DOCX, and TXT files (TXT is recognised by its extension).
+    Results are cached by content hash (see utils/parse_cache.py), so parsing
+    the same bytes again is a cache lookup, and PDF pages are cached by page
+    content hash, so a new version of a resume only re-extracts the pages
+    that changed; pass use_cache=False to bypass both.
+    layout picks the PDF block ordering: "legacy" (default) or "columns" for
+    column-aware reading order (see utils/layout.py).
+    time_budget (seconds) and max_pages cap PDF extraction: once either is
+    hit, the text extracted so far is returned with "truncated" set, and
+    "timed_out" when the clock ran out. Timed-out results are not cached.
+    Extraction errors are swallowed and give empty text; with strict=True,
+    a document no extractor could read raises the extractor's exception
+    instead (batch jobs record it rather than an empty success).
+    Returns a ParsedResume (utils/parsed_resume.py), which also reads like
+    the dict parse_resume used to return:
       {
         "plain_text": "...",   # cleaned
-        "flat_text": "...",    # paragraphs with some structure
-        "structured": { ... }, # mode-B JSON structure
-        "skills": [ ... ]
+        "flat_text": "...",    # paragraphs with some structure (built on access)
+        "structured": { ... }, # mode-B JSON structure (built on access)
+        "skills": [ ... ],
+        "truncated": False,    # not every page was extracted
+        "timed_out": False,    # ... because time_budget ran out
+        "reused_pages": [...]  # PDF pages taken from an earlier version's parse
       }
     """
-    file_obj.seek(0)
-    file_bytes = file_obj.read()
+    layout = check_layout(layout or DEFAULT_LAYOUT)
+    with _input_buffer(file_obj) as (data, path, file_name):
+        # TXT is recognised by its file extension
+        is_txt_file = file_name.lower().endswith('.txt')
+        return _parse_cached(data, path, is_txt_file, layout, use_cache, time_budget, max_pages, strict)
+
+
+def _parse_cached(data, path: Optional[str], is_txt_file: bool, layout: str, use_cache: bool,
+                  time_budget: Optional[float], max_pages: Optional[int], strict: bool = False) -> ParsedResume:
+    budget = _ParseBudget(time_budget, max_pages)
+
+    if not use_cache:
+        return _parse_bytes(data, is_txt_file, layout, budget, path=path, strict=strict)
+
+    cache = get_parse_cache()
+    key = content_key(data, PARSER_VERSION, "txt" if is_txt_file else "bin", layout,
+                      f"max_pages={max_pages}")
+    cached = cache.get(key)
+    # an empty cached result may hide an extraction error strict must raise
+    if cached is not None and not (strict and not cached.plain_text):
+        return cached
+
+    result = _parse_bytes(data, is_txt_file, layout, budget, page_cache=get_page_cache(), path=path,
+                          strict=strict)
+    # a page cap gives the same text every time; a deadline does not
+    if not result.timed_out:
+        cache.put(key, result)
+    return result
+
+
+def _store_pages(page_cache: ParseCache, pages: List[dict], budget: _ParseBudget):
+    """
+    Cache finished page records by content hash. After a timeout, pdfplumber
+    / OCR pages may have been skipped, so only plain text pages are kept.
+    """
+    for record in pages:
+        if "hash" not in record:
+            continue
+        if budget.timed_out and record["kind"] not in (PAGE_TEXT, PAGE_EMPTY):
+            continue
+        page_cache.put(record["hash"], {"page": record["page"], "kind": record["kind"],
+                                        "blocks": record["blocks"], "rect": record["rect"]})
 
-    # Check if file is TXT by trying to decode as UTF-8 and checking file extension
-    file_name = getattr(file_obj, 'name', '').lower()
-    is_txt_file = file_name.endswith('.txt')
 
+def _parse_bytes(file_bytes, is_txt_file: bool, layout: str = LAYOUT_LEGACY,
+                 budget: Optional[_ParseBudget] = None, page_cache: Optional[ParseCache] = None,
+                 path: Optional[str] = None, strict: bool = False) -> ParsedResume:
+    """
+    Run the full extraction + structuring pipeline on raw bytes (any
+    bytes-like buffer). With a path, the extractors open the file on disk
+    themselves instead of wrapping the buffer. With a page_cache, PDF pages
+    whose content hash was seen before reuse their final blocks (including
+    OCR / pdfplumber text) instead of re-extracting. With strict, an
+    extraction error that left no text at all is raised.
+    """
+    if budget is None:
+        budget = _ParseBudget()
     plain = ""
+    reused_pages = []
+    from_blocks = False
+    heading_lines = set()
+    source = path or file_bytes
+    extraction_error = None
+    docx_file = not is_txt_file and is_docx(file_bytes)
 
     # Handle TXT files directly
     if is_txt_file:
         try:
             # Try to decode as UTF-8 text
-            plain = file_bytes.decode('utf-8', errors='ignore')
+            plain = str(file_bytes, 'utf-8', errors='ignore')
         except Exception:
             # Fallback to latin-1 encoding
             try:
-                plain = file_bytes.decode('latin-1', errors='ignore')
+                plain = str(file_bytes, 'latin-1', errors='ignore')
             except Exception:
                 plain = ""
 
-    # Handle PDF/DOCX files with existing extraction methods
-    if not plain:
-        # 1) try PyMuPDF block extraction
+    # DOCX: stream paragraphs out of the zip; already in reading order
+    elif docx_file:
         try:
-            blocks = _extract_blocks_with_pymupdf(file_bytes)
-            plain = _blocks_to_plain(blocks)
-        except Exception:
-            blocks = []
-            plain = ""
-
-        # 2) if plain too short, fallback to pdfplumber text extraction
-        if (not plain or len(plain.strip()) < 80) and pdfplumber is not None:
+            docx_blocks = extract_docx_blocks(source)
+        except Exception as e:
+            extraction_error = e
+            docx_blocks = []
+        lines = docx_blocks_to_lines(docx_blocks)
+        plain = _blocks_to_plain([replace(b, text=ln) for b, ln in zip(docx_blocks, lines)])
+        from_blocks = True
+        heading_lines = {normalize_text(b.text) for b in docx_blocks if b.style == STYLE_HEADING}
+
+    # Handle PDF files (and anything else PyMuPDF can open)
+    if not plain and not docx_file:
+        # 1) pre-flight probe + PyMuPDF blocks for text pages, page by page
+        try:
+            pages = _extract_pages(source, layout=layout, budget=budget, page_cache=page_cache)
+        except Exception as e:
+            extraction_error = e
+            pages = None
+
+        if pages is not None:
+            # 2) one extractor per remaining page: pdfplumber for broken
+            #    encodings, OCR for image-only pages (reused pages are final)
+            fresh = [p for p in pages if not p.get("reused")]
+            reused_pages = [p["page"] for p in pages if p.get("reused")]
+            broken = [p["page"] for p in fresh if p["kind"] == PAGE_BROKEN]
+            scanned = [p["page"] for p in fresh if p["kind"] == PAGE_SCANNED]
             try:
-                plumber_text = _extract_text_pdfplumber(file_bytes)
-                if len(plumber_text.strip()) > len(plain):
-                    plain = plumber_text
+                replacements = _extract_pages_pdfplumber(source, broken, budget)
             except Exception:
-                pass
+                replacements = {}
+            replacements.update(_ocr_pages(source, scanned, budget))
+            by_number = {p["page"]: p for p in fresh}
+            for pno, page_text in replacements.items():
+                record = by_number[pno]
+                record["blocks"] = [Block(pno, record["rect"], page_text.strip())]
+            if page_cache is not None:
+                _store_pages(page_cache, fresh, budget)
+
+            blocks = _merge_blocks([b for p in pages for b in p["blocks"]], layout)
+            plain = _blocks_to_plain(blocks)
+            from_blocks = True
 
-        # 3) OCR fallback
-        if (not plain or len(plain.strip()) < 200) and OCR_AVAILABLE:
+        # 3) PyMuPDF could not open the file at all: let pdfplumber try
+        elif pdfplumber is not None:
             try:
-                ocr_text = _ocr_pdf_bytes(file_bytes)
-                if len(ocr_text.strip()) > len(plain):
-                    plain = ocr_text
+                plain = _extract_text_pdfplumber(source, budget)
             except Exception:
-                pass
-
-    # final cleaning
-    # final cleaning + unicode fix
-    plain_text = _normalize_whitespace(plain)
-    plain_text = normalize_unicode_characters(plain_text)
-    plain_text = _fix_hyphenation(plain_text)
+                pass  # report PyMuPDF's error, the primary extractor
 
+    if strict and extraction_error is not None and not plain.strip():
+        raise extraction_error
 
-    # build structured JSON from plain text
-    structured = _smart_structure_from_plain(plain_text)
-
-    # try to assemble flat_text for human display (sections + bullets)
-    flat_parts = []
-    for k, v in structured.items():
-        flat_parts.append(f"### {k}")
-        if isinstance(v, str):
-            flat_parts.append(v)
-        elif isinstance(v, list):
-            for item in v:
-                if isinstance(item, dict):
-                    # for experience entries
-                    role = item.get('role', '')
-                    comp = item.get('company', '')
-                    dur = item.get('duration', '')
-                    flat_parts.append(f"{role} | {comp} | {dur}".strip())
-                    for p in item.get('points', []):
-                        flat_parts.append(f"- {p}")
-                else:
-                    flat_parts.append(f"- {item}")
-        else:
-            flat_parts.append(str(v))
-        flat_parts.append("")  # spacer
+    # final cleaning + unicode fix (block text is already whitespace-collapsed)
+    plain_text = normalize_text(plain, collapsed=from_blocks)
 
-    flat_text = "\n".join(flat_parts).strip()
 
-    # skills lumps
-    skills = structured.get("SKILLS") or []
+    # build structured JSON from plain text
+    structured = _smart_structure_from_plain(plain_text, heading_lines)
 
-    return {
-        "plain_text": plain_text,
-        "flat_text": flat_text,
-        "structured": structured,
-        "skills": skills
-    }
+    # flat_text and skills are derived from the sections on access
+    return ParsedResume(
+        plain_text=plain_text,
+        sections=tuple(Section(name, items) for name, items in structured.items()),
+        truncated=budget.truncated,
+        timed_out=budget.timed_out,
+        reused_pages=reused_pages,
+    )
 
 
 # small test-run when module run directly
@@ -474,4 +1016,4 @@ if __name__ == "__main__":
             print("\nFLAT\n", out["flat_text"][:2000])
             print("\nSTRUCTURED\n", json.dumps(out["structured"], indent=2)[:4000])
     else:
-        print("Usage: python utils/resume_parser.py resume.pdf")
+        print("Usage: python -m utils.resume_parser resume.pdf")
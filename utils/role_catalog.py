@@ -0,0 +1,199 @@
+# utils/role_catalog.py
+"""
+Role catalog: utils/job_roles.json, loaded once per process.
+
+Layout of the file: {category: {role: {"required_skills": [...],
+"description": ..., ...}}}. The catalog keeps the parsed file plus a per-role
+index with the required skills lowercased up front, and one keyword matcher
+(Aho-Corasick, see utils/keyword_matcher.py) over the skills of every role.
+One scan of a resume therefore scores it against all roles at once, which
+rank_roles uses to list the best-fit roles.
+
+The file is re-read when its mtime changes (checked at most every
+CHECK_INTERVAL seconds), so edits show up without a restart. A file that
+fails to load keeps the last good catalog in service; the error is kept in
+RoleCatalog.error.
+"""
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Collection, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from utils.keyword_matcher import KeywordMatcher
+
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "job_roles.json")
+
+# Seconds between mtime checks; 0 checks on every access
+CHECK_INTERVAL = 1.0
+
+
+@dataclass(frozen=True)
+class RoleEntry:
+    category: str
+    name: str
+    info: dict
+    keywords: Tuple[str, ...]        # required skills, as written in the catalog
+    keywords_lower: Tuple[str, ...]  # same order, lowercased
+
+    def missing(self, found: Collection[str]) -> List[str]:
+        """
+        Required skills (original casing) not in found: the lowercase
+        keywords RoleCatalog.find reported, or the lowercased text itself.
+        """
+        return [k for k, low in zip(self.keywords, self.keywords_lower) if low not in found]
+
+
+@dataclass(frozen=True)
+class RoleMatch:
+    role: str
+    category: str
+    keyword_match: int            # percent of the role's skills found, as in get_resume_feedback
+    matched: Tuple[str, ...]
+    missing: Tuple[str, ...]
+
+
+def _index(data: dict) -> Dict[str, RoleEntry]:
+    """Role name -> entry; a role listed in two categories resolves to the first."""
+    roles = {}
+    for category, cat_roles in data.items():
+        if not isinstance(cat_roles, dict):
+            continue
+        for name, info in cat_roles.items():
+            if name in roles or not isinstance(info, dict):
+                continue
+            keywords = tuple(info.get("required_skills", []) or [])
+            roles[name] = RoleEntry(category, name, info, keywords, tuple(k.lower() for k in keywords))
+    return roles
+
+
+class RoleCatalog:
+    """Thread-safe view of the job roles file with mtime-based hot reload."""
+
+    def __init__(self, path: str = CATALOG_PATH, check_interval: float = CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self.error: Optional[str] = None
+        self.loads = 0
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._checked_at = float("-inf")
+        self._data: dict = {}
+        self._roles: Dict[str, RoleEntry] = {}
+        self._matcher = KeywordMatcher(())
+        self._matrix = None
+
+    def _refresh(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        with self._lock:
+            if now - self._checked_at < self.check_interval:
+                return
+            self._checked_at = now
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError as e:
+                if self._mtime is None:
+                    self.error = str(e)
+                return
+            if mtime == self._mtime:
+                return
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if not isinstance(data, dict):
+                    raise ValueError("job roles file must hold a JSON object")
+            except (OSError, ValueError) as e:
+                self.error = str(e)
+                return
+            roles = _index(data)
+            matcher = KeywordMatcher(k for role in roles.values() for k in role.keywords_lower)
+            # swap whole snapshots so readers never see a half-built index
+            self._data, self._roles, self._matcher, self._matrix = data, roles, matcher, None
+            self._mtime = mtime
+            self.error = None
+            self.loads += 1
+
+    @property
+    def data(self) -> dict:
+        """The parsed file ({category: {role: info}}); treat as read-only."""
+        self._refresh()
+        return self._data
+
+    def categories(self) -> List[str]:
+        return list(self.data)
+
+    def roles(self, category: Optional[str] = None) -> List[str]:
+        """Role names of one category, or of all categories."""
+        self._refresh()
+        if category is None:
+            return list(self._roles)
+        return list(self._data.get(category, {}))
+
+    def role(self, name: str) -> Optional[RoleEntry]:
+        self._refresh()
+        return self._roles.get(name)
+
+    def find(self, text_lower: str) -> Set[str]:
+        """Lowercase skills of any role that occur in text_lower (one pass)."""
+        self._refresh()
+        return self._matcher.find(text_lower)
+
+    def keyword_matrix(self):
+        """
+        (skills, roles, matrix): the lowercase skills of all roles, the role
+        names, and a dense NumPy roles x skills matrix counting each skill
+        per role. A resumes x skills presence matrix times its transpose
+        gives the matched-skill count of every role for every resume at
+        once. Built on first use after each (re)load.
+        """
+        self._refresh()
+        matrix = self._matrix
+        if matrix is None:
+            roles, matcher = list(self._roles.values()), self._matcher
+            skills = matcher.keywords
+            column = {k: i for i, k in enumerate(skills)}
+            rows = [r for r, role in enumerate(roles) for _ in role.keywords_lower]
+            cols = [column[k] for role in roles for k in role.keywords_lower]
+            counts = np.zeros((len(roles), len(skills)), dtype=np.int32)
+            np.add.at(counts, (rows, cols), 1)
+            matrix = (skills, [role.name for role in roles], counts)
+            if self._matcher is matcher:  # not replaced by a reload meanwhile
+                self._matrix = matrix
+        return matrix
+
+    def rank_roles(self, text: str, top_n: Optional[int] = None) -> List[RoleMatch]:
+        """
+        Every role scored against text from a single scan, best fit first
+        (ties: more skills matched, then catalog order).
+        """
+        self._refresh()
+        roles, found = self._roles, self._matcher.find(text.lower())
+        ranked = []
+        for role in roles.values():
+            matched, missing = [], []
+            for k, low in zip(role.keywords, role.keywords_lower):
+                (matched if low in found else missing).append(k)
+            total = len(role.keywords)
+            score = int((len(matched) / total) * 100) if total > 0 else 100
+            ranked.append(RoleMatch(role.name, role.category, score, tuple(matched), tuple(missing)))
+        ranked.sort(key=lambda m: (-m.keyword_match, -len(m.matched)))
+        return ranked if top_n is None else ranked[:top_n]
+
+
+_CATALOG: Optional[RoleCatalog] = None
+_CATALOG_LOCK = threading.Lock()
+
+
+def get_role_catalog() -> RoleCatalog:
+    """Return the shared catalog of utils/job_roles.json."""
+    global _CATALOG
+    if _CATALOG is None:
+        with _CATALOG_LOCK:
+            if _CATALOG is None:
+                _CATALOG = RoleCatalog()
+    return _CATALOG
@@ -0,0 +1,32 @@
+# utils/sample_corpus.py
+"""
+Raw text of the sample resumes shipped with the repository (data/*.pdf,
+generated/*.pdf and the .txt fixtures), for tests and benchmarks. Paths are
+relative to the repository root, not the working directory.
+"""
+import glob
+import os
+from typing import List
+
+import fitz  # PyMuPDF
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PDF_PATTERNS = ("data/*.pdf", "generated/*.pdf")
+TEXT_PATTERNS = ("test_files*/*.txt", "test_preview_files/*.txt")
+
+
+def _paths(patterns) -> List[str]:
+    return sorted(p for pattern in patterns for p in glob.glob(os.path.join(ROOT, pattern)))
+
+
+def corpus_texts() -> List[str]:
+    """Raw text of the sample resumes: PDF text layers, then the text files"""
+    texts = []
+    for path in _paths(PDF_PATTERNS):
+        with fitz.open(path) as doc:
+            texts.append("\n".join(page.get_text() for page in doc))
+    for path in _paths(TEXT_PATTERNS):
+        with open(path, "rb") as f:
+            texts.append(f.read().decode("utf-8", errors="ignore"))
+    return texts
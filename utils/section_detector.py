@@ -0,0 +1,110 @@
+# utils/section_detector.py
+"""
+Section heading detection for the resume structure parser.
+
+One precompiled engine decides, line by line, whether a line starts a new
+section and which one. It replaces the per-line chain of an uncompiled skills
+regex, a punctuation-stripping re.sub, an all-caps regex and a set lookup
+that _smart_structure_from_plain used to run.
+
+The heading vocabulary is pluggable: register_heading() adds a synonym
+(optionally routed to an existing section, e.g. "Work History" ->
+"EXPERIENCE") without slowing detection down, since the vocabulary is a
+single hash map keyed by the normalized heading text.
+"""
+import re
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+# "Skills", "Skills:", "SKILLS ..." at the start of a line
+_SKILLS_LINE = re.compile(r'(Skills|Skills:|SKILLS)\b', re.I)
+# punctuation / symbols: everything that is neither a word char nor whitespace
+_NON_WORD = re.compile(r'[^\w\s]')
+# all-caps-ish heading
+_ALL_CAPS = re.compile(r'^[A-Z][A-Z\s]{2,}$')
+
+DEFAULT_HEADINGS = (
+    "EXPERIENCE", "WORK EXPERIENCE", "EDUCATION", "SKILLS", "PROJECTS", "SUMMARY",
+    "ABOUT", "CONTACT", "COURSES", "HOBBIES", "ACHIEVEMENTS",
+)
+
+
+class SectionDetector:
+    """
+    Classifies lines as section headings.
+
+    A line is a heading when, after dropping punctuation, it is
+    all-caps-ish, matches the vocabulary case-insensitively, or is one of the
+    hints passed in by the extractor (e.g. DOCX heading styles).
+    """
+
+    def __init__(self, headings: Iterable[str] = DEFAULT_HEADINGS):
+        self._vocab: Dict[str, str] = {}
+        self._max_len = 0
+        for heading in headings:
+            self.register(heading)
+
+    def register(self, heading: str, section: Optional[str] = None):
+        """Add a heading; lines matching it start `section` (default: the heading itself)."""
+        key = _NON_WORD.sub('', heading).strip().upper()
+        if not key:
+            raise ValueError(f"Heading has no word characters: {heading!r}")
+        self._vocab[key] = (section or key).upper()
+        # str.upper never shortens text, so longer lines can skip the lookup
+        self._max_len = max(self._max_len, len(key))
+
+    @property
+    def headings(self) -> Dict[str, str]:
+        """Vocabulary as {normalized heading: section name}"""
+        return dict(self._vocab)
+
+    def classify(self, line: str, hints=()) -> Optional[str]:
+        """Section name if the (stripped) line is a heading, else None."""
+        if _SKILLS_LINE.match(line):
+            return "SKILLS"
+        return self._heading(line, hints)
+
+    def _heading(self, line: str, hints) -> Optional[str]:
+        clean = _NON_WORD.sub('', line).strip()
+        if len(clean) <= self._max_len:
+            section = self._vocab.get(clean.upper())
+            if section is not None:
+                return section
+        if _ALL_CAPS.match(clean) or (clean and line in hints):
+            return clean.upper()
+        return None
+
+    def split(self, lines: List[str], hints=()) -> Dict[str, List[str]]:
+        """
+        Group stripped, non-empty lines into sections in one pass.
+        Lines before the first heading go to "GENERAL".
+        """
+        sections = defaultdict(list)
+        current = "GENERAL"
+        skills_line = _SKILLS_LINE.match
+        heading = self._heading
+        for ln in lines:
+            # explicit "Skills:" style headers
+            if skills_line(ln):
+                current = "SKILLS"
+                continue
+            section = heading(ln, hints)
+            if section is None:
+                sections[current].append(ln)
+            else:
+                current = section
+                sections[current]  # ensure exists
+        return sections
+
+
+_default_detector = SectionDetector()
+
+
+def get_section_detector() -> SectionDetector:
+    """The process-wide detector used by parse_resume"""
+    return _default_detector
+
+
+def register_heading(heading: str, section: Optional[str] = None):
+    """Add a heading synonym to the default detector."""
+    _default_detector.register(heading, section)
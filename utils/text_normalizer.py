@@ -0,0 +1,105 @@
+# utils/text_normalizer.py
+"""
+Text normalization engine for extracted resume text.
+
+Replaces the chain of _normalize_whitespace -> normalize_unicode_characters
+-> _fix_hyphenation (about a dozen full-string passes, most of them run
+twice for PDFs) with one character-class lookup for the ligature / bullet
+map and a short sequence of fixed-replacement passes that skip themselves
+when they cannot match.
+Output is identical to the old chain; test_text_normalizer.py checks this
+against a reference implementation.
+"""
+import re
+
+# Fix common PDF ligature / weird Unicode extracted characters
+UNICODE_FIX_MAP = {
+    "Ɵ": "ti",
+    "Ŧ": "T",
+    "Ŋ": "N",
+    "ƞ": "n",
+    "Ō": "o",
+    "ō": "o",
+    "ſ": "s",
+    "ﬀ": "ff",
+    "ﬁ": "fi",
+    "ﬂ": "fl",
+    "ﬃ": "ffi",
+    "ﬄ": "ffl",
+    "ﬅ": "ft",
+    "ﬆ": "st",
+    "": "-",  # fancy bullet
+    "": "-",  # bullet
+    "•": "•",       # preserve real bullet
+}
+
+# Only chars that actually change; one compiled class finds them all. Resumes
+# rarely contain any, and when they do there are few, so a regex with a dict
+# lookup per hit beats str.translate (multi-char values push translate onto
+# its slow per-character path for the whole string).
+_UNICODE_FIXES = {bad: good for bad, good in UNICODE_FIX_MAP.items() if bad != good}
+_UNICODE_CHARS = re.compile('[' + ''.join(re.escape(ch) for ch in _UNICODE_FIXES) + ']')
+
+# "-\n" plus all following whitespace: a word broken at a line end
+_DASH_NEWLINE = re.compile(r'-\n\s*')
+_MANY_NEWLINES = re.compile(r'\n{3,}')
+_MANY_SPACES = re.compile(r'  +')
+# Placeholder for paragraph breaks while lone newlines are turned into spaces
+_PARAGRAPH = '\x00'
+_LONE_NEWLINE = re.compile(r'(?<!\n)\n(?!\n)')
+
+
+def _fix_unicode(text: str) -> str:
+    if _UNICODE_CHARS.search(text) is None:
+        return text
+    return _UNICODE_CHARS.sub(lambda m: _UNICODE_FIXES[m.group()], text)
+
+
+def _collapse(text: str) -> str:
+    """
+    Same result as the old _normalize_whitespace + _fix_hyphenation pair.
+    Every step only touches whitespace runs, so the order can be chosen for
+    speed: plain str.replace where possible, and passes that cannot match
+    are skipped with a substring check.
+    """
+    if '\r' in text:
+        text = text.replace('\r', '\n')
+    if '\t' in text:
+        text = text.replace('\t', ' ')
+    text = _DASH_NEWLINE.sub('', text.strip())
+    if '\n\n\n' in text:
+        text = _MANY_NEWLINES.sub('\n\n', text)
+    # newline runs are now 1 or 2 long: keep pairs, turn singles into spaces
+    if _PARAGRAPH in text:
+        text = _LONE_NEWLINE.sub(' ', text)
+    else:
+        text = text.replace('\n\n', _PARAGRAPH).replace('\n', ' ').replace(_PARAGRAPH, '\n\n')
+    return _MANY_SPACES.sub(' ', text)
+
+
+def collapse_whitespace(text: str) -> str:
+    """
+    Whitespace cleanup and de-hyphenation without the unicode map:
+    collapse blank lines and spaces, join hyphenated line breaks and turn
+    single line breaks into spaces.
+    """
+    return _collapse(text)
+
+
+def normalize_text(text: str, collapsed: bool = False) -> str:
+    """
+    Full cleanup: ligature / bullet mapping, whitespace collapsing and
+    de-hyphenation. Pass collapsed=True when text already came out of
+    collapse_whitespace (e.g. the PDF block path); only the steps that can
+    still change it are then run.
+    """
+    if collapsed:
+        # whitespace is already canonical; mapped bullets can only create
+        # new "-\n" breaks to join
+        return _DASH_NEWLINE.sub('', _fix_unicode(text))
+    return _collapse(_fix_unicode(text))
+
+
+def normalize_unicode_characters(text: str) -> str:
+    """Fix broken unicode from stylized PDFs (ligatures, mis-encodings)."""
+    return _fix_unicode(text)